@@ -1,9 +1,10 @@
 from dataclasses import dataclass
 from uuid import UUID
 
-from game_manager.fs_storage.fs_storage_manager import FileSystemStorageManager
 from game_manager.logic.uid_object import Uid
 
+from hard_reset.storage.sqlite_storage_manager import SQLiteStorageManager
+
 
 @dataclass
 class PlayerInfoStore:
@@ -12,7 +13,7 @@ class PlayerInfoStore:
     _uid: Uid = UUID("00000000-0000-0000-0000-000000000000")
 
 
-class GraphicStorageManager(FileSystemStorageManager):
+class GraphicStorageManager(SQLiteStorageManager):
 
     def _unparse_object(self, object_to_unparse: object) -> dict[object, object]:
         if isinstance(object_to_unparse, PlayerInfoStore):
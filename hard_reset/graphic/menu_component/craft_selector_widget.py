@@ -7,6 +7,9 @@ from game_manager.graphic.renderer import Renderer
 from game_manager.io.mouse import MouseButton
 from vertyces.vertex import Vertex2f
 
+from hard_reset.logic.entities import InventoryChange
+from hard_reset.logic.item.crafting_index import CraftabilityTracker, RecipeIndex
+
 
 class RecipeButton(Button):
     _recipe_name: str
@@ -25,6 +28,9 @@ class RecipeButton(Button):
         self._may_craft = may_craft
         self._select_recipe = select_recipe
 
+    def set_may_craft(self, may_craft: bool) -> None:
+        self._may_craft = may_craft
+
     def render(self, renderer: Renderer) -> None:
         renderer.draw_rect(
             Vertex2f(0, 0),
@@ -38,7 +44,8 @@ class RecipeButton(Button):
 
 
 class CraftSelectorWidget(GraphicalComponent):
-    _crafting_recipes: dict[str, dict[str, int]]
+    _craftability: CraftabilityTracker
+    _recipe_buttons: dict[str, RecipeButton]
     _selected_recipe: str | None = None
     _on_select_recipe: Callable[[str], None]
 
@@ -49,26 +56,35 @@ class CraftSelectorWidget(GraphicalComponent):
         on_select_recipe: Callable[[str], None],
     ) -> None:
         super().__init__(position, Vertex2f(400, 400))
-        self._crafting_recipes = crafting_recipes
+        self._craftability = CraftabilityTracker(RecipeIndex(crafting_recipes))
         self._on_select_recipe = on_select_recipe
 
-    def update_inventory(self, inventory: dict[str, int]) -> None:
-        self.clear_components()
-        for idx, (recipe_name, recipe) in enumerate(self._crafting_recipes.items()):
-            may_craft = True
-            for item_name, quantity in recipe.items():
-                if item_name not in inventory or inventory[item_name] < quantity:
-                    may_craft = False
-                    break
-
-            self.add_component(
-                RecipeButton(
-                    Vertex2f(10, 10 + idx * 22),
-                    recipe_name,
-                    may_craft,
-                    lambda recipe_name: self._select_recipe(recipe_name),
-                )
+        self._recipe_buttons = {}
+        for idx, recipe_name in enumerate(crafting_recipes):
+            recipe_button = RecipeButton(
+                Vertex2f(10, 10 + idx * 22),
+                recipe_name,
+                self._craftability.is_craftable(recipe_name),
+                lambda recipe_name: self._select_recipe(recipe_name),
             )
+            self._recipe_buttons[recipe_name] = recipe_button
+            self.add_component(recipe_button)
+
+    def apply_inventory_changes(self, changes: list[InventoryChange]) -> None:
+        # Buttons are only refreshed for recipes whose craftability changed
+        became_craftable, became_uncraftable = self._craftability.set_quantities(
+            (item_name, quantity) for item_name, _, quantity in changes
+        )
+        for recipe_name in became_craftable:
+            self._recipe_buttons[recipe_name].set_may_craft(True)
+        for recipe_name in became_uncraftable:
+            self._recipe_buttons[recipe_name].set_may_craft(False)
+
+    def reset(self) -> None:
+        # Back to an empty inventory, the selection is kept
+        self._craftability.reset()
+        for recipe_name, recipe_button in self._recipe_buttons.items():
+            recipe_button.set_may_craft(self._craftability.is_craftable(recipe_name))
 
     def _select_recipe(self, recipe_name: str) -> None:
         self._selected_recipe = recipe_name
@@ -10,6 +10,8 @@ from vertyces.vertex.vertex2f import Vertex2f
 
 from hard_reset.graphic.menu_component.craft_selector_widget import CraftSelectorWidget
 from hard_reset.graphic.menu_component.inventory_widget import InventoryWidget
+from hard_reset.logic.entities import InventoryChange
+from hard_reset.messaging.inventory_watcher import InventoryWatcher
 from hard_reset.messaging.messaging import MessageManagerGraphic
 
 
@@ -24,8 +26,10 @@ class CraftButton(Button):
 
 class CraftingGUI(GraphicalComponent):
     _message_manager: MessageManagerGraphic
+    _inventory_watcher: InventoryWatcher
     _player_uid: Uid
-    _map_uid: Uid
+    # Map of the watched player inventory while the gui is shown
+    _map_uid: Uid | None = None
 
     _selected_recipe: str | None = None
 
@@ -36,10 +40,12 @@ class CraftingGUI(GraphicalComponent):
         self,
         position: Vertex2f,
         message_manager: MessageManagerGraphic,
+        inventory_watcher: InventoryWatcher,
         player_uid: Uid,
     ) -> None:
         super().__init__(position, Vertex2f(400, 400), z_index=20, visible=False)
         self._message_manager = message_manager
+        self._inventory_watcher = inventory_watcher
         self._player_uid = player_uid
 
         crafting_recipes = self._message_manager.get_crafting_recipes()
@@ -49,7 +55,7 @@ class CraftingGUI(GraphicalComponent):
         self.add_component(self._craft_selector_widget)
         self.add_component(CraftButton(Vertex2f(300, 350), self._craft_item))
         self._inventory_widget = InventoryWidget(
-            Vertex2f(0, 0), "Player Inventory", lambda _: None
+            Vertex2f(0, 0), "Player Inventory", lambda _name, _quantity: None
         )
         self.add_component(self._inventory_widget)
 
@@ -62,22 +68,35 @@ class CraftingGUI(GraphicalComponent):
         return False
 
     def show_crating_gui(self, map_uid: Uid) -> None:
+        # Widgets are updated by the watcher, only when the inventory changes
+        self.hide_crafting_gui()
         self._map_uid = map_uid
-
-        player_inventory = self._message_manager.get_inventory(
-            map_uid, self._player_uid
+        self._inventory_watcher.watch(
+            map_uid, self._player_uid, self._on_inventory_changes
         )
-        self._inventory_widget.set_inventory(player_inventory)
-        self._craft_selector_widget.update_inventory(player_inventory)
 
         self.show(True)
 
+    def hide_crafting_gui(self) -> None:
+        if self._map_uid is not None:
+            self._inventory_watcher.unwatch(
+                self._map_uid, self._player_uid, self._on_inventory_changes
+            )
+            self._map_uid = None
+            # A new watch starts from an empty inventory
+            self._inventory_widget.reset()
+            self._craft_selector_widget.reset()
+        self.show(False)
+
+    def _on_inventory_changes(self, changes: list[InventoryChange]) -> None:
+        self._inventory_widget.apply_inventory_changes(changes)
+        self._craft_selector_widget.apply_inventory_changes(changes)
+
     def _select_recipe(self, recipe_name: str) -> None:
         self._selected_recipe = recipe_name
 
     def _craft_item(self) -> None:
-        if self._selected_recipe is not None:
+        if self._selected_recipe is not None and self._map_uid is not None:
             self._message_manager.craft_item(
                 self._map_uid, self._player_uid, self._selected_recipe
             )
-            self.show_crating_gui(self._map_uid)
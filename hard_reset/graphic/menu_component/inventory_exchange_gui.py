@@ -6,21 +6,56 @@ from game_manager.logic.uid_object import Uid  # TODO: logic leak
 from vertyces.vertex import Vertex2f
 
 from hard_reset.graphic.menu_component.inventory_widget import InventoryWidget
+from hard_reset.messaging.inventory_watcher import InventoryWatcher
 from hard_reset.messaging.messaging import MessageManagerGraphic
 
 
 class InventoryExchangeGUI(GraphicalComponent):
     _message_manager: MessageManagerGraphic
+    _inventory_watcher: InventoryWatcher
 
-    _map_uid: Uid
+    # Set while the gui watches the inventories of two entities
+    _map_uid: Uid | None = None
     _left_entity_uid: Uid
     _right_entity_uid: Uid
 
+    _inventory_left_widget: InventoryWidget
+    _inventory_right_widget: InventoryWidget
+
     def __init__(
-        self, position: Vertex2f, message_manager: MessageManagerGraphic
+        self,
+        position: Vertex2f,
+        message_manager: MessageManagerGraphic,
+        inventory_watcher: InventoryWatcher,
     ) -> None:
         super().__init__(position, Vertex2f(250, 400), visible=False, z_index=10)
         self._message_manager = message_manager
+        self._inventory_watcher = inventory_watcher
+
+        # Clicking an item moves one of it to the other side, the button next
+        # to it moves the whole stack in one transfer
+        self._inventory_left_widget = InventoryWidget(
+            Vertex2f(0, 0),
+            "Left",
+            lambda name, _quantity: self._move_items(
+                self._left_entity_uid, self._right_entity_uid, name, 1
+            ),
+            lambda name, quantity: self._move_items(
+                self._left_entity_uid, self._right_entity_uid, name, quantity
+            ),
+        )
+        self.add_component(self._inventory_left_widget)
+        self._inventory_right_widget = InventoryWidget(
+            Vertex2f(125, 0),
+            "Right",
+            lambda name, _quantity: self._move_items(
+                self._right_entity_uid, self._left_entity_uid, name, 1
+            ),
+            lambda name, quantity: self._move_items(
+                self._right_entity_uid, self._left_entity_uid, name, quantity
+            ),
+        )
+        self.add_component(self._inventory_right_widget)
 
     def render(self, renderer: Renderer) -> None:
         renderer.draw_rect(Vertex2f(0, 0), self.bounds.dimensions, colors.YELLOW)
@@ -33,44 +68,44 @@ class InventoryExchangeGUI(GraphicalComponent):
     def set_entities(
         self, map_uid: Uid, left_entity_uid: Uid, right_entity_uid: Uid
     ) -> None:
+        # Widgets are updated by the watcher, only when an inventory changes
+        self.close()
         self._map_uid = map_uid
         self._left_entity_uid = left_entity_uid
         self._right_entity_uid = right_entity_uid
-        self._update_components()
-
-    def _update_components(self) -> None:
-        self.clear_components()
-        items_left = self._message_manager.get_inventory(
-            self._map_uid, self._left_entity_uid
+        self._inventory_watcher.watch(
+            map_uid,
+            left_entity_uid,
+            self._inventory_left_widget.apply_inventory_changes,
         )
-        items_right = self._message_manager.get_inventory(
-            self._map_uid, self._right_entity_uid
+        self._inventory_watcher.watch(
+            map_uid,
+            right_entity_uid,
+            self._inventory_right_widget.apply_inventory_changes,
         )
 
-        inventory_left_widget = InventoryWidget(
-            Vertex2f(0, 0),
-            "Left",
-            lambda name: self._move_items(
-                self._left_entity_uid, self._right_entity_uid, name, 1
-            ),
-        )
-        inventory_left_widget.set_inventory(items_left)
-        self.add_component(inventory_left_widget)
-
-        inventory_right_widget = InventoryWidget(
-            Vertex2f(125, 0),
-            "Right",
-            lambda name: self._move_items(
-                self._right_entity_uid, self._left_entity_uid, name, 1
-            ),
-        )
-        inventory_right_widget.set_inventory(items_right)
-        self.add_component(inventory_right_widget)
+    def close(self) -> None:
+        if self._map_uid is not None:
+            self._inventory_watcher.unwatch(
+                self._map_uid,
+                self._left_entity_uid,
+                self._inventory_left_widget.apply_inventory_changes,
+            )
+            self._inventory_watcher.unwatch(
+                self._map_uid,
+                self._right_entity_uid,
+                self._inventory_right_widget.apply_inventory_changes,
+            )
+            self._map_uid = None
+            # A new watch starts from an empty inventory
+            self._inventory_left_widget.reset()
+            self._inventory_right_widget.reset()
+        self.show(False)
 
     def _move_items(
         self, from_uid: Uid, to_uid: Uid, item_name: str, quantity: int
     ) -> None:
-        self._message_manager.move_inventory_items(
-            self._map_uid, from_uid, to_uid, item_name, quantity
-        )
-        self._update_components()
+        if self._map_uid is not None:
+            self._message_manager.transfer_items(
+                self._map_uid, [(from_uid, to_uid, item_name, quantity)]
+            )
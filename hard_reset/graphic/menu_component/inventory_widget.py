@@ -7,24 +7,29 @@ from game_manager.graphic.renderer import Renderer
 from game_manager.io.mouse import MouseButton
 from vertyces.vertex import Vertex2f
 
+from hard_reset.logic.entities import InventoryChange
+
 
 class InventoryItemButton(Button):
     _item_name: str
     _item_amount: int
-    _move_items_callback: Callable[[str], None]
+    _move_items_callback: Callable[[str, int], None]
 
     def __init__(
         self,
         position: Vertex2f,
         item_name: str,
         item_amount: int,
-        _move_items_callback: Callable[[str], None],
+        _move_items_callback: Callable[[str, int], None],
     ) -> None:
         super().__init__(position, Vertex2f(90, 20), self._move_items)
         self._item_name = item_name
         self._item_amount = item_amount
         self._move_items_callback = _move_items_callback
 
+    def set_item_amount(self, item_amount: int) -> None:
+        self._item_amount = item_amount
+
     def render(self, renderer: Renderer) -> None:
         renderer.draw_rect(Vertex2f(0, 0), self.bounds.dimensions, colors.ORANGE)
         renderer.draw_text(
@@ -34,34 +39,95 @@ class InventoryItemButton(Button):
         )
 
     def _move_items(self) -> None:
-        self._move_items_callback(self._item_name)
+        self._move_items_callback(self._item_name, self._item_amount)
+
+
+class InventoryStackButton(Button):
+    _item_name: str
+    _click_callback: Callable[[str], None]
+
+    def __init__(
+        self,
+        position: Vertex2f,
+        item_name: str,
+        click_callback: Callable[[str], None],
+    ) -> None:
+        super().__init__(position, Vertex2f(20, 20), self._click)
+        self._item_name = item_name
+        self._click_callback = click_callback
+
+    def render(self, renderer: Renderer) -> None:
+        renderer.draw_rect(Vertex2f(0, 0), self.bounds.dimensions, colors.YELLOW)
+        renderer.draw_text(Vertex2f(2, 2), ">>", colors.BLACK)
+
+    def _click(self) -> None:
+        self._click_callback(self._item_name)
 
 
 class InventoryWidget(GraphicalComponent):
     _name: str
-    _item_click_callback: Callable[[str], None]
+    # Called with the item name and the quantity held
+    _item_click_callback: Callable[[str, int], None]
+    # Same, from the button next to each item, which is only shown when set
+    _stack_click_callback: Callable[[str, int], None] | None
+    _items: dict[str, int]
+    _item_buttons: dict[str, InventoryItemButton]
 
     def __init__(
         self,
         position: Vertex2f,
         name: str,
-        item_click_callback: Callable[[str], None],
+        item_click_callback: Callable[[str, int], None],
+        stack_click_callback: Callable[[str, int], None] | None = None,
     ) -> None:
         super().__init__(position, Vertex2f(125, 400))
         self._name = name
         self._item_click_callback = item_click_callback
+        self._stack_click_callback = stack_click_callback
+        self._items = {}
+        self._item_buttons = {}
 
     def set_inventory(self, inventory: dict[str, int]) -> None:
+        self._items = dict(inventory)
         self.clear_components()
-        for idx, (item_name, item_count) in enumerate(inventory.items()):
-            self.add_component(
-                InventoryItemButton(
-                    Vertex2f(10, idx * 22 + 30),
-                    item_name,
-                    item_count,
-                    self._item_click_callback,
-                )
+        self._item_buttons = {}
+        for idx, (item_name, item_count) in enumerate(self._items.items()):
+            item_button = InventoryItemButton(
+                Vertex2f(10, idx * 22 + 30),
+                item_name,
+                item_count,
+                self._item_click_callback,
             )
+            self._item_buttons[item_name] = item_button
+            self.add_component(item_button)
+            if self._stack_click_callback is not None:
+                self.add_component(
+                    InventoryStackButton(
+                        Vertex2f(102, idx * 22 + 30), item_name, self._click_stack
+                    )
+                )
+
+    def reset(self) -> None:
+        self.set_inventory({})
+
+    def apply_inventory_changes(self, changes: list[InventoryChange]) -> None:
+        # Buttons are only laid out again when items appear or disappear
+        layout_changed = False
+        for item_name, _, quantity in changes:
+            if quantity == 0:
+                layout_changed |= self._items.pop(item_name, None) is not None
+            elif item_name in self._items:
+                self._items[item_name] = quantity
+                self._item_buttons[item_name].set_item_amount(quantity)
+            else:
+                self._items[item_name] = quantity
+                layout_changed = True
+        if layout_changed:
+            self.set_inventory(self._items)
+
+    def _click_stack(self, item_name: str) -> None:
+        if self._stack_click_callback is not None:
+            self._stack_click_callback(item_name, self._items[item_name])
 
     def render(self, renderer: Renderer) -> None:
         renderer.draw_rect(Vertex2f(0, 0), self.bounds.dimensions, colors.GREEN)
@@ -8,12 +8,42 @@ from game_manager.io.mouse import MouseButton
 from game_manager.logic.uid_object import Uid  # TODO: logic leak
 from vertyces.vertex import Vertex2f, Vertex3f
 
-from hard_reset.messaging.messaging import EntityDoorInfoPacket, MapInfoPacket
+from hard_reset.messaging.messaging import (
+    EntityDoorInfoPacket,
+    MapDeltaPacket,
+    MapLayoutPacket,
+)
 
 if TYPE_CHECKING:
     from hard_reset.graphic.menu_map import MenuMap
 
 TILE_SIZE = 40
+WALL_COLOR = Vertex3f(255, 0, 0)
+GROUND_COLOR = Vertex3f(0, 0, 255)
+
+TileRect = tuple[Vertex2f, Vertex2f, Vertex3f]
+
+
+def _build_tile_rects(layout: MapLayoutPacket) -> list[TileRect]:
+    # Consecutive tiles of a row sharing the same walkability are merged
+    tile_rects = []
+    width_in_tiles = layout.width_in_tiles
+    for y in range(layout.height_in_tiles):
+        row = layout.walkability[y * width_in_tiles : (y + 1) * width_in_tiles]
+        run_start = 0
+        for x in range(1, width_in_tiles + 1):
+            walkable = bool(row[run_start])
+            if x < width_in_tiles and bool(row[x]) == walkable:
+                continue
+            tile_rects.append(
+                (
+                    Vertex2f(run_start * TILE_SIZE, y * TILE_SIZE),
+                    Vertex2f(x * TILE_SIZE, (y + 1) * TILE_SIZE),
+                    GROUND_COLOR if walkable else WALL_COLOR,
+                )
+            )
+            run_start = x
+    return tile_rects
 
 
 class Chest(Button):
@@ -88,36 +118,85 @@ class Door(GraphicalComponent):
 
 
 class MapComponent(GraphicalComponent):
-    _current_map_info: MapInfoPacket
     _menu_map: "MenuMap"
 
+    _layouts: dict[Uid, tuple[MapLayoutPacket, list[TileRect]]]
+    _layout: MapLayoutPacket
+    _tile_rects: list[TileRect]
+
     _graphical_entities: dict[Uid, GraphicalComponent]
+    _revision: int
+    _viewport_size: tuple[float, float] | None
 
     def __init__(self, menu_map: "MenuMap") -> None:
         self._menu_map = menu_map
-        self._current_map_info = (
-            self._menu_map.graphic_manager.message_manager.get_map_info(
-                self._menu_map.current_map_uid
-            )
-        )
+        self._layouts = {}
+        self._load_layout(self._menu_map.current_map_uid)
         super().__init__(
             Vertex2f(0, 0),
-            Vertex2f(self._current_map_info.width, self._current_map_info.height),
+            Vertex2f(self._layout.width, self._layout.height),
         )
         self._graphical_entities = {}
+        self._revision = -1
+        self._viewport_size = None
+
+    @property
+    def revision(self) -> int:
+        return self._revision
 
     def _get_map_dimensions(self) -> Vertex2f:
-        return Vertex2f(self._current_map_info.width, self._current_map_info.height)
+        return Vertex2f(self._layout.width, self._layout.height)
+
+    def _load_layout(self, map_uid: Uid, layout_hash: str | None = None) -> None:
+        cached_layout = self._layouts.get(map_uid)
+        if cached_layout is None or (
+            layout_hash is not None and cached_layout[0].layout_hash != layout_hash
+        ):
+            layout = self._menu_map.graphic_manager.message_manager.get_map_layout(
+                map_uid
+            )
+            cached_layout = (layout, _build_tile_rects(layout))
+            self._layouts[map_uid] = cached_layout
+        self._layout, self._tile_rects = cached_layout
+
+    def declare_viewport(self) -> None:
+        graphic_manager = self._menu_map.graphic_manager
+        viewport_dimensions = graphic_manager.window.get_center.multiplied(2)
+        viewport_size = (viewport_dimensions.x, viewport_dimensions.y)
+        if viewport_size == self._viewport_size:
+            return
+        self._viewport_size = viewport_size
+        graphic_manager.message_manager.set_viewport(
+            graphic_manager.player_uid, viewport_dimensions
+        )
 
-    def change_map(self, map_info: MapInfoPacket) -> None:
-        self._current_map_info = map_info
+    def change_map(self, map_uid: Uid) -> None:
+        self._load_layout(map_uid)
         self._graphical_entities.clear()
         self.clear_components()
-
-    def update_map_info(self, map_info: MapInfoPacket) -> None:
-        self._current_map_info = map_info
-
-        for entity_uid, entity_info in self._current_map_info.entities.items():
+        self._revision = -1
+
+    def update_map_info(self, map_delta: MapDeltaPacket) -> None:
+        if map_delta.layout_hash != self._layout.layout_hash:
+            self._load_layout(map_delta.map_uid, map_delta.layout_hash)
+        self._revision = map_delta.revision
+
+        removed_entity_uids = map_delta.removed_entity_uids + map_delta.left_entity_uids
+        if map_delta.full:
+            removed_entity_uids = [
+                uid for uid in self._graphical_entities if uid not in map_delta.entities
+            ]
+        removed_components = [
+            self._graphical_entities.pop(entity_uid)
+            for entity_uid in removed_entity_uids
+            if entity_uid in self._graphical_entities
+        ]
+        if removed_components:
+            self.clear_components()
+            for remaining_component in self._graphical_entities.values():
+                self.add_component(remaining_component)
+
+        for entity_uid, entity_info in map_delta.entities.items():
             entity_component = self._graphical_entities.get(entity_uid)
             if entity_component is not None:
                 entity_component.bounds = entity_component.bounds.at_position(
@@ -163,16 +242,12 @@ class MapComponent(GraphicalComponent):
 
     def render(self, renderer: Renderer) -> None:
         # Draw tiles
-        for pos, walkable in self._current_map_info.tiles.items():
-            p1 = Vertex2f(pos[0] * TILE_SIZE, pos[1] * TILE_SIZE)
-            p2 = p1.translated(Vertex2f(TILE_SIZE, TILE_SIZE))
-            renderer.draw_rect(
-                p1, p2, Vertex3f(255, 0, 0) if not walkable else Vertex3f(0, 0, 255)
-            )
+        for p1, p2, color in self._tile_rects:
+            renderer.draw_rect(p1, p2, color)
 
         # Draw grid
-        max_width = self._current_map_info.width
-        max_height = self._current_map_info.height
+        max_width = self._layout.width
+        max_height = self._layout.height
         for i in range(0, max_height, TILE_SIZE):
             renderer.draw_line(
                 Vertex2f(0, i), Vertex2f(max_width, i), Vertex3f(0, 0, 0), z_index=1
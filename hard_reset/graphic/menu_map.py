@@ -11,6 +11,7 @@ from hard_reset.graphic.menu_component.inventory_exchange_gui import (
     InventoryExchangeGUI,
 )
 from hard_reset.graphic.menu_component.map_component import MapComponent
+from hard_reset.messaging.inventory_watcher import InventoryWatcher
 
 if TYPE_CHECKING:
     from hard_reset.graphic.graphic_manager import GraphicManager
@@ -19,6 +20,7 @@ if TYPE_CHECKING:
 class MenuMap(Menu):
     graphic_manager: "GraphicManager"
 
+    _inventory_watcher: InventoryWatcher
     _inventory_gui: InventoryExchangeGUI
     _crafting_gui: CraftingGUI
     _map_component: MapComponent
@@ -28,12 +30,16 @@ class MenuMap(Menu):
         self.graphic_manager = graphic_manager
         self.current_map_uid = current_map_uid
 
+        self._inventory_watcher = InventoryWatcher(self.graphic_manager.message_manager)
         self._inventory_gui = InventoryExchangeGUI(
-            Vertex2f(500, 100), self.graphic_manager.message_manager
+            Vertex2f(500, 100),
+            self.graphic_manager.message_manager,
+            self._inventory_watcher,
         )
         self._crafting_gui = CraftingGUI(
             Vertex2f(100, 100),
             self.graphic_manager.message_manager,
+            self._inventory_watcher,
             self.graphic_manager.player_uid,
         )
         self._map_component = MapComponent(self)
@@ -46,7 +52,7 @@ class MenuMap(Menu):
         self._inventory_gui.set_entities(
             self.current_map_uid, chest_uid, self.graphic_manager.player_uid
         )
-        self._crafting_gui.show(False)
+        self._crafting_gui.hide_crafting_gui()
         self._inventory_gui.show(visible=True)
 
     def move_items(
@@ -57,31 +63,35 @@ class MenuMap(Menu):
         )
 
     def use_map_travel(self, map_travel_uid: Uid) -> None:
+        # Watched inventories belong to the map being left
+        self._inventory_gui.close()
+        self._crafting_gui.hide_crafting_gui()
         self.current_map_uid = self.graphic_manager.message_manager.use_map_travel(
             self.graphic_manager.player_uid, self.current_map_uid, map_travel_uid
         )
-        current_map_info = self.graphic_manager.message_manager.get_map_info(
-            self.current_map_uid
-        )
-        self._map_component.change_map(current_map_info)
+        self._map_component.change_map(self.current_map_uid)
 
     def render(self, delta_ns: float, renderer: Renderer) -> None:
         self.graphic_manager.window.set_title(f"FPS: {self.graphic_manager.fps}")
 
-        current_map_info = self.graphic_manager.message_manager.get_map_info(
-            self.current_map_uid
+        self._map_component.declare_viewport()
+        map_delta = self.graphic_manager.message_manager.get_map_delta(
+            self.current_map_uid,
+            self._map_component.revision,
+            self.graphic_manager.player_uid,
         )
-        self._map_component.update_map_info(current_map_info)
+        self._map_component.update_map_info(map_delta)
+        self._inventory_watcher.poll()
 
         if self.graphic_manager.keyboard.consume_key("a"):
-            self._inventory_gui.show(False)
+            self._inventory_gui.close()
 
         if self.graphic_manager.keyboard.consume_key("c"):
-            self._inventory_gui.show(False)
+            self._inventory_gui.close()
             if not self._crafting_gui.visible:
                 self._crafting_gui.show_crating_gui(self.current_map_uid)
             else:
-                self._crafting_gui.show(False)
+                self._crafting_gui.hide_crafting_gui()
 
         direction = Vertex2f(0, 0)
         if self.graphic_manager.keyboard.is_pressed("q"):
@@ -0,0 +1,194 @@
+import argparse
+import random
+import resource
+import sys
+import tempfile
+import time
+from functools import partial
+
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.logic.map.generated_map import GeneratedMap, generated_map_uid
+from hard_reset.logic.map.map_registry import MapFactory
+from hard_reset.messaging.messaging import (
+    LocalMessageManagerGraphic,
+    MessageManagerLogic,
+)
+
+# Chance for a scripted player to pick a new direction on a given tick
+DIRECTION_CHANGE_CHANCE = 0.05
+DIRECTIONS = [
+    Vertex2f(x, y) for x in (-1, 0, 1) for y in (-1, 0, 1) if (x, y) != (0, 0)
+]
+
+
+class HeadlessMessageManager(MessageManagerLogic):
+    def application_stopped(self) -> None: ...
+
+
+class ScriptedPlayer:
+    player_uid: Uid
+    map_uid: Uid
+
+    _message_manager: LocalMessageManagerGraphic
+    _random: random.Random
+    _revision: int
+
+    def __init__(
+        self,
+        message_manager: LocalMessageManagerGraphic,
+        player_uid: Uid,
+        map_uid: Uid,
+        seed: int,
+    ) -> None:
+        self.player_uid = player_uid
+        self.map_uid = map_uid
+        self._message_manager = message_manager
+        self._random = random.Random(seed)
+        self._revision = -1
+
+        message_manager.set_viewport(player_uid, Vertex2f(800, 600))
+
+    def step(self) -> int:
+        # Players are moved by the logic tick, as for connected clients
+        if self._random.random() < DIRECTION_CHANGE_CHANCE:
+            self._message_manager.set_entity_direction(
+                self.map_uid, self.player_uid, self._random.choice(DIRECTIONS)
+            )
+
+        # Emulates the per-frame request of a connected client
+        map_delta = self._message_manager.get_map_delta(
+            self.map_uid, self._revision, self.player_uid
+        )
+        self._revision = map_delta.revision
+        return len(map_delta.entities)
+
+
+def run(
+    players_count: int,
+    maps_count: int,
+    ticks_count: int,
+    map_size: int,
+    chests_per_map: int,
+    seed: int,
+    vectorized_movement: bool = False,
+    storage_path: str | None = None,
+) -> float:
+    # Saves go to a temporary directory unless a path is given
+    if storage_path is None:
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temporary_path:
+            return run(
+                players_count,
+                maps_count,
+                ticks_count,
+                map_size,
+                chests_per_map,
+                seed,
+                vectorized_movement,
+                temporary_path,
+            )
+
+    maps: dict[Uid, MapFactory] = {
+        generated_map_uid(seed + idx): partial(
+            GeneratedMap, map_size, map_size, seed + idx, chests_count=chests_per_map
+        )
+        for idx in range(maps_count)
+    }
+    map_uids = list(maps)
+    logic_manager = LogicManager(
+        maps, storage_path=storage_path, vectorized_movement=vectorized_movement
+    )
+    logic_manager.message_manager = HeadlessMessageManager()
+    message_manager = LocalMessageManagerGraphic(logic_manager)
+
+    scripted_players = []
+    for idx in range(players_count):
+        player_info = message_manager.connect_as_player(None)
+        current_map = logic_manager.get_map(map_uids[idx % maps_count])
+        assert isinstance(current_map, GeneratedMap)
+        logic_manager.move_entity(
+            player_info.uid,
+            player_info.current_map_uid,
+            current_map.uid,
+            current_map.get_random_walkable_position(),
+        )
+        scripted_players.append(
+            ScriptedPlayer(
+                message_manager, player_info.uid, current_map.uid, seed + idx
+            )
+        )
+
+    sent_entities = 0
+    start = time.perf_counter()
+    for _ in range(ticks_count):
+        for scripted_player in scripted_players:
+            sent_entities += scripted_player.step()
+        logic_manager.run_tick()
+    elapsed = time.perf_counter() - start
+
+    statistics = logic_manager.tick_statistics
+    p99_tick_ms = statistics.percentile_tick_ns(99) / 1e6
+    peak_memory_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Players: {players_count}, maps: {maps_count} of {map_size}x{map_size}")
+    print(f"Movement: {'vectorized' if vectorized_movement else 'scalar'}")
+    print(f"Ticks: {ticks_count} in {elapsed:.3f}s ({ticks_count / elapsed:.1f}/s)")
+    print(
+        f"Tick time: p50 {statistics.percentile_tick_ns(50) / 1e6:.3f}ms, "
+        f"p99 {p99_tick_ms:.3f}ms, max {statistics.max_tick_ns / 1e6:.3f}ms"
+    )
+    sent_per_player_tick = sent_entities / ticks_count / players_count
+    print(f"Entities sent per player tick: {sent_per_player_tick:.2f}")
+    print(f"Peak memory: {peak_memory_mb:.1f}MB")
+    return p99_tick_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the logic without a display and report its performance"
+    )
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--maps", type=int, default=4)
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--map-size", type=int, default=64)
+    parser.add_argument("--chests-per-map", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--vectorized-movement",
+        action="store_true",
+        help=(
+            "Move players with the NumPy movement system (requires numpy), "
+            "faster from about 50 players per map"
+        ),
+    )
+    parser.add_argument(
+        "--storage-path",
+        default=None,
+        help="Directory of the saves, a temporary one by default",
+    )
+    parser.add_argument(
+        "--max-p99-ms",
+        type=float,
+        default=None,
+        help="Exit with an error when the p99 tick time exceeds this value",
+    )
+    args = parser.parse_args()
+
+    p99_tick_ms = run(
+        args.players,
+        args.maps,
+        args.ticks,
+        args.map_size,
+        args.chests_per_map,
+        args.seed,
+        args.vectorized_movement,
+        args.storage_path,
+    )
+    if args.max_p99_ms is not None and p99_tick_ms > args.max_p99_ms:
+        print(f"p99 tick time above {args.max_p99_ms}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from typing import Iterable
+
+from game_manager.logic.uid_object import Uid
+
+from hard_reset.logic.map.maps import BaseMap
+
+# Dormant maps are only ticked every this many ticks, 0 leaves them frozen until
+# they become active again
+DEFAULT_DORMANT_TICK_INTERVAL = 0
+
+
+class ActivityScheduler:
+    _dormant_tick_interval: int
+    _ticks: int
+    # Simulated time, and its value when each loaded map was last updated
+    _clock: float
+    _last_updates: dict[Uid, float]
+    # Pending timed events keeping maps active without players
+    _holds: dict[Uid, int]
+
+    def __init__(
+        self, dormant_tick_interval: int = DEFAULT_DORMANT_TICK_INTERVAL
+    ) -> None:
+        self._dormant_tick_interval = dormant_tick_interval
+        self._ticks = 0
+        self._clock = 0.0
+        self._last_updates = {}
+        self._holds = {}
+
+    @property
+    def held_map_uids(self) -> list[Uid]:
+        return list(self._holds)
+
+    def is_held(self, map_uid: Uid) -> bool:
+        return map_uid in self._holds
+
+    def hold(self, map_uid: Uid) -> None:
+        self._holds[map_uid] = self._holds.get(map_uid, 0) + 1
+
+    def release(self, map_uid: Uid) -> None:
+        self._holds[map_uid] -= 1
+        if self._holds[map_uid] == 0:
+            del self._holds[map_uid]
+
+    def track(self, map_uid: Uid) -> None:
+        self._last_updates[map_uid] = self._clock
+
+    def forget(self, map_uid: Uid) -> None:
+        self._last_updates.pop(map_uid, None)
+
+    def get_due_maps(
+        self,
+        maps: dict[Uid, BaseMap],
+        active_map_uids: Iterable[Uid],
+        delta_time: float,
+    ) -> list[tuple[BaseMap, float]]:
+        # Dormant maps are not visited, the cost of a tick only depends on the
+        # number of active maps
+        self._ticks += 1
+        self._clock += delta_time
+        if (
+            self._dormant_tick_interval > 0
+            and self._ticks % self._dormant_tick_interval == 0
+        ):
+            due_map_uids = list(maps)
+        else:
+            due_map_uids = [
+                map_uid for map_uid in dict.fromkeys(active_map_uids) if map_uid in maps
+            ]
+        return [(maps[map_uid], self.wake(map_uid)) for map_uid in due_map_uids]
+
+    def wake(self, map_uid: Uid) -> float:
+        # Time the map has to simulate to catch up with the others
+        elapsed = self._clock - self._last_updates.get(map_uid, self._clock)
+        self._last_updates[map_uid] = self._clock
+        return elapsed
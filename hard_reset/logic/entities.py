@@ -1,4 +1,5 @@
-from typing import Protocol
+from array import array
+from typing import TYPE_CHECKING, Callable, Protocol
 
 from game_manager.logic.entity.entity import Entity
 from game_manager.logic.entity.entity_moveable import EntityMoveable
@@ -6,26 +7,102 @@ from game_manager.logic.map.tile import TILE_SIZE
 from game_manager.logic.uid_object import Uid
 from vertyces.vertex import Vertex2f
 
+from hard_reset.logic.item.catalog import CATALOG
 from hard_reset.logic.item.item import Item
 
+if TYPE_CHECKING:
+    from hard_reset.logic.movement import MovementSystem
+
 DEFAULT_DIMENSION = Vertex2f(TILE_SIZE, TILE_SIZE)
+# In pixels per second, moveable entities have unit directions scaled by their
+# speed and the tick duration
+PLAYER_SPEED = 42.0
+
+
+class InventoryError(Exception): ...
+
+
+# Item name, quantity before and after the change
+InventoryChange = tuple[str, int, int]
+InventoryListener = Callable[[InventoryChange], None]
 
 
 class Inventory:
-    _items: dict[str, int]
+    # Worlds hold many chests, inventories avoid per-instance dicts
+    __slots__ = ("_counts", "_version", "_listeners")
+
+    # Quantity of each item indexed by item id, trimmed after the last held item
+    _counts: "array[int]"
+    # Incremented on every quantity change, readers compare it to skip fetches
+    _version: int
+    # Most inventories are never watched, the list is only created when needed
+    _listeners: list[InventoryListener] | None
 
     def __init__(self) -> None:
-        self._items = {}
+        self._counts = array("i")
+        self._version = 0
+        self._listeners = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def add_listener(self, listener: InventoryListener) -> None:
+        if self._listeners is None:
+            self._listeners = []
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: InventoryListener) -> None:
+        if self._listeners is not None:
+            self._listeners.remove(listener)
+            if not self._listeners:
+                self._listeners = None
+
+    def get_quantity(self, item: Item) -> int:
+        counts = self._counts
+        return counts[item.id] if item.id < len(counts) else 0
 
     def add_item(self, item: Item, quantity: int) -> None:
-        self._items[item.name] = self._items.get(item.name, 0) + quantity
+        self._set_quantity(item, self.get_quantity(item) + quantity)
 
     def remove_item(self, item: Item, quantity: int) -> None:
-        if item.name not in self._items:
+        held_quantity = self.get_quantity(item)
+        if quantity > held_quantity:
+            raise InventoryError(
+                f"Cannot remove {quantity} {item.name}, only {held_quantity} held"
+            )
+        self._set_quantity(item, held_quantity - quantity)
+
+    def get_items(self) -> dict[str, int]:
+        # Item names are only used by messaging and storage, the dict is a copy
+        # that may be handed to another thread
+        return {
+            CATALOG.items[item_id].name: quantity
+            for item_id, quantity in enumerate(self._counts)
+            if quantity != 0
+        }
+
+    def set_items(self, items: dict[str, int]) -> None:
+        # Only the quantities that differ are changed and reported
+        for item_name in self.get_items().keys() - items.keys():
+            self._set_quantity(CATALOG.get_item(item_name), 0)
+        for item_name, quantity in items.items():
+            self._set_quantity(CATALOG.get_item(item_name), quantity)
+
+    def _set_quantity(self, item: Item, quantity: int) -> None:
+        old_quantity = self.get_quantity(item)
+        if quantity == old_quantity:
             return
-        self._items[item.name] -= quantity
-        if self._items[item.name] == 0:
-            del self._items[item.name]
+        counts = self._counts
+        if item.id >= len(counts):
+            counts.extend([0] * (item.id + 1 - len(counts)))
+        counts[item.id] = quantity
+        while counts and counts[-1] == 0:
+            counts.pop()
+        self._version += 1
+        if self._listeners is not None:
+            for listener in list(self._listeners):
+                listener((item.name, old_quantity, quantity))
 
 
 class WithInventory(Protocol):
@@ -41,12 +118,52 @@ class Chest(Entity, WithInventory):
     def update(self, delta_time: float) -> None: ...
 
 
-class Player(EntityMoveable, WithInventory):
+class ArrayBackedMoveable(EntityMoveable):
+    # Owns the position, direction and speed while the entity is on a map with
+    # vectorized movement, their reads and writes then go to its arrays
+    _movement_system: "MovementSystem | None" = None
+    _movement_row: int = -1
+    _direction: Vertex2f
+    _speed: float
+
+    @property
+    def direction(self) -> Vertex2f:
+        if self._movement_system is None:
+            return self._direction
+        return self._movement_system.get_direction(self._movement_row)
+
+    @direction.setter
+    def direction(self, direction: Vertex2f) -> None:
+        if self._movement_system is None:
+            self._direction = direction
+        else:
+            self._movement_system.set_direction(self._movement_row, direction)
+
+    @property
+    def speed(self) -> float:
+        if self._movement_system is None:
+            return self._speed
+        return self._movement_system.get_speed(self._movement_row)
+
+    @speed.setter
+    def speed(self, speed: float) -> None:
+        if self._movement_system is None:
+            self._speed = speed
+        else:
+            self._movement_system.set_speed(self._movement_row, speed)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        if name == "bounds" and self._movement_system is not None:
+            self._movement_system.sync_position(self._movement_row)
+
+
+class Player(ArrayBackedMoveable, WithInventory):
 
     def __init__(self, position: Vertex2f) -> None:
         super().__init__(position, Vertex2f(35, 35))
-        self.speed = 1.4
-        self.direction = Vertex2f(self.speed, 0)
+        self.speed = PLAYER_SPEED
+        self.direction = Vertex2f(1, 0)
         self._inventory = Inventory()
 
     def update(self, delta_time: float) -> None: ...
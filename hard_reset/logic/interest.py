@@ -0,0 +1,74 @@
+from dataclasses import dataclass, field
+
+from game_manager.logic.entity.entity import Entity
+from game_manager.logic.map.tile import TILE_SIZE
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.map.maps import BaseMap
+
+# Extra distance around the viewport, entities within it are sent before they
+# become visible
+INTEREST_MARGIN = 2 * TILE_SIZE
+
+
+@dataclass
+class InterestChanges:
+    revision: int
+    full: bool
+    # Entities that entered the area followed by visible entities that changed
+    changed_entities: list[Entity]
+    entered_entity_uids: list[Uid]
+    left_entity_uids: list[Uid]
+
+
+@dataclass
+class InterestArea:
+    viewport_dimensions: Vertex2f
+    map_uid: Uid | None = None
+    visible_entity_uids: set[Uid] = field(default_factory=set)
+
+    def get_changes_since(
+        self, current_map: BaseMap, center: Vertex2f, since_revision: int
+    ) -> InterestChanges:
+        if self.map_uid != current_map.uid:
+            self.map_uid = current_map.uid
+            self.visible_entity_uids = set()
+            since_revision = -1
+
+        map_changes = current_map.get_changes_since(since_revision)
+        if map_changes.full:
+            self.visible_entity_uids = set()
+
+        area_dimensions = self.viewport_dimensions.translated(
+            Vertex2f(INTEREST_MARGIN * 2, INTEREST_MARGIN * 2)
+        )
+        area_position = center.translated(area_dimensions.divided(-2))
+        visible_entities = {
+            entity.uid: entity
+            for entity in current_map.get_entities_in_rect(
+                area_position, area_dimensions
+            )
+        }
+
+        entered_entity_uids = [
+            uid for uid in visible_entities if uid not in self.visible_entity_uids
+        ]
+        left_entity_uids = [
+            uid for uid in self.visible_entity_uids if uid not in visible_entities
+        ]
+        changed_entities = [visible_entities[uid] for uid in entered_entity_uids]
+        changed_entities.extend(
+            entity
+            for entity in map_changes.changed_entities
+            if entity.uid in visible_entities and entity.uid in self.visible_entity_uids
+        )
+        self.visible_entity_uids = set(visible_entities)
+
+        return InterestChanges(
+            revision=map_changes.revision,
+            full=map_changes.full,
+            changed_entities=changed_entities,
+            entered_entity_uids=entered_entity_uids,
+            left_entity_uids=left_entity_uids,
+        )
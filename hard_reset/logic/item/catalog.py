@@ -0,0 +1,141 @@
+import hashlib
+import json
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from hard_reset.logic.item.crafting_index import RecipeRequirements
+from hard_reset.logic.item.crafting_recipe import (
+    CraftingIngredient,
+    SimpleCraftingRecipe,
+)
+from hard_reset.logic.item.item import Item
+
+DEFAULT_CATALOG_PATH = Path(__file__).with_name("catalog.json")
+
+# Recipe requirements sent by messaging, by catalog content hash
+_RECIPE_REQUIREMENTS_PACKETS: dict[str, RecipeRequirements] = {}
+
+
+class CatalogError(Exception): ...
+
+
+class ItemCatalog:
+    # Built once from the catalog data, every lookup is a precomputed table and
+    # nothing is modified afterwards
+    items: tuple[Item, ...]
+    recipes: tuple[SimpleCraftingRecipe, ...]
+    # Hash of the catalog data, identifies the catalog a save or client expects
+    content_hash: str
+
+    _items_by_name: Mapping[str, Item]
+    _recipes_by_result: Mapping[str, SimpleCraftingRecipe]
+    # Recipes using each item as an ingredient, by item id
+    _recipes_by_ingredient: tuple[tuple[SimpleCraftingRecipe, ...], ...]
+    # Ingredient quantities of each recipe, by result name
+    _recipe_requirements: Mapping[str, Mapping[str, int]]
+
+    def __init__(self, data: bytes) -> None:
+        self.content_hash = hashlib.blake2b(data, digest_size=8).hexdigest()
+        try:
+            catalog_data = json.loads(data)
+            self._load_items(catalog_data["items"])
+            self._load_recipes(catalog_data["recipes"])
+        except (json.JSONDecodeError, KeyError, TypeError) as error:
+            raise CatalogError(f"Malformed catalog: {error!r}") from error
+
+    def _load_items(self, items_data: list[dict[str, Any]]) -> None:
+        self.items = tuple(
+            Item(item_data["name"], item_id)
+            for item_id, item_data in enumerate(items_data)
+        )
+        items_by_name = {item.name: item for item in self.items}
+        if len(items_by_name) != len(self.items):
+            raise CatalogError("Item names must be unique")
+        self._items_by_name = MappingProxyType(items_by_name)
+
+    def _load_recipes(self, recipes_data: list[dict[str, Any]]) -> None:
+        recipes = []
+        recipes_by_result: dict[str, SimpleCraftingRecipe] = {}
+        recipes_by_ingredient: list[list[SimpleCraftingRecipe]] = [
+            [] for _ in self.items
+        ]
+        recipe_requirements = {}
+        for recipe_data in recipes_data:
+            result = self._parse_ingredient(recipe_data["result"])
+            result_name = result.item.name
+            if result_name in recipes_by_result:
+                raise CatalogError(f"Several recipes craft {result_name}")
+            ingredients = [
+                self._parse_ingredient(ingredient_data)
+                for ingredient_data in recipe_data["ingredients"]
+            ]
+
+            recipe = SimpleCraftingRecipe(result=result, ingredients=ingredients)
+            recipes.append(recipe)
+            recipes_by_result[result_name] = recipe
+            recipe_requirements[result_name] = MappingProxyType(
+                {
+                    ingredient.item.name: ingredient.quantity
+                    for ingredient in ingredients
+                }
+            )
+            for ingredient in ingredients:
+                recipes_by_ingredient[ingredient.item.id].append(recipe)
+
+        self.recipes = tuple(recipes)
+        self._recipes_by_result = MappingProxyType(recipes_by_result)
+        self._recipes_by_ingredient = tuple(map(tuple, recipes_by_ingredient))
+        self._recipe_requirements = MappingProxyType(recipe_requirements)
+
+    def _parse_ingredient(self, ingredient_data: dict[str, Any]) -> CraftingIngredient:
+        item_name, quantity = ingredient_data["item"], ingredient_data["quantity"]
+        item = self._items_by_name.get(item_name)
+        if item is None or type(quantity) is not int or quantity <= 0:
+            raise _get_ingredient_error(item_name, quantity)
+        return CraftingIngredient(item, quantity)
+
+    @property
+    def recipe_requirements(self) -> Mapping[str, Mapping[str, int]]:
+        return self._recipe_requirements
+
+    def get_recipe_requirements_packet(self) -> RecipeRequirements:
+        # Plain dicts for messaging, built once per catalog data and shared by
+        # every caller, they must not be modified
+        packet = _RECIPE_REQUIREMENTS_PACKETS.get(self.content_hash)
+        if packet is None:
+            packet = {
+                result_name: dict(requirements)
+                for result_name, requirements in self._recipe_requirements.items()
+            }
+            _RECIPE_REQUIREMENTS_PACKETS[self.content_hash] = packet
+        return packet
+
+    def get_item(self, item_name: str) -> Item:
+        return self._items_by_name[item_name]
+
+    def find_item(self, item_name: str) -> Item | None:
+        return self._items_by_name.get(item_name)
+
+    def get_recipe(self, result_name: str) -> SimpleCraftingRecipe:
+        return self._recipes_by_result[result_name]
+
+    def find_recipe(self, result_name: str) -> SimpleCraftingRecipe | None:
+        return self._recipes_by_result.get(result_name)
+
+    def get_recipes_using(self, item: Item) -> tuple[SimpleCraftingRecipe, ...]:
+        return self._recipes_by_ingredient[item.id]
+
+
+def _get_ingredient_error(item_name: str, quantity: object) -> CatalogError:
+    if type(quantity) is not int or quantity <= 0:
+        return CatalogError(f"Invalid quantity {quantity!r} of {item_name}")
+    return CatalogError(f"Unknown item {item_name}")
+
+
+def load_catalog(path: str | Path = DEFAULT_CATALOG_PATH) -> ItemCatalog:
+    with open(path, "rb") as file:
+        return ItemCatalog(file.read())
+
+
+CATALOG = load_catalog()
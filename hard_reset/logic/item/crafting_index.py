@@ -0,0 +1,102 @@
+from typing import Iterable
+
+# Ingredient quantities of each recipe, by item name, as sent by messaging
+RecipeRequirements = dict[str, dict[str, int]]
+
+
+class RecipeIndex:
+    _requirements: RecipeRequirements
+    # Recipes using each ingredient, with the quantity they need
+    _recipes_by_ingredient: dict[str, list[tuple[str, int]]]
+
+    def __init__(self, requirements: RecipeRequirements) -> None:
+        self._requirements = requirements
+        self._recipes_by_ingredient = {}
+        for recipe_name, ingredients in requirements.items():
+            for item_name, quantity in ingredients.items():
+                self._recipes_by_ingredient.setdefault(item_name, []).append(
+                    (recipe_name, quantity)
+                )
+
+    @property
+    def recipe_names(self) -> list[str]:
+        return list(self._requirements)
+
+    def get_ingredients(self, recipe_name: str) -> dict[str, int]:
+        return self._requirements[recipe_name]
+
+    def get_recipes_using(self, item_name: str) -> list[tuple[str, int]]:
+        return self._recipes_by_ingredient.get(item_name, [])
+
+
+class CraftabilityTracker:
+    _index: RecipeIndex
+    _quantities: dict[str, int]
+    # Ingredients each recipe lacks, recipes are craftable when it reaches 0
+    _missing_counts: dict[str, int]
+
+    def __init__(self, index: RecipeIndex) -> None:
+        self._index = index
+        self.reset()
+
+    def reset(self) -> None:
+        # Back to an empty inventory
+        self._quantities = {}
+        self._missing_counts = {
+            recipe_name: len(self._index.get_ingredients(recipe_name))
+            for recipe_name in self._index.recipe_names
+        }
+
+    def is_craftable(self, recipe_name: str) -> bool:
+        return self._missing_counts[recipe_name] == 0
+
+    @property
+    def craftable_recipe_names(self) -> list[str]:
+        return [
+            recipe_name
+            for recipe_name, missing_count in self._missing_counts.items()
+            if missing_count == 0
+        ]
+
+    def update(self, inventory: dict[str, int]) -> tuple[list[str], list[str]]:
+        # Only recipes using items whose quantity changed are checked again,
+        # returns the recipes that became craftable and uncraftable
+        changed_item_names = [
+            item_name
+            for item_name in self._quantities.keys() | inventory.keys()
+            if self._quantities.get(item_name, 0) != inventory.get(item_name, 0)
+        ]
+        return self.set_quantities(
+            (item_name, inventory.get(item_name, 0)) for item_name in changed_item_names
+        )
+
+    def set_quantities(
+        self, quantities: Iterable[tuple[str, int]]
+    ) -> tuple[list[str], list[str]]:
+        # Craftability of the touched recipes before the change
+        was_craftable: dict[str, bool] = {}
+        for item_name, quantity in quantities:
+            previous_quantity = self._quantities.get(item_name, 0)
+            if quantity == 0:
+                self._quantities.pop(item_name, None)
+            else:
+                self._quantities[item_name] = quantity
+
+            for recipe_name, needed_quantity in self._index.get_recipes_using(
+                item_name
+            ):
+                had_enough = previous_quantity >= needed_quantity
+                has_enough = quantity >= needed_quantity
+                if had_enough == has_enough:
+                    continue
+                was_craftable.setdefault(recipe_name, self.is_craftable(recipe_name))
+                self._missing_counts[recipe_name] += -1 if has_enough else 1
+
+        became_craftable = []
+        became_uncraftable = []
+        for recipe_name, craftable in was_craftable.items():
+            if self.is_craftable(recipe_name) and not craftable:
+                became_craftable.append(recipe_name)
+            elif craftable and not self.is_craftable(recipe_name):
+                became_uncraftable.append(recipe_name)
+        return became_craftable, became_uncraftable
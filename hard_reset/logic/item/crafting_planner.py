@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+
+from hard_reset.logic.entities import Inventory
+from hard_reset.logic.item.catalog import CATALOG
+from hard_reset.logic.item.crafting_recipe import SimpleCraftingRecipe
+from hard_reset.logic.item.item import Item
+
+
+@dataclass
+class CraftingPlan:
+    recipe: SimpleCraftingRecipe
+    # Times the requested recipe is crafted, at most the requested quantity
+    quantity: int
+    # Times each recipe is crafted, ingredients are crafted before their users
+    crafts: dict[str, int]
+    # Net quantity change of each item, by item id
+    item_deltas: dict[int, int]
+
+
+class _PlanSimulation:
+    _inventory: Inventory
+    _recursive: bool
+    # Quantities after the simulated crafts, read from the inventory on demand
+    stock: dict[int, int]
+    crafts: dict[str, int]
+
+    def __init__(self, inventory: Inventory, recursive: bool) -> None:
+        self._inventory = inventory
+        self._recursive = recursive
+        self.stock = {}
+        self.crafts = {}
+
+    def craft(
+        self, recipe: SimpleCraftingRecipe, times: int, crafting: frozenset[int]
+    ) -> bool:
+        # Recipes being crafted up the chain are not used again, which breaks
+        # cycles between recipes
+        crafting = crafting | {recipe._result.item.id}
+        for ingredient in recipe._ingredients:
+            if not self._take(ingredient.item, ingredient.quantity * times, crafting):
+                return False
+        result = recipe._result
+        self._add(result.item, result.quantity * times)
+        recipe_name = result.item.name
+        self.crafts[recipe_name] = self.crafts.get(recipe_name, 0) + times
+        return True
+
+    def _get_stock(self, item: Item) -> int:
+        if item.id not in self.stock:
+            self.stock[item.id] = self._inventory.get_quantity(item)
+        return self.stock[item.id]
+
+    def _add(self, item: Item, quantity: int) -> None:
+        self.stock[item.id] = self._get_stock(item) + quantity
+
+    def _take(self, item: Item, quantity: int, crafting: frozenset[int]) -> bool:
+        missing_quantity = quantity - self._get_stock(item)
+        if missing_quantity > 0:
+            recipe = CATALOG.find_recipe(item.name)
+            if not self._recursive or recipe is None or item.id in crafting:
+                return False
+            result_quantity = recipe._result.quantity
+            # Leftovers of the last craft stay in the stock for later uses
+            times = -(-missing_quantity // result_quantity)
+            if not self.craft(recipe, times, crafting):
+                return False
+        self._add(item, -quantity)
+        return True
+
+
+def _simulate(
+    inventory: Inventory, recipe: SimpleCraftingRecipe, times: int, recursive: bool
+) -> _PlanSimulation | None:
+    simulation = _PlanSimulation(inventory, recursive)
+    if not simulation.craft(recipe, times, frozenset()):
+        return None
+    return simulation
+
+
+def plan_crafts(
+    inventory: Inventory,
+    recipe: SimpleCraftingRecipe,
+    quantity: int,
+    recursive: bool = False,
+) -> CraftingPlan:
+    # Largest number of crafts up to quantity, found by bisection since a plan
+    # for more crafts never needs fewer items
+    best_quantity, best_simulation = 0, _PlanSimulation(inventory, recursive)
+    low, high = 1, quantity
+    while low <= high:
+        times = (low + high) // 2
+        simulation = _simulate(inventory, recipe, times, recursive)
+        if simulation is None:
+            high = times - 1
+        else:
+            best_quantity, best_simulation = times, simulation
+            low = times + 1
+
+    item_deltas = {
+        item_id: quantity - inventory.get_quantity(CATALOG.items[item_id])
+        for item_id, quantity in best_simulation.stock.items()
+        if quantity != inventory.get_quantity(CATALOG.items[item_id])
+    }
+    return CraftingPlan(recipe, best_quantity, best_simulation.crafts, item_deltas)
+
+
+def apply_crafting_plan(inventory: Inventory, plan: CraftingPlan) -> None:
+    # The plan was checked against the whole inventory, it applies at once
+    for item_id, delta in plan.item_deltas.items():
+        if delta > 0:
+            inventory.add_item(CATALOG.items[item_id], delta)
+        else:
+            inventory.remove_item(CATALOG.items[item_id], -delta)
@@ -1,11 +1,10 @@
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from hard_reset.logic.item.item import (
-    CRAFTING_BENCH_ITEM,
-    WOODEN_PLANK,
-    WOODEN_STICK,
-    Item,
-)
+from hard_reset.logic.item.item import Item
+
+if TYPE_CHECKING:
+    from hard_reset.logic.entities import Inventory
 
 
 @dataclass
@@ -25,27 +24,8 @@ class SimpleCraftingRecipe:
         self._ingredients = ingredients
         self._result = result
 
-    def can_craft(self, inventory: dict[str, int]) -> bool:
+    def can_craft(self, inventory: "Inventory") -> bool:
         for ingredient in self._ingredients:
-            if inventory.get(ingredient.item.name, 0) < ingredient.quantity:
+            if inventory.get_quantity(ingredient.item) < ingredient.quantity:
                 return False
         return True
-
-
-CRAFTING_BENCH_RECIPE = SimpleCraftingRecipe(
-    result=CraftingIngredient(CRAFTING_BENCH_ITEM, 1),
-    ingredients=[
-        CraftingIngredient(WOODEN_PLANK, 1),
-        CraftingIngredient(WOODEN_STICK, 4),
-    ],
-)
-
-WOODEN_STICK_FROM_PLANK = SimpleCraftingRecipe(
-    result=CraftingIngredient(WOODEN_STICK, 4),
-    ingredients=[CraftingIngredient(WOODEN_PLANK, 1)],
-)
-
-CRAFTING_RECIPES = [CRAFTING_BENCH_RECIPE, WOODEN_STICK_FROM_PLANK]
-RESULT_NAME_TO_RECIPE = {
-    recipe._result.item.name: recipe for recipe in CRAFTING_RECIPES
-}
@@ -0,0 +1,39 @@
+from typing import Sequence
+
+from game_manager.logic.uid_object import Uid
+
+from hard_reset.logic.entities import Inventory, InventoryError
+from hard_reset.logic.item.catalog import CATALOG
+
+# Source inventory, destination inventory, item name, quantity
+ItemMove = tuple[Uid, Uid, str, int]
+
+
+def transfer_items(
+    inventories: dict[Uid, Inventory], moves: Sequence[ItemMove]
+) -> None:
+    # Moves are checked in order against the quantities left by the previous
+    # ones, nothing is applied when one of them fails
+    deltas: dict[tuple[Uid, int], int] = {}
+    for from_uid, to_uid, item_name, quantity in moves:
+        if from_uid not in inventories or to_uid not in inventories:
+            raise InventoryError("Moves must be between the given inventories")
+        item = CATALOG.find_item(item_name)
+        if item is None:
+            raise InventoryError(f"Unknown item {item_name}")
+        if quantity <= 0:
+            raise InventoryError(f"Cannot move {quantity} {item_name}")
+
+        from_key = (from_uid, item.id)
+        from_delta = deltas.get(from_key, 0) - quantity
+        if inventories[from_uid].get_quantity(item) + from_delta < 0:
+            raise InventoryError(f"Not enough {item_name} to move {quantity}")
+        deltas[from_key] = from_delta
+        to_key = (to_uid, item.id)
+        deltas[to_key] = deltas.get(to_key, 0) + quantity
+
+    for (uid, item_id), delta in deltas.items():
+        if delta > 0:
+            inventories[uid].add_item(CATALOG.items[item_id], delta)
+        elif delta < 0:
+            inventories[uid].remove_item(CATALOG.items[item_id], -delta)
@@ -1,10 +1,71 @@
-from game_manager.fs_storage.fs_storage_manager import FileSystemStorageManager
+import base64
+from dataclasses import dataclass
+from typing import cast
+from uuid import UUID, uuid5
+
+from game_manager.logic.uid_object import Uid
 from vertyces.vertex import Vertex2f
 
 from hard_reset.logic.entities import Player
+from hard_reset.storage.sqlite_storage_manager import SQLiteStorageManager
+
+
+@dataclass
+class PlayerStore:
+    player: Player
+    map_uid: Uid
+
+    @property
+    def _uid(self) -> Uid:
+        return self.player.uid
+
+
+@dataclass
+class MapStore:
+    map_uid: Uid
+    # Chests are rebuilt by the map factory with new uids, their position
+    # identifies them
+    chest_items: list[tuple[Vertex2f, dict[str, int]]]
+
+    @property
+    def _uid(self) -> Uid:
+        return self.map_uid
+
+
+def get_chunk_uid(map_uid: Uid, chunk_x: int, chunk_y: int) -> Uid:
+    return uuid5(map_uid, f"{chunk_x},{chunk_y}")
+
+
+@dataclass
+class ChunkStore:
+    map_uid: Uid
+    chunk_x: int
+    chunk_y: int
+    # None while the chunk keeps its authored tiles
+    tile_ids: bytes | None
+    chest_items: list[tuple[Vertex2f, dict[str, int]]]
+
+    @property
+    def _uid(self) -> Uid:
+        return get_chunk_uid(self.map_uid, self.chunk_x, self.chunk_y)
+
+
+def get_timers_uid(map_uid: Uid) -> Uid:
+    return uuid5(map_uid, "timers")
+
+
+@dataclass
+class TimerStore:
+    map_uid: Uid
+    # Uid, ticks left, event name, payload and map hold of each pending timer
+    timers: list[tuple[Uid, int, str, dict[str, object], bool]]
+
+    @property
+    def _uid(self) -> Uid:
+        return get_timers_uid(self.map_uid)
 
 
-class LogicStorageManager(FileSystemStorageManager):
+class LogicStorageManager(SQLiteStorageManager):
 
     def _unparse_object(self, object_to_unparse: object) -> dict[object, object]:
         if isinstance(object_to_unparse, Vertex2f):
@@ -16,7 +77,50 @@ class LogicStorageManager(FileSystemStorageManager):
         if isinstance(object_to_unparse, Player):
             return {
                 "type": "Player",
+                "uid": str(object_to_unparse.uid),
                 "position": self._unparse_object(object_to_unparse.position),
+                "inventory": object_to_unparse._inventory.get_items(),
+            }
+        if isinstance(object_to_unparse, PlayerStore):
+            return {
+                "type": "PlayerStore",
+                "player": self._unparse_object(object_to_unparse.player),
+                "map_uid": str(object_to_unparse.map_uid),
+            }
+        if isinstance(object_to_unparse, MapStore):
+            return {
+                "type": "MapStore",
+                "map_uid": str(object_to_unparse.map_uid),
+                "chests": self._unparse_chest_items(object_to_unparse.chest_items),
+            }
+        if isinstance(object_to_unparse, ChunkStore):
+            tile_ids = object_to_unparse.tile_ids
+            return {
+                "type": "ChunkStore",
+                "map_uid": str(object_to_unparse.map_uid),
+                "chunk_x": object_to_unparse.chunk_x,
+                "chunk_y": object_to_unparse.chunk_y,
+                "tile_ids": (
+                    None if tile_ids is None else base64.b64encode(tile_ids).decode()
+                ),
+                "chests": self._unparse_chest_items(object_to_unparse.chest_items),
+            }
+        if isinstance(object_to_unparse, TimerStore):
+            return {
+                "type": "TimerStore",
+                "map_uid": str(object_to_unparse.map_uid),
+                "timers": [
+                    {
+                        "uid": str(timer_uid),
+                        "remaining_ticks": remaining_ticks,
+                        "event_name": event_name,
+                        "payload": payload,
+                        "hold_map": hold_map,
+                    }
+                    for timer_uid, remaining_ticks, event_name, payload, hold_map in (
+                        object_to_unparse.timers
+                    )
+                ],
             }
         else:
             raise ValueError(
@@ -26,8 +130,80 @@ class LogicStorageManager(FileSystemStorageManager):
     def _parse_object(self, object_data: dict[object, object]) -> object:
         object_type = object_data["type"]
         if object_type == "Vertex2f":
-            return Vertex2f(object_data["x"], object_data["y"])  # type: ignore[arg-type]
+            return Vertex2f(
+                cast(float, object_data["x"]), cast(float, object_data["y"])
+            )
         elif object_type == "Player":
-            return Player(self._parse_object(object_data["position"]))  # type: ignore[arg-type]
+            position = self._parse_object(
+                cast(dict[object, object], object_data["position"])
+            )
+            player = Player(cast(Vertex2f, position))
+            if "uid" in object_data:
+                player._uid = UUID(str(object_data["uid"]))
+            if "inventory" in object_data:
+                inventory = cast(dict[str, int], object_data["inventory"])
+                player._inventory.set_items(inventory)
+            return player
+        elif object_type == "PlayerStore":
+            return PlayerStore(
+                cast(
+                    Player,
+                    self._parse_object(
+                        cast(dict[object, object], object_data["player"])
+                    ),
+                ),
+                UUID(str(object_data["map_uid"])),
+            )
+        elif object_type == "MapStore":
+            return MapStore(
+                UUID(str(object_data["map_uid"])),
+                self._parse_chest_items(object_data["chests"]),
+            )
+        elif object_type == "ChunkStore":
+            tile_ids = object_data["tile_ids"]
+            return ChunkStore(
+                UUID(str(object_data["map_uid"])),
+                cast(int, object_data["chunk_x"]),
+                cast(int, object_data["chunk_y"]),
+                base64.b64decode(str(tile_ids)) if tile_ids is not None else None,
+                self._parse_chest_items(object_data["chests"]),
+            )
+        elif object_type == "TimerStore":
+            return TimerStore(
+                UUID(str(object_data["map_uid"])),
+                [
+                    (
+                        UUID(str(timer_data["uid"])),
+                        cast(int, timer_data["remaining_ticks"]),
+                        str(timer_data["event_name"]),
+                        cast(dict[str, object], timer_data["payload"]),
+                        bool(timer_data["hold_map"]),
+                    )
+                    for timer_data in cast(
+                        list[dict[object, object]], object_data["timers"]
+                    )
+                ],
+            )
         else:
             raise ValueError(f"Object with data {object_data} is not parsable")
+
+    def _unparse_chest_items(
+        self, chest_items: list[tuple[Vertex2f, dict[str, int]]]
+    ) -> list[dict[object, object]]:
+        return [
+            {"position": self._unparse_object(position), "items": items}
+            for position, items in chest_items
+        ]
+
+    def _parse_chest_items(
+        self, chests_data: object
+    ) -> list[tuple[Vertex2f, dict[str, int]]]:
+        chest_items = []
+        for chest_data in cast(list[dict[object, object]], chests_data):
+            position = cast(
+                Vertex2f,
+                self._parse_object(cast(dict[object, object], chest_data["position"])),
+            )
+            items = cast(dict[str, int], chest_data["items"])
+            chest_items.append((position, items))
+        return chest_items
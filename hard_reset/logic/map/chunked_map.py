@@ -0,0 +1,441 @@
+import hashlib
+from abc import ABC
+from contextlib import AbstractContextManager, nullcontext
+
+from game_manager.logic.entity.entity import Entity
+from game_manager.logic.entity.entity_moveable import EntityMoveable
+from game_manager.logic.map.tile import Tile
+from game_manager.logic.map.tiled_map import TILE_SIZE, TiledMap
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Chest
+from hard_reset.logic.logic_storage_manager import ChunkStore, get_chunk_uid
+from hard_reset.logic.map.maps import BaseMap
+from hard_reset.logic.map.tiles import GROUND_TILE, TILES, WALL_TILE, get_tile_id
+from hard_reset.storage.sqlite_storage_manager import SQLiteStorageManager
+
+# Side of a chunk, in tiles
+CHUNK_SIZE = 32
+# Chunks within this many chunks of a moveable entity stay loaded
+CHUNK_LOAD_RADIUS = 1
+
+ChunkPosition = tuple[int, int]
+
+
+class MapChunk:
+    chunk_x: int
+    chunk_y: int
+    # Row-major grids of the chunk tiles (index is local y * CHUNK_SIZE + local x)
+    tile_ids: bytearray
+    walkability: bytearray
+    # Entities loaded and unloaded with the chunk
+    entity_uids: list[Uid]
+    # Tiles differ from the authored ones and must be stored
+    dirty: bool
+
+    def __init__(self, chunk_x: int, chunk_y: int) -> None:
+        self.chunk_x = chunk_x
+        self.chunk_y = chunk_y
+        self.tile_ids = bytearray([get_tile_id(GROUND_TILE)]) * CHUNK_SIZE**2
+        self.walkability = bytearray([GROUND_TILE.walkable]) * CHUNK_SIZE**2
+        self.entity_uids = []
+        self.dirty = False
+
+    def _get_index(self, x: int, y: int) -> int:
+        return (
+            (y - self.chunk_y * CHUNK_SIZE) * CHUNK_SIZE + x - self.chunk_x * CHUNK_SIZE
+        )
+
+    def get_tile_id(self, x: int, y: int) -> int:
+        return self.tile_ids[self._get_index(x, y)]
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        return bool(self.walkability[self._get_index(x, y)])
+
+    def set_tile(self, x: int, y: int, tile: Tile) -> None:
+        # Coordinates are in map tiles, they must fall inside the chunk
+        index = self._get_index(x, y)
+        self.tile_ids[index] = get_tile_id(tile)
+        self.walkability[index] = tile.walkable
+
+    def set_tile_ids(self, tile_ids: bytes) -> None:
+        self.tile_ids[:] = tile_ids
+        self.walkability[:] = bytes(TILES[tile_id].walkable for tile_id in tile_ids)
+
+
+class ChunkedMap(BaseMap, ABC):
+    # Only chunks near moveable entities are resident, the others are built (or
+    # read from the storage) again when touched
+    _chunks: dict[ChunkPosition, MapChunk]
+    # Modified chunks are stored on unload and save when set
+    _storage_manager: SQLiteStorageManager | None
+    # The full grids (one byte per tile each) are only assembled from the
+    # chunks when first read, for layouts, paths, assets or vectorized
+    # movement, then set_tile keeps them up to date
+    _grids_assembled: bool
+    # Digest of the tile ids of every chunk once the grids are assembled,
+    # combined into the layout hash
+    _chunk_digests: dict[ChunkPosition, bytes]
+
+    def __init__(self, width_in_tiles: int, height_in_tiles: int) -> None:
+        self._chunks = {}
+        self._storage_manager = None
+        self._grids_assembled = False
+        self._chunk_digests = {}
+        self._init_state()
+        self._tile_id_grid = bytearray()
+        self._walkability_grid = bytearray()
+
+        # Tiles live in the chunks, TiledMap only keeps the dimensions
+        TiledMap.__init__(self, 0, 0, default_tile=GROUND_TILE)
+        self.width_in_tiles = width_in_tiles
+        self.height_in_tiles = height_in_tiles
+        self.width = width_in_tiles * TILE_SIZE
+        self.height = height_in_tiles * TILE_SIZE
+
+    def _build_chunk(self, chunk: MapChunk) -> list[Entity]:
+        # Authored content of a chunk, its tiles are set with chunk.set_tile and
+        # the returned entities are added with it
+        return []
+
+    def set_storage_manager(self, storage_manager: SQLiteStorageManager) -> None:
+        self._storage_manager = storage_manager
+
+    @property
+    def loaded_chunk_positions(self) -> list[ChunkPosition]:
+        return list(self._chunks)
+
+    @property
+    def resident_tiles_count(self) -> int:
+        return len(self._chunks) * CHUNK_SIZE**2
+
+    @property
+    def layout_hash(self) -> str:
+        # Derived from the tiles like for other maps, a tile change only
+        # hashes its chunk again
+        if self._layout_hash is None:
+            self._assemble_grids()
+            digest = hashlib.blake2b(digest_size=8)
+            digest.update(f"{self.width_in_tiles}x{self.height_in_tiles}".encode())
+            for chunk_position in self._get_all_chunk_positions():
+                digest.update(self._chunk_digests[chunk_position])
+            self._layout_hash = digest.hexdigest()
+        return self._layout_hash
+
+    @property
+    def tile_id_grid(self) -> memoryview:
+        self._assemble_grids()
+        return super().tile_id_grid
+
+    @property
+    def walkability_grid(self) -> memoryview:
+        self._assemble_grids()
+        return super().walkability_grid
+
+    def update(self, delta_time: float) -> None:
+        super().update(delta_time)
+        self.refresh_chunks()
+
+    def get_tile(self, x: int, y: int) -> Tile:
+        # Chunks outside of the map would be created and cached
+        self._check_bounds(x, y)
+        return TILES[self.get_chunk(x // CHUNK_SIZE, y // CHUNK_SIZE).get_tile_id(x, y)]
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        if not self._contains(x, y):
+            return False
+        return self.get_chunk(x // CHUNK_SIZE, y // CHUNK_SIZE).is_walkable(x, y)
+
+    def _contains(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width_in_tiles and 0 <= y < self.height_in_tiles
+
+    def _check_bounds(self, x: int, y: int) -> None:
+        if not self._contains(x, y):
+            raise IndexError(f"Tile ({x}, {y}) is outside of the map")
+
+    def set_tile(self, x: int, y: int, tile: Tile) -> None:
+        self._check_bounds(x, y)
+        chunk = self.get_chunk(x // CHUNK_SIZE, y // CHUNK_SIZE)
+        if chunk.get_tile_id(x, y) == get_tile_id(tile):
+            return
+        walkability_changed = chunk.is_walkable(x, y) != tile.walkable
+        chunk.set_tile(x, y, tile)
+        chunk.dirty = True
+        if self._grids_assembled:
+            # Also counts the walkability change
+            self._set_grid_tile(x, y, tile)
+            self._chunk_digests[(chunk.chunk_x, chunk.chunk_y)] = _get_chunk_digest(
+                chunk
+            )
+        elif walkability_changed:
+            self._walkability_revision += 1
+        self._layout_hash = None
+
+    def add_entity(self, entity: Entity) -> None:
+        super().add_entity(entity)
+        if isinstance(entity, EntityMoveable):
+            self._load_chunks_around(entity.bounds.position)
+
+    def get_entities_in_rect(
+        self, position: Vertex2f, dimensions: Vertex2f
+    ) -> list[Entity]:
+        self._load_chunks_in_rect(position, dimensions)
+        return super().get_entities_in_rect(position, dimensions)
+
+    def get_entities_in_radius(self, center: Vertex2f, radius: float) -> list[Entity]:
+        self._load_chunks_in_rect(
+            center.translated(Vertex2f(-radius, -radius)),
+            Vertex2f(2 * radius, 2 * radius),
+        )
+        return super().get_entities_in_radius(center, radius)
+
+    def get_chunk(self, chunk_x: int, chunk_y: int) -> MapChunk:
+        chunk = self._chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            chunk = self._load_chunk(
+                chunk_x, chunk_y, self._retrieve_chunk_store(chunk_x, chunk_y)
+            )
+        return chunk
+
+    def refresh_chunks(self) -> None:
+        # Chunks near moveable entities are loaded ahead, the others unloaded
+        needed_positions: set[ChunkPosition] = set()
+        for x, y in self._get_moveable_positions():
+            needed_positions.update(self._get_chunk_positions_around(x, y))
+        with self._storage_transaction():
+            for chunk_position in list(self._chunks):
+                if chunk_position not in needed_positions:
+                    self._unload_chunk(self._chunks[chunk_position])
+
+        # Stored chunks to load are read in one go
+        missing_positions = [
+            chunk_position
+            for chunk_position in needed_positions
+            if chunk_position not in self._chunks
+        ]
+        chunk_stores = (
+            self._storage_manager.retrieve_objects(
+                ChunkStore,
+                [
+                    get_chunk_uid(self.uid, chunk_x, chunk_y)
+                    for chunk_x, chunk_y in missing_positions
+                ],
+            )
+            if self._storage_manager is not None and missing_positions
+            else {}
+        )
+        for chunk_x, chunk_y in missing_positions:
+            self._load_chunk(
+                chunk_x,
+                chunk_y,
+                chunk_stores.get(get_chunk_uid(self.uid, chunk_x, chunk_y)),
+            )
+
+    def store_chunks(self) -> None:
+        with self._storage_transaction():
+            for chunk in self._chunks.values():
+                self._store_chunk(chunk)
+
+    def unload_chunks(self) -> None:
+        with self._storage_transaction():
+            for chunk in list(self._chunks.values()):
+                self._unload_chunk(chunk)
+
+    def _storage_transaction(self) -> AbstractContextManager[None]:
+        if self._storage_manager is None:
+            return nullcontext()
+        return self._storage_manager.transaction()
+
+    def _get_moveable_positions(self) -> list[tuple[float, float]]:
+        positions = list(self._moveable_positions.values())
+        if self._movement_system is not None:
+            positions.extend(self._movement_system.get_positions())
+        return positions
+
+    def _get_all_chunk_positions(self) -> list[ChunkPosition]:
+        return [
+            (chunk_x, chunk_y)
+            for chunk_y in range(self._max_chunk_y + 1)
+            for chunk_x in range(self._max_chunk_x + 1)
+        ]
+
+    def _assemble_grids(self) -> None:
+        # Chunks that are not resident are built for their tiles only, their
+        # entities are dropped
+        if self._grids_assembled:
+            return
+        tiles_count = self.width_in_tiles * self.height_in_tiles
+        self._tile_id_grid = bytearray(tiles_count)
+        self._walkability_grid = bytearray(tiles_count)
+
+        chunk_positions = self._get_all_chunk_positions()
+        chunk_stores = (
+            self._storage_manager.retrieve_objects(
+                ChunkStore,
+                [
+                    get_chunk_uid(self.uid, chunk_x, chunk_y)
+                    for chunk_x, chunk_y in chunk_positions
+                    if (chunk_x, chunk_y) not in self._chunks
+                ],
+            )
+            if self._storage_manager is not None
+            else {}
+        )
+        for chunk_x, chunk_y in chunk_positions:
+            chunk = self._chunks.get((chunk_x, chunk_y))
+            if chunk is None:
+                chunk = self._build_chunk_tiles(
+                    chunk_x,
+                    chunk_y,
+                    chunk_stores.get(get_chunk_uid(self.uid, chunk_x, chunk_y)),
+                )
+            self._copy_chunk_to_grids(chunk)
+            self._chunk_digests[(chunk_x, chunk_y)] = _get_chunk_digest(chunk)
+        self._grids_assembled = True
+
+    def _build_chunk_tiles(
+        self, chunk_x: int, chunk_y: int, chunk_store: ChunkStore | None
+    ) -> MapChunk:
+        chunk = MapChunk(chunk_x, chunk_y)
+        self._wall_borders(chunk)
+        self._build_chunk(chunk)
+        if chunk_store is not None and chunk_store.tile_ids is not None:
+            chunk.set_tile_ids(chunk_store.tile_ids)
+        return chunk
+
+    def _copy_chunk_to_grids(self, chunk: MapChunk) -> None:
+        # Edge chunks may stick out of the map, only the rows and columns
+        # inside are copied
+        min_x, min_y = chunk.chunk_x * CHUNK_SIZE, chunk.chunk_y * CHUNK_SIZE
+        columns = min(CHUNK_SIZE, self.width_in_tiles - min_x)
+        for local_y in range(min(CHUNK_SIZE, self.height_in_tiles - min_y)):
+            chunk_index = local_y * CHUNK_SIZE
+            grid_index = (min_y + local_y) * self.width_in_tiles + min_x
+            self._tile_id_grid[grid_index : grid_index + columns] = chunk.tile_ids[
+                chunk_index : chunk_index + columns
+            ]
+            self._walkability_grid[grid_index : grid_index + columns] = (
+                chunk.walkability[chunk_index : chunk_index + columns]
+            )
+
+    def _get_chunk_positions_around(self, x: float, y: float) -> list[ChunkPosition]:
+        chunk_pixels = CHUNK_SIZE * TILE_SIZE
+        center_x, center_y = int(x // chunk_pixels), int(y // chunk_pixels)
+        return [
+            (chunk_x, chunk_y)
+            for chunk_x in range(
+                max(center_x - CHUNK_LOAD_RADIUS, 0),
+                min(center_x + CHUNK_LOAD_RADIUS, self._max_chunk_x) + 1,
+            )
+            for chunk_y in range(
+                max(center_y - CHUNK_LOAD_RADIUS, 0),
+                min(center_y + CHUNK_LOAD_RADIUS, self._max_chunk_y) + 1,
+            )
+        ]
+
+    @property
+    def _max_chunk_x(self) -> int:
+        return (self.width_in_tiles - 1) // CHUNK_SIZE
+
+    @property
+    def _max_chunk_y(self) -> int:
+        return (self.height_in_tiles - 1) // CHUNK_SIZE
+
+    def _load_chunks_around(self, position: Vertex2f) -> None:
+        for chunk_x, chunk_y in self._get_chunk_positions_around(
+            position.x, position.y
+        ):
+            self.get_chunk(chunk_x, chunk_y)
+
+    def _load_chunks_in_rect(self, position: Vertex2f, dimensions: Vertex2f) -> None:
+        chunk_pixels = CHUNK_SIZE * TILE_SIZE
+        for chunk_x in range(
+            max(int(position.x // chunk_pixels), 0),
+            min(int((position.x + dimensions.x) // chunk_pixels), self._max_chunk_x)
+            + 1,
+        ):
+            for chunk_y in range(
+                max(int(position.y // chunk_pixels), 0),
+                min(int((position.y + dimensions.y) // chunk_pixels), self._max_chunk_y)
+                + 1,
+            ):
+                self.get_chunk(chunk_x, chunk_y)
+
+    def _retrieve_chunk_store(self, chunk_x: int, chunk_y: int) -> ChunkStore | None:
+        if self._storage_manager is None:
+            return None
+        return self._storage_manager.retrieve_object(
+            ChunkStore, get_chunk_uid(self.uid, chunk_x, chunk_y)
+        )
+
+    def _load_chunk(
+        self, chunk_x: int, chunk_y: int, chunk_store: ChunkStore | None
+    ) -> MapChunk:
+        chunk = MapChunk(chunk_x, chunk_y)
+        self._wall_borders(chunk)
+        entities = self._build_chunk(chunk)
+
+        if chunk_store is not None:
+            if chunk_store.tile_ids is not None:
+                chunk.set_tile_ids(chunk_store.tile_ids)
+                chunk.dirty = True
+            # Chests are built again with new uids, their position identifies them
+            chests = {
+                (entity.bounds.position.x, entity.bounds.position.y): entity
+                for entity in entities
+                if isinstance(entity, Chest)
+            }
+            for position, items in chunk_store.chest_items:
+                chest = chests.get((position.x, position.y))
+                if chest is not None:
+                    chest._inventory.set_items(items)
+
+        self._chunks[(chunk_x, chunk_y)] = chunk
+        for entity in entities:
+            super().add_entity(entity)
+            chunk.entity_uids.append(entity.uid)
+        return chunk
+
+    def _unload_chunk(self, chunk: MapChunk) -> None:
+        self._store_chunk(chunk)
+        for entity_uid in chunk.entity_uids:
+            self.remove_entity(entity_uid)
+        del self._chunks[(chunk.chunk_x, chunk.chunk_y)]
+
+    def _store_chunk(self, chunk: MapChunk) -> None:
+        chest_items = [
+            (entity.bounds.position, entity._inventory.get_items())
+            for entity_uid in chunk.entity_uids
+            if isinstance(entity := self._entities[entity_uid], Chest)
+        ]
+        if self._storage_manager is not None and (chunk.dirty or chest_items):
+            self._storage_manager.store_object(
+                ChunkStore(
+                    self.uid,
+                    chunk.chunk_x,
+                    chunk.chunk_y,
+                    bytes(chunk.tile_ids) if chunk.dirty else None,
+                    chest_items,
+                )
+            )
+
+    def _wall_borders(self, chunk: MapChunk) -> None:
+        # Only chunks on the edges of the map hold border walls
+        min_x, min_y = chunk.chunk_x * CHUNK_SIZE, chunk.chunk_y * CHUNK_SIZE
+        max_x = min(min_x + CHUNK_SIZE, self.width_in_tiles) - 1
+        max_y = min(min_y + CHUNK_SIZE, self.height_in_tiles) - 1
+        for y in range(min_y, max_y + 1):
+            if min_x == 0:
+                chunk.set_tile(0, y, WALL_TILE)
+            if max_x == self.width_in_tiles - 1:
+                chunk.set_tile(max_x, y, WALL_TILE)
+        for x in range(min_x, max_x + 1):
+            if min_y == 0:
+                chunk.set_tile(x, 0, WALL_TILE)
+            if max_y == self.height_in_tiles - 1:
+                chunk.set_tile(x, max_y, WALL_TILE)
+
+
+def _get_chunk_digest(chunk: MapChunk) -> bytes:
+    return hashlib.blake2b(chunk.tile_ids, digest_size=8).digest()
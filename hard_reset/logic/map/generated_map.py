@@ -0,0 +1,111 @@
+import random
+from uuid import UUID
+
+from game_manager.logic.entity.entity import Entity
+from game_manager.logic.map.tile import TILE_SIZE
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Chest
+from hard_reset.logic.item.catalog import CATALOG
+from hard_reset.logic.map.chunked_map import CHUNK_SIZE, ChunkedMap, MapChunk
+from hard_reset.logic.map.maps import BaseMap
+from hard_reset.logic.map.tiles import WALL_TILE
+
+
+def generated_map_uid(seed: int) -> UUID:
+    # First value drawn by the map generator, known without building the map
+    return UUID(int=random.Random(seed).getrandbits(128))
+
+
+class GeneratedMap(BaseMap):
+    _random: random.Random
+
+    def __init__(
+        self,
+        width_in_tiles: int,
+        height_in_tiles: int,
+        seed: int,
+        wall_density: float = 0.1,
+        chests_count: int = 0,
+    ) -> None:
+        super().__init__(width_in_tiles, height_in_tiles)
+        self._random = random.Random(seed)
+        self._uid = UUID(int=self._random.getrandbits(128))
+        assert self._uid == generated_map_uid(seed)
+
+        for y in range(1, self.height_in_tiles - 1):
+            for x in range(1, self.width_in_tiles - 1):
+                if self._random.random() < wall_density:
+                    self.set_tile(x, y, WALL_TILE)
+
+        for _ in range(chests_count):
+            chest = Chest(self.get_random_walkable_position())
+            chest._inventory.add_item(
+                self._random.choice(CATALOG.items), self._random.randint(1, 10)
+            )
+            self.add_entity(chest)
+
+    def get_random_walkable_position(self) -> Vertex2f:
+        while True:
+            x = self._random.randrange(1, self.width_in_tiles - 1)
+            y = self._random.randrange(1, self.height_in_tiles - 1)
+            if self.is_walkable(x, y):
+                return Vertex2f(x * TILE_SIZE, y * TILE_SIZE)
+
+
+class GeneratedChunkedMap(ChunkedMap):
+    # Each chunk is drawn from its own seed, so that it is built the same way
+    # whenever it is loaded again
+    _seed: int
+    _wall_density: float
+    _chests_per_chunk: int
+    _random: random.Random
+
+    def __init__(
+        self,
+        width_in_tiles: int,
+        height_in_tiles: int,
+        seed: int,
+        wall_density: float = 0.1,
+        chests_per_chunk: int = 0,
+    ) -> None:
+        super().__init__(width_in_tiles, height_in_tiles)
+        self._random = random.Random(seed)
+        self._uid = UUID(int=self._random.getrandbits(128))
+        self._seed = seed
+        self._wall_density = wall_density
+        self._chests_per_chunk = chests_per_chunk
+
+    def _build_chunk(self, chunk: MapChunk) -> list[Entity]:
+        chunk_random = random.Random(f"{self._seed}:{chunk.chunk_x},{chunk.chunk_y}")
+        # Border tiles are walls already
+        min_x = max(chunk.chunk_x * CHUNK_SIZE, 1)
+        min_y = max(chunk.chunk_y * CHUNK_SIZE, 1)
+        max_x = min((chunk.chunk_x + 1) * CHUNK_SIZE, self.width_in_tiles - 1)
+        max_y = min((chunk.chunk_y + 1) * CHUNK_SIZE, self.height_in_tiles - 1)
+        if min_x >= max_x or min_y >= max_y:
+            return []
+
+        for y in range(min_y, max_y):
+            for x in range(min_x, max_x):
+                if chunk_random.random() < self._wall_density:
+                    chunk.set_tile(x, y, WALL_TILE)
+
+        chests: list[Entity] = []
+        for _ in range(self._chests_per_chunk):
+            x = chunk_random.randrange(min_x, max_x)
+            y = chunk_random.randrange(min_y, max_y)
+            if chunk.is_walkable(x, y):
+                chest = Chest(Vertex2f(x * TILE_SIZE, y * TILE_SIZE))
+                chest._inventory.add_item(
+                    chunk_random.choice(CATALOG.items), chunk_random.randint(1, 10)
+                )
+                chests.append(chest)
+        return chests
+
+    def get_random_walkable_position(self) -> Vertex2f:
+        while True:
+            x = self._random.randrange(1, self.width_in_tiles - 1)
+            y = self._random.randrange(1, self.height_in_tiles - 1)
+            if self.is_walkable(x, y):
+                return Vertex2f(x * TILE_SIZE, y * TILE_SIZE)
@@ -0,0 +1,206 @@
+import argparse
+import mmap
+import struct
+from functools import partial
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from game_manager.logic.map.tile import Tile
+from game_manager.logic.map.tiled_map import TILE_SIZE, TiledMap
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Chest, Door
+from hard_reset.logic.item.catalog import CATALOG
+from hard_reset.logic.map.map_registry import MapFactory
+from hard_reset.logic.map.map_travel import MapTravel, SpawnPoint
+from hard_reset.logic.map.maps import BaseMap, Map1, Map2
+from hard_reset.logic.map.tiles import GROUND_TILE, TILES
+
+MAP_ASSET_MAGIC = b"HRMP"
+MAP_ASSET_VERSION = 1
+MAP_ASSET_SUFFIX = ".hrmap"
+
+# Magic, version, map uid, width and height in tiles, counts of spawn points,
+# map travels, doors and chests, offset of the tile grids
+_HEADER = struct.Struct("<4sH16sIIIIIIQ")
+# Uid, position
+_SPAWN_POINT = struct.Struct("<16sdd")
+# Uid, destination map uid, destination spawn point uid
+_MAP_TRAVEL = struct.Struct("<16s16s16s")
+# Position, map travel uid
+_DOOR = struct.Struct("<dd16s")
+# Position, items count
+_CHEST = struct.Struct("<ddI")
+# Quantity, name length, followed by the name
+_ITEM = struct.Struct("<IH")
+# Tile grids start on this boundary
+_GRID_ALIGNMENT = 8
+
+
+def save_map_asset(current_map: BaseMap, path: str | Path) -> None:
+    # Players and other moveable entities are not part of the asset
+    doors = [
+        entity for entity in current_map._entities.values() if isinstance(entity, Door)
+    ]
+    chests = [
+        entity for entity in current_map._entities.values() if isinstance(entity, Chest)
+    ]
+
+    body = bytearray()
+    for spawn_point in current_map._spawn_points.values():
+        position = spawn_point._position
+        body += _SPAWN_POINT.pack(spawn_point.uid.bytes, position.x, position.y)
+    for map_travel in current_map._map_travels.values():
+        destination_map_uid, spawn_point_uid = map_travel.destination
+        body += _MAP_TRAVEL.pack(
+            map_travel.uid.bytes, destination_map_uid.bytes, spawn_point_uid.bytes
+        )
+    for door in doors:
+        position = door.bounds.position
+        body += _DOOR.pack(position.x, position.y, door._map_travel_uid.bytes)
+    for chest in chests:
+        position = chest.bounds.position
+        items = chest._inventory.get_items()
+        body += _CHEST.pack(position.x, position.y, len(items))
+        for item_name, quantity in items.items():
+            encoded_name = item_name.encode()
+            body += _ITEM.pack(quantity, len(encoded_name)) + encoded_name
+
+    grids_offset = _HEADER.size + len(body)
+    grids_offset += -grids_offset % _GRID_ALIGNMENT
+    header = _HEADER.pack(
+        MAP_ASSET_MAGIC,
+        MAP_ASSET_VERSION,
+        current_map.uid.bytes,
+        current_map.width_in_tiles,
+        current_map.height_in_tiles,
+        len(current_map._spawn_points),
+        len(current_map._map_travels),
+        len(doors),
+        len(chests),
+        grids_offset,
+    )
+    with open(path, "wb") as file:
+        file.write(header)
+        file.write(body)
+        file.write(bytes(grids_offset - _HEADER.size - len(body)))
+        file.write(current_map.tile_id_grid)
+        file.write(current_map.walkability_grid)
+
+
+def _read_header(data: memoryview | bytes, path: str | Path) -> tuple[Any, ...]:
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path} is not a map asset")
+    magic, version, *fields = _HEADER.unpack_from(data)
+    if magic != MAP_ASSET_MAGIC or version != MAP_ASSET_VERSION:
+        raise ValueError(f"{path} is not a map asset of version {MAP_ASSET_VERSION}")
+    return tuple(fields)
+
+
+def read_map_asset_uid(path: str | Path) -> Uid:
+    with open(path, "rb") as file:
+        map_uid, *_ = _read_header(file.read(_HEADER.size), path)
+    return UUID(bytes=map_uid)
+
+
+def get_map_asset_factories(directory: str | Path) -> dict[Uid, MapFactory]:
+    return {
+        read_map_asset_uid(path): partial(AssetMap, path)
+        for path in sorted(Path(directory).glob(f"*{MAP_ASSET_SUFFIX}"))
+    }
+
+
+class AssetMap(BaseMap):
+    # The file stays mapped as long as the grids view it, pages are private and
+    # only copied when a tile is set
+    _mmap: mmap.mmap
+
+    def __init__(self, path: str | Path) -> None:
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        data = memoryview(self._mmap)
+        (
+            map_uid,
+            width_in_tiles,
+            height_in_tiles,
+            spawn_points_count,
+            map_travels_count,
+            doors_count,
+            chests_count,
+            grids_offset,
+        ) = _read_header(data, path)
+
+        tiles_count = width_in_tiles * height_in_tiles
+        if len(data) < grids_offset + 2 * tiles_count:
+            raise ValueError(f"{path} is truncated")
+        self._tile_id_grid = data[grids_offset : grids_offset + tiles_count]
+        self._walkability_grid = data[
+            grids_offset + tiles_count : grids_offset + 2 * tiles_count
+        ]
+        self._init_state()
+
+        # Tiles live in the mapped grids, TiledMap only keeps the dimensions
+        TiledMap.__init__(self, 0, 0, default_tile=GROUND_TILE)
+        self.width_in_tiles = width_in_tiles
+        self.height_in_tiles = height_in_tiles
+        self.width = width_in_tiles * TILE_SIZE
+        self.height = height_in_tiles * TILE_SIZE
+        self._uid = UUID(bytes=map_uid)
+
+        offset = _HEADER.size
+        for _ in range(spawn_points_count):
+            uid, x, y = _SPAWN_POINT.unpack_from(data, offset)
+            offset += _SPAWN_POINT.size
+            self.add_spawn_point(SpawnPoint(Vertex2f(x, y), UUID(bytes=uid)))
+        for _ in range(map_travels_count):
+            uid, destination_map_uid, spawn_point_uid = _MAP_TRAVEL.unpack_from(
+                data, offset
+            )
+            offset += _MAP_TRAVEL.size
+            map_travel = MapTravel(
+                (UUID(bytes=destination_map_uid), UUID(bytes=spawn_point_uid))
+            )
+            map_travel._uid = UUID(bytes=uid)
+            self.add_map_travel(map_travel)
+        for _ in range(doors_count):
+            x, y, map_travel_uid = _DOOR.unpack_from(data, offset)
+            offset += _DOOR.size
+            self.add_entity(Door(Vertex2f(x, y), UUID(bytes=map_travel_uid)))
+        for _ in range(chests_count):
+            x, y, items_count = _CHEST.unpack_from(data, offset)
+            offset += _CHEST.size
+            chest = Chest(Vertex2f(x, y))
+            for _ in range(items_count):
+                quantity, name_length = _ITEM.unpack_from(data, offset)
+                offset += _ITEM.size
+                item_name = str(data[offset : offset + name_length], "utf-8")
+                offset += name_length
+                chest._inventory.add_item(CATALOG.get_item(item_name), quantity)
+            self.add_entity(chest)
+
+    def get_tile(self, x: int, y: int) -> Tile:
+        return TILES[self._tile_id_grid[y * self.width_in_tiles + x]]
+
+    def set_tile(self, x: int, y: int, tile: Tile) -> None:
+        self._set_grid_tile(x, y, tile)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compile the built-in maps into map asset files"
+    )
+    parser.add_argument("output_directory", type=Path)
+    args = parser.parse_args()
+
+    args.output_directory.mkdir(parents=True, exist_ok=True)
+    for map_class in (Map1, Map2):
+        current_map = map_class()
+        path = args.output_directory / f"{current_map.uid}{MAP_ASSET_SUFFIX}"
+        save_map_asset(current_map, path)
+        print(f"{map_class.__name__}: {path}")
+
+
+if __name__ == "__main__":
+    main()
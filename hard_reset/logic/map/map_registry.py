@@ -0,0 +1,131 @@
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from game_manager.logic.uid_object import Uid
+
+from hard_reset.logic.entities import Chest
+from hard_reset.logic.logic_storage_manager import MapStore
+from hard_reset.logic.map.chunked_map import ChunkedMap
+from hard_reset.logic.map.maps import BaseMap
+from hard_reset.storage.sqlite_storage_manager import SQLiteStorageManager
+
+MapFactory = Callable[[], BaseMap]
+
+# Maps without players for this long are evicted
+DEFAULT_IDLE_TIMEOUT_S = 60.0
+# Estimated size of the resident maps above which least recently used maps
+# without players are evicted
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+# Rough per tile and per entity footprint used to estimate map sizes
+TILE_MEMORY_ESTIMATE = 16
+ENTITY_MEMORY_ESTIMATE = 1024
+
+
+def estimate_map_size(current_map: BaseMap) -> int:
+    return (
+        current_map.resident_tiles_count * TILE_MEMORY_ESTIMATE
+        + len(current_map._entities) * ENTITY_MEMORY_ESTIMATE
+    )
+
+
+class MapRegistry:
+    _storage_manager: SQLiteStorageManager
+    _factories: dict[Uid, MapFactory]
+    # Resident maps from least to most recently used, with their last use time
+    _last_used: OrderedDict[Uid, float]
+    _sizes: dict[Uid, int]
+    _idle_timeout_s: float
+    _memory_budget: int
+
+    def __init__(
+        self,
+        storage_manager: SQLiteStorageManager,
+        idle_timeout_s: float = DEFAULT_IDLE_TIMEOUT_S,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ) -> None:
+        self._storage_manager = storage_manager
+        self._factories = {}
+        self._last_used = OrderedDict()
+        self._sizes = {}
+        self._idle_timeout_s = idle_timeout_s
+        self._memory_budget = memory_budget
+
+    def __contains__(self, map_uid: Uid) -> bool:
+        return map_uid in self._factories
+
+    @property
+    def map_uids(self) -> list[Uid]:
+        return list(self._factories)
+
+    @property
+    def resident_size(self) -> int:
+        return sum(self._sizes.values())
+
+    def declare(self, map_uid: Uid, factory: MapFactory) -> None:
+        self._factories[map_uid] = factory
+
+    def is_resident(self, map_uid: Uid) -> bool:
+        return map_uid in self._last_used
+
+    def load(self, map_uid: Uid) -> BaseMap:
+        current_map = self._factories[map_uid]()
+        assert current_map.uid == map_uid
+        if isinstance(current_map, ChunkedMap):
+            current_map.set_storage_manager(self._storage_manager)
+
+        map_store = self._storage_manager.retrieve_object(MapStore, map_uid)
+        if map_store is not None:
+            chests = {
+                (entity.bounds.position.x, entity.bounds.position.y): entity
+                for entity in current_map._entities.values()
+                if isinstance(entity, Chest)
+            }
+            for position, items in map_store.chest_items:
+                chest = chests.get((position.x, position.y))
+                if chest is not None:
+                    chest._inventory.set_items(items)
+
+        self._sizes[map_uid] = estimate_map_size(current_map)
+        self.touch(map_uid)
+        return current_map
+
+    def store(self, current_map: BaseMap) -> None:
+        # The map stays resident, unchanged chests and chunks are not written
+        if isinstance(current_map, ChunkedMap):
+            # Chunk chests are stored with their chunk
+            current_map.store_chunks()
+        chest_items = [
+            (entity.bounds.position, entity._inventory.get_items())
+            for entity in current_map._entities.values()
+            if isinstance(entity, Chest)
+        ]
+        self._storage_manager.store_object(MapStore(current_map.uid, chest_items))
+
+    def unload(self, current_map: BaseMap) -> None:
+        if isinstance(current_map, ChunkedMap):
+            current_map.unload_chunks()
+        self.store(current_map)
+        self._last_used.pop(current_map.uid, None)
+        self._sizes.pop(current_map.uid, None)
+
+    def touch(self, map_uid: Uid, now: float | None = None) -> None:
+        self._last_used[map_uid] = time.monotonic() if now is None else now
+        self._last_used.move_to_end(map_uid)
+
+    def get_evictable_map_uids(
+        self, is_in_use: Callable[[Uid], bool], now: float | None = None
+    ) -> list[Uid]:
+        now = time.monotonic() if now is None else now
+        resident_size = self.resident_size
+        evictable_map_uids = []
+        for map_uid, last_used in self._last_used.items():
+            if is_in_use(map_uid):
+                continue
+            if (
+                now - last_used >= self._idle_timeout_s
+                or resident_size > self._memory_budget
+            ):
+                evictable_map_uids.append(map_uid)
+                resident_size -= self._sizes[map_uid]
+        return evictable_map_uids
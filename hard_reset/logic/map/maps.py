@@ -1,24 +1,80 @@
+import hashlib
+import math
 from abc import ABC
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, cast
 from uuid import UUID
 
+from game_manager.logic.entity.entity import Entity
+from game_manager.logic.entity.entity_moveable import EntityMoveable
+from game_manager.logic.map.tile import Tile
 from game_manager.logic.map.tiled_map import TILE_SIZE, TiledMap
 from game_manager.logic.uid_object import Uid
 from vertyces.vertex import Vertex2f
 
-from hard_reset.logic.entities import Chest, Door
-from hard_reset.logic.item.item import BOTTLE, KEY, WOODEN_PLANK
+from hard_reset.logic.entities import ArrayBackedMoveable, Chest, Door
+from hard_reset.logic.item.catalog import CATALOG
 from hard_reset.logic.map.map_travel import MapTravel, SpawnPoint
-from hard_reset.logic.map.tiles import GROUND_TILE, WALL_TILE
+from hard_reset.logic.map.pathfinding import Pathfinder
+from hard_reset.logic.map.spatial_grid import SpatialGrid
+from hard_reset.logic.map.tiles import GROUND_TILE, WALL_TILE, get_tile_id
+
+if TYPE_CHECKING:
+    from hard_reset.logic.movement import MovementSystem
+
+# Keeps an entity ending exactly on a tile border out of the next tile
+BORDER_EPSILON = 1e-6
+
+# Number of removed entities remembered to answer delta queries, older clients
+# receive a full snapshot instead
+REMOVED_ENTITIES_HISTORY_SIZE = 256
+
+MAP_1_UID = UUID("10000000-0000-0000-0000-000000000001")
+MAP_2_UID = UUID("10000000-0000-0000-0000-000000000002")
+MAP_1_SPAWN_POINT_UID = UUID("12000000-0000-0000-0000-000000000001")
+MAP_2_SPAWN_POINT_UID = UUID("12000000-0000-0000-0000-000000000002")
+
+
+@dataclass
+class MapChanges:
+    revision: int
+    full: bool
+    changed_entities: list[Entity]
+    removed_entity_uids: list[Uid]
 
 
 class BaseMap(TiledMap, ABC):
     _spawn_points: dict[Uid, SpawnPoint]
     _map_travels: dict[Uid, MapTravel]
 
+    _revision: int
+    # Both dicts are kept ordered by revision (oldest first)
+    _entity_revisions: dict[Uid, int]
+    _removed_entity_revisions: dict[Uid, int]
+    _removed_entities_floor: int
+    _moveable_positions: dict[Uid, tuple[float, float]]
+    # Refreshed with entity moves by track_moved_entities
+    _spatial_grid: SpatialGrid
+    # Moves ArrayBackedMoveable entities in batch when vectorized movement is
+    # enabled, they are then left out of _moveable_positions
+    _movement_system: "MovementSystem | None"
+
+    # Row-major grids (index is y * width_in_tiles + x) mirroring _tiles, views
+    # when they are mapped from a file
+    _tile_id_grid: bytearray | memoryview
+    _walkability_grid: bytearray | memoryview
+    _layout_hash: str | None
+    # Bumped when a tile becomes walkable or blocking, invalidates cached paths
+    _walkability_revision: int
+    _pathfinder: Pathfinder | None
+
     def __init__(self, width_in_tiles: int, height_in_tiles: int) -> None:
+        tiles_count = width_in_tiles * height_in_tiles
+        self._tile_id_grid = bytearray([get_tile_id(GROUND_TILE)]) * tiles_count
+        self._walkability_grid = bytearray([GROUND_TILE.walkable]) * tiles_count
+        self._init_state()
+
         super().__init__(width_in_tiles, height_in_tiles, default_tile=GROUND_TILE)
-        self._spawn_points = {}
-        self._map_travels = {}
 
         for y in range(self.height_in_tiles):
             self.set_tile(0, y, WALL_TILE)
@@ -27,7 +83,233 @@ class BaseMap(TiledMap, ABC):
             self.set_tile(x, 0, WALL_TILE)
             self.set_tile(x, self.height_in_tiles - 1, WALL_TILE)
 
-    def update(self, delta_time: float) -> None: ...
+    def _init_state(self) -> None:
+        # Everything but the tiles, maps storing them differently share it
+        self._layout_hash = None
+        self._walkability_revision = 0
+        self._pathfinder = None
+        self._revision = 0
+        self._entity_revisions = {}
+        self._removed_entity_revisions = {}
+        self._removed_entities_floor = 0
+        self._moveable_positions = {}
+        self._spatial_grid = SpatialGrid(TILE_SIZE)
+        self._movement_system = None
+        self._spawn_points = {}
+        self._map_travels = {}
+
+    def update(self, delta_time: float) -> None:
+        if self._movement_system is not None:
+            self._movement_system.step(delta_time)
+        self._move_entities(delta_time)
+        self.track_moved_entities()
+
+    def _move_entities(self, delta_time: float) -> None:
+        # Moveable entities outside of the movement system, resolved the same
+        # way: one axis at a time so that they slide along walls
+        for uid in self._moveable_positions:
+            entity = cast(EntityMoveable, self._entities[uid])
+            direction = entity.direction
+            distance = entity.speed * delta_time
+            if distance == 0 or (direction.x == 0 and direction.y == 0):
+                continue
+
+            position = entity.bounds.position
+            dimensions = entity.bounds.dimensions
+            x = position.x + direction.x * distance
+            if not self._is_area_free(x, position.y, dimensions):
+                x = position.x
+            y = position.y + direction.y * distance
+            if not self._is_area_free(x, y, dimensions):
+                y = position.y
+            if x != position.x or y != position.y:
+                entity.bounds = entity.bounds.at_position(Vertex2f(x, y))
+
+    def _is_area_free(self, x: float, y: float, dimensions: Vertex2f) -> bool:
+        # Checks the tiles under the four corners, entities must not be larger
+        # than a tile
+        left, top = math.floor(x / TILE_SIZE), math.floor(y / TILE_SIZE)
+        right = math.floor((x + dimensions.x - BORDER_EPSILON) / TILE_SIZE)
+        bottom = math.floor((y + dimensions.y - BORDER_EPSILON) / TILE_SIZE)
+        return (
+            self.is_walkable(left, top)
+            and self.is_walkable(right, top)
+            and self.is_walkable(left, bottom)
+            and self.is_walkable(right, bottom)
+        )
+
+    @property
+    def vectorized_movement(self) -> bool:
+        return self._movement_system is not None
+
+    def enable_vectorized_movement(self) -> None:
+        # numpy is an optional dependency, only needed by this movement system
+        from hard_reset.logic.movement import MovementSystem
+
+        if self._movement_system is not None:
+            return
+        self._movement_system = MovementSystem(
+            self.walkability_grid, self.width_in_tiles, self.height_in_tiles, TILE_SIZE
+        )
+        for entity in self._entities.values():
+            if isinstance(entity, ArrayBackedMoveable):
+                self._moveable_positions.pop(entity.uid, None)
+                self._movement_system.add(entity)
+
+    @property
+    def resident_tiles_count(self) -> int:
+        return self.width_in_tiles * self.height_in_tiles
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    @property
+    def layout_hash(self) -> str:
+        if self._layout_hash is None:
+            digest = hashlib.blake2b(self._tile_id_grid, digest_size=8)
+            digest.update(f"{self.width_in_tiles}x{self.height_in_tiles}".encode())
+            self._layout_hash = digest.hexdigest()
+        return self._layout_hash
+
+    @property
+    def tile_id_grid(self) -> memoryview:
+        return memoryview(self._tile_id_grid).toreadonly()
+
+    @property
+    def walkability_grid(self) -> memoryview:
+        return memoryview(self._walkability_grid).toreadonly()
+
+    @property
+    def walkability_revision(self) -> int:
+        return self._walkability_revision
+
+    @property
+    def pathfinder(self) -> Pathfinder:
+        if self._pathfinder is None:
+            self._pathfinder = Pathfinder(self)
+        return self._pathfinder
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        if not (0 <= x < self.width_in_tiles and 0 <= y < self.height_in_tiles):
+            return False
+        return bool(self._walkability_grid[y * self.width_in_tiles + x])
+
+    def set_tile(self, x: int, y: int, tile: Tile) -> None:
+        super().set_tile(x, y, tile)
+        self._set_grid_tile(x, y, tile)
+
+    def _set_grid_tile(self, x: int, y: int, tile: Tile) -> None:
+        index = y * self.width_in_tiles + x
+        self._tile_id_grid[index] = get_tile_id(tile)
+        if self._walkability_grid[index] != tile.walkable:
+            self._walkability_grid[index] = tile.walkable
+            self._walkability_revision += 1
+        self._layout_hash = None
+
+    def add_entity(self, entity: Entity) -> None:
+        super().add_entity(entity)
+        self._spatial_grid.insert(entity)
+        self._removed_entity_revisions.pop(entity.uid, None)
+        if self._movement_system is not None and isinstance(
+            entity, ArrayBackedMoveable
+        ):
+            self._movement_system.add(entity)
+        elif isinstance(entity, EntityMoveable):
+            position = entity.bounds.position
+            self._moveable_positions[entity.uid] = (position.x, position.y)
+        self._mark_entity_changed(entity.uid)
+
+    def remove_entity(self, entity_uid: Uid) -> None:
+        super().remove_entity(entity_uid)
+        self._spatial_grid.remove(entity_uid)
+        self._entity_revisions.pop(entity_uid, None)
+        self._moveable_positions.pop(entity_uid, None)
+        if self._movement_system is not None and entity_uid in self._movement_system:
+            self._movement_system.remove(entity_uid)
+
+        self._revision += 1
+        self._removed_entity_revisions[entity_uid] = self._revision
+        if len(self._removed_entity_revisions) > REMOVED_ENTITIES_HISTORY_SIZE:
+            oldest_uid = next(iter(self._removed_entity_revisions))
+            self._removed_entities_floor = self._removed_entity_revisions.pop(
+                oldest_uid
+            )
+
+    def get_entities_in_rect(
+        self, position: Vertex2f, dimensions: Vertex2f
+    ) -> list[Entity]:
+        return self._spatial_grid.query_rect(position, dimensions)
+
+    def get_entities_in_radius(self, center: Vertex2f, radius: float) -> list[Entity]:
+        return self._spatial_grid.query_radius(center, radius)
+
+    def get_colliding_entities(self, entity: Entity) -> list[Entity]:
+        return [
+            other_entity
+            for other_entity in self._spatial_grid.query_rect(
+                entity.bounds.position, entity.bounds.dimensions
+            )
+            if other_entity.uid != entity.uid
+        ]
+
+    def get_entity_revision(self, entity_uid: Uid) -> int:
+        return self._entity_revisions.get(entity_uid, 0)
+
+    def get_changes_since(self, since_revision: int) -> MapChanges:
+        self.track_moved_entities()
+
+        if since_revision < self._removed_entities_floor:
+            return MapChanges(
+                revision=self._revision,
+                full=True,
+                changed_entities=list(self._entities.values()),
+                removed_entity_uids=[],
+            )
+
+        changed_entities = []
+        for uid, revision in reversed(self._entity_revisions.items()):
+            if revision <= since_revision:
+                break
+            changed_entities.append(self._entities[uid])
+
+        removed_entity_uids = []
+        for uid, revision in reversed(self._removed_entity_revisions.items()):
+            if revision <= since_revision:
+                break
+            removed_entity_uids.append(uid)
+
+        return MapChanges(
+            revision=self._revision,
+            full=False,
+            changed_entities=changed_entities,
+            removed_entity_uids=removed_entity_uids,
+        )
+
+    def _mark_entity_changed(self, entity_uid: Uid) -> None:
+        self._revision += 1
+        self._entity_revisions.pop(entity_uid, None)
+        self._entity_revisions[entity_uid] = self._revision
+
+    def track_moved_entities(self) -> None:
+        if self._movement_system is not None:
+            # The spatial grid uses tiles as cells, entities still covering the
+            # same tiles keep their cells
+            moved_entities, retiled_entities = (
+                self._movement_system.pop_moved_entities()
+            )
+            for entity in retiled_entities:
+                self._spatial_grid.move(entity)
+            for entity in moved_entities:
+                self._mark_entity_changed(entity.uid)
+
+        for uid, (x, y) in list(self._moveable_positions.items()):
+            entity = self._entities[uid]
+            position = entity.bounds.position
+            if position.x != x or position.y != y:
+                self._moveable_positions[uid] = (position.x, position.y)
+                self._spatial_grid.move(entity)
+                self._mark_entity_changed(uid)
 
     def add_spawn_point(self, spawn_point: SpawnPoint) -> None:
         self._spawn_points[spawn_point.uid] = spawn_point
@@ -51,29 +333,23 @@ class BaseMap(TiledMap, ABC):
 class Map1(BaseMap):
     def __init__(self) -> None:
         super().__init__(11, 12)
-        self._uid = UUID("10000000-0000-0000-0000-000000000001")
+        self._uid = MAP_1_UID
 
         chest1 = Chest(Vertex2f(1 * TILE_SIZE, 4 * TILE_SIZE))
-        chest1._inventory.add_item(BOTTLE, 1)
-        chest1._inventory.add_item(KEY, 3)
-        chest1._inventory.add_item(WOODEN_PLANK, 3)
+        chest1._inventory.add_item(CATALOG.get_item("Bottle"), 1)
+        chest1._inventory.add_item(CATALOG.get_item("Key"), 3)
+        chest1._inventory.add_item(CATALOG.get_item("Wooden Plank"), 3)
         self.add_entity(chest1)
 
         chest2 = Chest(Vertex2f(2 * TILE_SIZE, 6 * TILE_SIZE))
-        chest2._inventory.add_item(KEY, 7)
+        chest2._inventory.add_item(CATALOG.get_item("Key"), 7)
         self.add_entity(chest2)
 
         spawn_point = SpawnPoint(
-            Vertex2f(6 * TILE_SIZE, 1 * TILE_SIZE),
-            UUID("12000000-0000-0000-0000-000000000001"),
+            Vertex2f(6 * TILE_SIZE, 1 * TILE_SIZE), MAP_1_SPAWN_POINT_UID
         )
         self.add_spawn_point(spawn_point)
-        map_travel = MapTravel(
-            (
-                UUID("10000000-0000-0000-0000-000000000002"),
-                UUID("12000000-0000-0000-0000-000000000002"),
-            ),
-        )
+        map_travel = MapTravel((MAP_2_UID, MAP_2_SPAWN_POINT_UID))
         self.add_map_travel(map_travel)
         door = Door(Vertex2f(0, 6 * TILE_SIZE), map_travel.uid)
         self.add_entity(door)
@@ -82,24 +358,18 @@ class Map1(BaseMap):
 class Map2(BaseMap):
     def __init__(self) -> None:
         super().__init__(8, 15)
-        self._uid = UUID("10000000-0000-0000-0000-000000000002")
+        self._uid = MAP_2_UID
 
         spawn_point = SpawnPoint(
-            Vertex2f(1 * TILE_SIZE, 5 * TILE_SIZE),
-            UUID("12000000-0000-0000-0000-000000000002"),
+            Vertex2f(1 * TILE_SIZE, 5 * TILE_SIZE), MAP_2_SPAWN_POINT_UID
         )
         self.add_spawn_point(spawn_point)
-        map_travel = MapTravel(
-            (
-                UUID("10000000-0000-0000-0000-000000000001"),
-                UUID("12000000-0000-0000-0000-000000000001"),
-            ),
-        )
+        map_travel = MapTravel((MAP_1_UID, MAP_1_SPAWN_POINT_UID))
         self.add_map_travel(map_travel)
 
         door = Door(Vertex2f(0, 6 * TILE_SIZE), map_travel.uid)
         self.add_entity(door)
 
         chest1 = Chest(Vertex2f(3 * TILE_SIZE, 4 * TILE_SIZE))
-        chest1._inventory.add_item(KEY, 66)
+        chest1._inventory.add_item(CATALOG.get_item("Key"), 66)
         self.add_entity(chest1)
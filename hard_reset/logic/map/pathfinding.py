@@ -0,0 +1,235 @@
+import heapq
+from array import array
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Iterator
+
+from game_manager.logic.map.tile import TILE_SIZE
+from vertyces.vertex import Vertex2f
+
+if TYPE_CHECKING:
+    from hard_reset.logic.map.maps import BaseMap
+
+# Integer costs keep heap entries cheap to compare, diagonal is ~10 * sqrt(2)
+STRAIGHT_COST = 10
+DIAGONAL_COST = 14
+UNREACHABLE = 2**31 - 1
+NO_TILE = -1
+# Flow fields kept per map, least recently used ones are dropped first
+FLOW_FIELD_CACHE_SIZE = 32
+
+TilePosition = tuple[int, int]
+
+
+def get_tile_position(position: Vertex2f) -> TilePosition:
+    return int(position.x // TILE_SIZE), int(position.y // TILE_SIZE)
+
+
+def _iter_neighbours(
+    walkability: memoryview, width: int, height: int, x: int, y: int
+) -> Iterator[tuple[int, int, int]]:
+    # Diagonal moves need both adjacent tiles to be walkable, entities cannot cut
+    # wall corners
+    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        nx, ny = x + dx, y + dy
+        if 0 <= nx < width and 0 <= ny < height and walkability[ny * width + nx]:
+            yield nx, ny, STRAIGHT_COST
+    for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+        nx, ny = x + dx, y + dy
+        if (
+            0 <= nx < width
+            and 0 <= ny < height
+            and walkability[ny * width + nx]
+            and walkability[y * width + nx]
+            and walkability[ny * width + x]
+        ):
+            yield nx, ny, DIAGONAL_COST
+
+
+def _iter_goal_neighbours(
+    walkability: memoryview, width: int, height: int, x: int, y: int
+) -> Iterator[tuple[int, int, int]]:
+    # An unwalkable goal is entered last from any walkable tile around it
+    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        nx, ny = x + dx, y + dy
+        if 0 <= nx < width and 0 <= ny < height and walkability[ny * width + nx]:
+            yield nx, ny, STRAIGHT_COST
+    for dx, dy in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
+        nx, ny = x + dx, y + dy
+        if 0 <= nx < width and 0 <= ny < height and walkability[ny * width + nx]:
+            yield nx, ny, DIAGONAL_COST
+
+
+def _octile_distance(x: int, y: int, goal_x: int, goal_y: int) -> int:
+    dx, dy = abs(x - goal_x), abs(y - goal_y)
+    return STRAIGHT_COST * max(dx, dy) + (DIAGONAL_COST - STRAIGHT_COST) * min(dx, dy)
+
+
+def find_path(
+    walkability: memoryview,
+    width: int,
+    height: int,
+    start: TilePosition,
+    goal: TilePosition,
+) -> list[TilePosition] | None:
+    # The goal may be unwalkable (doors sit in walls), it is only entered last
+    start_x, start_y = start
+    goal_x, goal_y = goal
+    goal_index = goal_y * width + goal_x
+    start_index = start_y * width + start_x
+
+    costs = {start_index: 0}
+    previous: dict[int, int] = {}
+    open_heap = [(_octile_distance(start_x, start_y, goal_x, goal_y), 0, start_index)]
+    while open_heap:
+        _, cost, index = heapq.heappop(open_heap)
+        if index == goal_index:
+            path = [goal]
+            while index in previous:
+                index = previous[index]
+                path.append((index % width, index // width))
+            path.reverse()
+            return path
+        if cost > costs[index]:
+            continue
+
+        x, y = index % width, index // width
+        neighbours = list(_iter_neighbours(walkability, width, height, x, y))
+        if not walkability[goal_index] and max(abs(goal_x - x), abs(goal_y - y)) == 1:
+            neighbours.append((goal_x, goal_y, _octile_distance(x, y, goal_x, goal_y)))
+        for nx, ny, step_cost in neighbours:
+            neighbour_index = ny * width + nx
+            neighbour_cost = cost + step_cost
+            if neighbour_cost >= costs.get(neighbour_index, UNREACHABLE):
+                continue
+            costs[neighbour_index] = neighbour_cost
+            previous[neighbour_index] = index
+            estimate = neighbour_cost + _octile_distance(nx, ny, goal_x, goal_y)
+            heapq.heappush(open_heap, (estimate, neighbour_cost, neighbour_index))
+    return None
+
+
+class FlowField:
+    goal: TilePosition
+
+    _width: int
+    # Per tile distance to the goal and next tile on a shortest path toward it
+    _distances: "array[int]"
+    _next_tiles: "array[int]"
+
+    def __init__(
+        self, walkability: memoryview, width: int, height: int, goal: TilePosition
+    ) -> None:
+        self.goal = goal
+        self._width = width
+        self._distances = array("i", [UNREACHABLE]) * (width * height)
+        self._next_tiles = array("i", [NO_TILE]) * (width * height)
+
+        # Dijkstra from the goal, moves are symmetric so distances from the goal
+        # are distances to it
+        goal_x, goal_y = goal
+        goal_index = goal_y * width + goal_x
+        self._distances[goal_index] = 0
+        open_heap = [(0, goal_index)]
+        while open_heap:
+            distance, index = heapq.heappop(open_heap)
+            if distance > self._distances[index]:
+                continue
+            x, y = index % width, index // width
+            # Same moves as find_path, which enters an unwalkable goal from any
+            # neighbour
+            iter_neighbours = (
+                _iter_goal_neighbours
+                if index == goal_index and not walkability[goal_index]
+                else _iter_neighbours
+            )
+            for nx, ny, step_cost in iter_neighbours(walkability, width, height, x, y):
+                neighbour_index = ny * width + nx
+                neighbour_distance = distance + step_cost
+                if neighbour_distance < self._distances[neighbour_index]:
+                    self._distances[neighbour_index] = neighbour_distance
+                    self._next_tiles[neighbour_index] = index
+                    heapq.heappush(open_heap, (neighbour_distance, neighbour_index))
+
+    def get_distance(self, x: int, y: int) -> int | None:
+        distance = self._distances[y * self._width + x]
+        return None if distance == UNREACHABLE else distance
+
+    def get_next_tile(self, x: int, y: int) -> TilePosition | None:
+        next_index = self._next_tiles[y * self._width + x]
+        if next_index == NO_TILE:
+            return None
+        return next_index % self._width, next_index // self._width
+
+    def get_direction(self, position: Vertex2f) -> Vertex2f | None:
+        # Unit direction from the position toward the center of the next tile
+        next_tile = self.get_next_tile(*get_tile_position(position))
+        if next_tile is None:
+            return None
+        target = Vertex2f(
+            (next_tile[0] + 0.5) * TILE_SIZE, (next_tile[1] + 0.5) * TILE_SIZE
+        )
+        return target.translated(position.multiplied(-1)).unit_vertex
+
+    def get_path(self, start: TilePosition) -> list[TilePosition] | None:
+        if self.get_distance(*start) is None:
+            return None
+        path = [start]
+        while path[-1] != self.goal:
+            next_tile = self.get_next_tile(*path[-1])
+            assert next_tile is not None
+            path.append(next_tile)
+        return path
+
+
+class Pathfinder:
+    _map: "BaseMap"
+    _flow_fields: OrderedDict[TilePosition, FlowField]
+    # Walkability revision the cached flow fields were computed for
+    _walkability_revision: int
+
+    def __init__(self, current_map: "BaseMap") -> None:
+        self._map = current_map
+        self._flow_fields = OrderedDict()
+        self._walkability_revision = current_map.walkability_revision
+
+    def find_path(
+        self, start: TilePosition, goal: TilePosition
+    ) -> list[TilePosition] | None:
+        self._invalidate_if_changed()
+        flow_field = self._flow_fields.get(goal)
+        if flow_field is not None:
+            self._flow_fields.move_to_end(goal)
+            return flow_field.get_path(start)
+        return find_path(
+            self._map.walkability_grid,
+            self._map.width_in_tiles,
+            self._map.height_in_tiles,
+            start,
+            goal,
+        )
+
+    def get_flow_field(self, goal: TilePosition) -> FlowField:
+        self._invalidate_if_changed()
+        flow_field = self._flow_fields.get(goal)
+        if flow_field is not None:
+            self._flow_fields.move_to_end(goal)
+            return flow_field
+
+        flow_field = FlowField(
+            self._map.walkability_grid,
+            self._map.width_in_tiles,
+            self._map.height_in_tiles,
+            goal,
+        )
+        self._flow_fields[goal] = flow_field
+        if len(self._flow_fields) > FLOW_FIELD_CACHE_SIZE:
+            self._flow_fields.popitem(last=False)
+        return flow_field
+
+    def get_flow_field_to(self, position: Vertex2f) -> FlowField:
+        return self.get_flow_field(get_tile_position(position))
+
+    def _invalidate_if_changed(self) -> None:
+        if self._walkability_revision != self._map.walkability_revision:
+            self._flow_fields.clear()
+            self._walkability_revision = self._map.walkability_revision
@@ -0,0 +1,127 @@
+from game_manager.logic.entity.entity import Entity
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+CellRange = tuple[int, int, int, int]
+
+
+class SpatialGrid:
+    _cell_size: float
+    _cells: dict[tuple[int, int], dict[Uid, Entity]]
+    # Inclusive range of cells (min x, min y, max x, max y) covered by each entity
+    _entity_cells: dict[Uid, CellRange]
+
+    def __init__(self, cell_size: float) -> None:
+        self._cell_size = cell_size
+        self._cells = {}
+        self._entity_cells = {}
+
+    def __len__(self) -> int:
+        return len(self._entity_cells)
+
+    def insert(self, entity: Entity) -> None:
+        cell_range = self._get_cell_range(
+            entity.bounds.position, entity.bounds.dimensions
+        )
+        self._entity_cells[entity.uid] = cell_range
+        self._add_to_cells(entity, cell_range)
+
+    def remove(self, entity_uid: Uid) -> None:
+        cell_range = self._entity_cells.pop(entity_uid, None)
+        if cell_range is not None:
+            self._remove_from_cells(entity_uid, cell_range)
+
+    def move(self, entity: Entity) -> None:
+        previous_range = self._entity_cells.get(entity.uid)
+        cell_range = self._get_cell_range(
+            entity.bounds.position, entity.bounds.dimensions
+        )
+        if previous_range == cell_range:
+            return
+        if previous_range is not None:
+            self._remove_from_cells(entity.uid, previous_range)
+        self._entity_cells[entity.uid] = cell_range
+        self._add_to_cells(entity, cell_range)
+
+    def query_rect(self, position: Vertex2f, dimensions: Vertex2f) -> list[Entity]:
+        min_x, min_y = position.x, position.y
+        max_x, max_y = min_x + dimensions.x, min_y + dimensions.y
+
+        entities = []
+        for entity in self._get_candidates(position, dimensions):
+            entity_position = entity.bounds.position
+            entity_dimensions = entity.bounds.dimensions
+            if (
+                entity_position.x < max_x
+                and min_x < entity_position.x + entity_dimensions.x
+                and entity_position.y < max_y
+                and min_y < entity_position.y + entity_dimensions.y
+            ):
+                entities.append(entity)
+        return entities
+
+    def query_radius(self, center: Vertex2f, radius: float) -> list[Entity]:
+        candidates = self._get_candidates(
+            Vertex2f(center.x - radius, center.y - radius),
+            Vertex2f(radius * 2, radius * 2),
+        )
+
+        entities = []
+        squared_radius = radius * radius
+        for entity in candidates:
+            # Distance from the center to the closest point of the entity bounds
+            entity_position = entity.bounds.position
+            entity_dimensions = entity.bounds.dimensions
+            closest_x = min(
+                max(center.x, entity_position.x),
+                entity_position.x + entity_dimensions.x,
+            )
+            closest_y = min(
+                max(center.y, entity_position.y),
+                entity_position.y + entity_dimensions.y,
+            )
+            delta_x, delta_y = center.x - closest_x, center.y - closest_y
+            if delta_x * delta_x + delta_y * delta_y <= squared_radius:
+                entities.append(entity)
+        return entities
+
+    def _get_candidates(self, position: Vertex2f, dimensions: Vertex2f) -> list[Entity]:
+        min_cell_x, min_cell_y, max_cell_x, max_cell_y = self._get_cell_range(
+            position, dimensions
+        )
+        candidates: dict[Uid, Entity] = {}
+        for cell_x in range(min_cell_x, max_cell_x + 1):
+            for cell_y in range(min_cell_y, max_cell_y + 1):
+                cell = self._cells.get((cell_x, cell_y))
+                if cell:
+                    candidates.update(cell)
+        return list(candidates.values())
+
+    def _get_cell_range(self, position: Vertex2f, dimensions: Vertex2f) -> CellRange:
+        # Bounds are half-open, an entity ending exactly on a cell border does not
+        # belong to the next cell
+        max_x = position.x + max(dimensions.x, 0) - 1e-6
+        max_y = position.y + max(dimensions.y, 0) - 1e-6
+        return (
+            int(position.x // self._cell_size),
+            int(position.y // self._cell_size),
+            int(max(max_x, position.x) // self._cell_size),
+            int(max(max_y, position.y) // self._cell_size),
+        )
+
+    def _add_to_cells(self, entity: Entity, cell_range: CellRange) -> None:
+        min_cell_x, min_cell_y, max_cell_x, max_cell_y = cell_range
+        for cell_x in range(min_cell_x, max_cell_x + 1):
+            for cell_y in range(min_cell_y, max_cell_y + 1):
+                self._cells.setdefault((cell_x, cell_y), {})[entity.uid] = entity
+
+    def _remove_from_cells(self, entity_uid: Uid, cell_range: CellRange) -> None:
+        min_cell_x, min_cell_y, max_cell_x, max_cell_y = cell_range
+        for cell_x in range(min_cell_x, max_cell_x + 1):
+            for cell_y in range(min_cell_y, max_cell_y + 1):
+                cell = self._cells.get((cell_x, cell_y))
+                if cell is None:
+                    continue
+                cell.pop(entity_uid, None)
+                if not cell:
+                    del self._cells[(cell_x, cell_y)]
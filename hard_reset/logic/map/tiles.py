@@ -2,3 +2,10 @@ from game_manager.logic.map.tile import Tile
 
 GROUND_TILE = Tile(walkable=True)
 WALL_TILE = Tile(walkable=False)
+
+# Index in this list is the tile id used by packed tile grids
+TILES = [GROUND_TILE, WALL_TILE]
+
+
+def get_tile_id(tile: Tile) -> int:
+    return TILES.index(tile)
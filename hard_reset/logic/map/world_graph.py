@@ -0,0 +1,180 @@
+from collections import deque
+from dataclasses import dataclass
+
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Door
+from hard_reset.logic.map.map_travel import SpawnPointId
+from hard_reset.logic.map.maps import BaseMap
+
+
+@dataclass(frozen=True)
+class MapHop:
+    map_uid: Uid
+    map_travel_uid: Uid
+    # Door leading to the map travel, None when the travel has no door
+    door_position: Vertex2f | None
+    destination_map_uid: Uid
+    spawn_point_uid: Uid
+    spawn_position: Vertex2f
+
+
+class WorldGraph:
+    # Every map travel of the added maps, even toward maps not added yet
+    _travels: dict[Uid, dict[Uid, tuple[Uid, Uid]]]
+    _door_positions: dict[Uid, dict[Uid, Vertex2f]]
+    _spawn_positions: dict[Uid, dict[Uid, Vertex2f]]
+    # Maps holding a travel toward each map
+    _incoming: dict[Uid, set[Uid]]
+    # Hops resolvable right now (destination and spawn point exist), first door
+    # to each neighbour map
+    _edges: dict[Uid, dict[Uid, MapHop]]
+    # First hop of a shortest route (fewest map travels) from a map to another
+    _next_hops: dict[Uid, dict[Uid, MapHop]]
+
+    def __init__(self) -> None:
+        self._travels = {}
+        self._door_positions = {}
+        self._spawn_positions = {}
+        self._incoming = {}
+        self._edges = {}
+        self._next_hops = {}
+
+    def __contains__(self, map_uid: Uid) -> bool:
+        return map_uid in self._travels
+
+    def add_map(self, current_map: BaseMap) -> None:
+        map_uid = current_map.uid
+        if map_uid in self._travels:
+            self.remove_map(map_uid)
+
+        self._travels[map_uid] = {
+            map_travel.uid: map_travel.destination
+            for map_travel in current_map._map_travels.values()
+        }
+        self._door_positions[map_uid] = {
+            entity._map_travel_uid: entity.bounds.position
+            for entity in current_map._entities.values()
+            if isinstance(entity, Door)
+        }
+        self._spawn_positions[map_uid] = {
+            uid: spawn_point._position
+            for uid, spawn_point in current_map._spawn_points.items()
+        }
+        for destination_map_uid, _ in self._travels[map_uid].values():
+            self._incoming.setdefault(destination_map_uid, set()).add(map_uid)
+
+        self._edges[map_uid] = {}
+        for source_map_uid in self._incoming.get(map_uid, set()) | {map_uid}:
+            self._refresh_edges(source_map_uid)
+
+        # Only routes toward the new map can change, they start from maps it is
+        # now reachable from
+        for source_map_uid in self._get_reaching_maps(map_uid):
+            self._refresh_next_hops(source_map_uid)
+
+    def remove_map(self, map_uid: Uid) -> None:
+        # Routes that do not reach the removed map cannot go through it
+        affected_map_uids = [
+            source_map_uid
+            for source_map_uid, next_hops in self._next_hops.items()
+            if map_uid in next_hops
+        ]
+
+        for destination_map_uid, _ in self._travels.pop(map_uid).values():
+            self._incoming[destination_map_uid].discard(map_uid)
+        del self._door_positions[map_uid]
+        del self._spawn_positions[map_uid]
+        del self._edges[map_uid]
+        del self._next_hops[map_uid]
+        for source_map_uid in self._incoming.get(map_uid, set()):
+            self._refresh_edges(source_map_uid)
+
+        for source_map_uid in affected_map_uids:
+            if source_map_uid != map_uid:
+                self._refresh_next_hops(source_map_uid)
+
+    def get_destination_map_uids(self, map_uid: Uid) -> list[Uid]:
+        return [
+            destination_map_uid
+            for destination_map_uid, _ in self._travels[map_uid].values()
+        ]
+
+    def get_destination(self, map_uid: Uid, map_travel_uid: Uid) -> SpawnPointId | None:
+        return self._travels[map_uid].get(map_travel_uid)
+
+    def get_hop(self, map_uid: Uid, map_travel_uid: Uid) -> MapHop | None:
+        destination = self.get_destination(map_uid, map_travel_uid)
+        if destination is None:
+            return None
+        return self._build_hop(map_uid, map_travel_uid, destination)
+
+    def get_next_hop(self, map_uid: Uid, destination_map_uid: Uid) -> MapHop | None:
+        return self._next_hops[map_uid].get(destination_map_uid)
+
+    def get_route(self, map_uid: Uid, destination_map_uid: Uid) -> list[MapHop] | None:
+        route: list[MapHop] = []
+        while map_uid != destination_map_uid:
+            hop = self._next_hops[map_uid].get(destination_map_uid)
+            if hop is None:
+                return None
+            route.append(hop)
+            map_uid = hop.destination_map_uid
+        return route
+
+    def _build_hop(
+        self, map_uid: Uid, map_travel_uid: Uid, destination: tuple[Uid, Uid]
+    ) -> MapHop | None:
+        destination_map_uid, spawn_point_uid = destination
+        spawn_positions = self._spawn_positions.get(destination_map_uid)
+        if spawn_positions is None or spawn_point_uid not in spawn_positions:
+            return None
+        return MapHop(
+            map_uid=map_uid,
+            map_travel_uid=map_travel_uid,
+            door_position=self._door_positions[map_uid].get(map_travel_uid),
+            destination_map_uid=destination_map_uid,
+            spawn_point_uid=spawn_point_uid,
+            spawn_position=spawn_positions[spawn_point_uid],
+        )
+
+    def _refresh_edges(self, map_uid: Uid) -> None:
+        edges: dict[Uid, MapHop] = {}
+        for map_travel_uid, destination in self._travels[map_uid].items():
+            hop = self._build_hop(map_uid, map_travel_uid, destination)
+            if hop is not None and hop.destination_map_uid != map_uid:
+                edges.setdefault(hop.destination_map_uid, hop)
+        self._edges[map_uid] = edges
+
+    def _refresh_next_hops(self, source_map_uid: Uid) -> None:
+        # Breadth first search, each reached map keeps the first hop taken from
+        # the source to reach it
+        next_hops: dict[Uid, MapHop] = {}
+        queue = deque([source_map_uid])
+        while queue:
+            map_uid = queue.popleft()
+            for destination_map_uid, hop in self._edges[map_uid].items():
+                if (
+                    destination_map_uid in next_hops
+                    or destination_map_uid == source_map_uid
+                ):
+                    continue
+                next_hops[destination_map_uid] = (
+                    hop if map_uid == source_map_uid else next_hops[map_uid]
+                )
+                queue.append(destination_map_uid)
+        self._next_hops[source_map_uid] = next_hops
+
+    def _get_reaching_maps(self, map_uid: Uid) -> set[Uid]:
+        reaching_map_uids = {map_uid}
+        queue = deque([map_uid])
+        while queue:
+            for source_map_uid in self._incoming.get(queue.popleft(), set()):
+                if (
+                    source_map_uid not in reaching_map_uids
+                    and source_map_uid in self._travels
+                ):
+                    reaching_map_uids.add(source_map_uid)
+                    queue.append(source_map_uid)
+        return reaching_map_uids
@@ -0,0 +1,237 @@
+import numpy as np
+import numpy.typing as npt
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import ArrayBackedMoveable
+from hard_reset.logic.map.maps import BORDER_EPSILON
+
+INITIAL_CAPACITY = 64
+
+FloatArray = npt.NDArray[np.float64]
+IndexArray = npt.NDArray[np.intp]
+BoolArray = npt.NDArray[np.bool_]
+# Tiles covered by entities as (left, top, right, bottom), all inclusive
+TileRanges = tuple[IndexArray, IndexArray, IndexArray, IndexArray]
+
+
+class MovementSystem:
+    # Row i of every array belongs to _entities[i], rows past the entity count are
+    # spare capacity
+    _entities: list[ArrayBackedMoveable]
+    _rows: dict[Uid, int]
+    _positions: FloatArray
+    # Unit vectors, scaled by the speeds in pixels per second when stepping
+    _directions: FloatArray
+    _speeds: FloatArray
+    _dimensions: FloatArray
+    # Entities moved since the last call to pop_moved_entities, and among them
+    # those now covering other tiles
+    _moved_entities: dict[Uid, ArrayBackedMoveable]
+    _retiled_entities: dict[Uid, ArrayBackedMoveable]
+
+    _tile_size: float
+    # Shares the memory of the map walkability grid, tile changes are seen as
+    # they happen
+    _walkability: npt.NDArray[np.uint8]
+
+    def __init__(
+        self,
+        walkability_grid: memoryview,
+        width_in_tiles: int,
+        height_in_tiles: int,
+        tile_size: float,
+    ) -> None:
+        self._entities = []
+        self._rows = {}
+        self._positions = np.zeros((INITIAL_CAPACITY, 2))
+        self._directions = np.zeros((INITIAL_CAPACITY, 2))
+        self._speeds = np.zeros(INITIAL_CAPACITY)
+        self._dimensions = np.zeros((INITIAL_CAPACITY, 2))
+        self._moved_entities = {}
+        self._retiled_entities = {}
+        self._tile_size = tile_size
+        self._walkability = np.frombuffer(walkability_grid, dtype=np.uint8).reshape(
+            height_in_tiles, width_in_tiles
+        )
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, entity_uid: Uid) -> bool:
+        return entity_uid in self._rows
+
+    def add(self, entity: ArrayBackedMoveable) -> None:
+        row = len(self._entities)
+        if row == len(self._positions):
+            self._grow()
+
+        position = entity.bounds.position
+        dimensions = entity.bounds.dimensions
+        direction = entity.direction
+        self._positions[row] = (position.x, position.y)
+        self._dimensions[row] = (dimensions.x, dimensions.y)
+        self._directions[row] = (direction.x, direction.y)
+        self._speeds[row] = entity.speed
+        self._entities.append(entity)
+        self._rows[entity.uid] = row
+
+        entity._movement_system = self
+        entity._movement_row = row
+
+    def remove(self, entity_uid: Uid) -> None:
+        row = self._rows.pop(entity_uid)
+        entity = self._entities[row]
+        entity._movement_system = None
+        entity._movement_row = -1
+        entity._direction = self.get_direction(row)
+        entity._speed = self.get_speed(row)
+        self._moved_entities.pop(entity_uid, None)
+        self._retiled_entities.pop(entity_uid, None)
+
+        # Fill the hole with the last row to keep the arrays dense
+        last_row = len(self._entities) - 1
+        last_entity = self._entities.pop()
+        if row != last_row:
+            self._positions[row] = self._positions[last_row]
+            self._directions[row] = self._directions[last_row]
+            self._speeds[row] = self._speeds[last_row]
+            self._dimensions[row] = self._dimensions[last_row]
+            self._entities[row] = last_entity
+            self._rows[last_entity.uid] = row
+            last_entity._movement_row = row
+
+    def get_positions(self) -> list[tuple[float, float]]:
+        return [(x, y) for x, y in self._positions[: len(self._entities)].tolist()]
+
+    def get_direction(self, row: int) -> Vertex2f:
+        x, y = self._directions[row].tolist()
+        return Vertex2f(x, y)
+
+    def set_direction(self, row: int, direction: Vertex2f) -> None:
+        self._directions[row] = (direction.x, direction.y)
+
+    def get_speed(self, row: int) -> float:
+        return float(self._speeds[row])
+
+    def set_speed(self, row: int, speed: float) -> None:
+        self._speeds[row] = speed
+
+    def sync_position(self, row: int) -> None:
+        entity = self._entities[row]
+        position = entity.bounds.position
+        self._positions[row] = (position.x, position.y)
+        self._moved_entities[entity.uid] = entity
+        self._retiled_entities[entity.uid] = entity
+
+    def pop_moved_entities(
+        self,
+    ) -> tuple[list[ArrayBackedMoveable], list[ArrayBackedMoveable]]:
+        moved_entities = list(self._moved_entities.values())
+        retiled_entities = list(self._retiled_entities.values())
+        self._moved_entities = {}
+        self._retiled_entities = {}
+        return moved_entities, retiled_entities
+
+    def step(self, delta_time: float) -> None:
+        count = len(self._entities)
+        directions = self._directions[:count]
+        speeds = self._speeds[:count]
+        moving_rows = np.flatnonzero(np.any(directions != 0, axis=1) & (speeds != 0))
+        if not moving_rows.size:
+            return
+
+        start = self._positions[moving_rows]
+        offsets = (
+            directions[moving_rows] * (speeds[moving_rows] * delta_time)[:, np.newaxis]
+        )
+        dimensions = self._dimensions[moving_rows]
+
+        # Each axis is resolved on its own so entities slide along walls
+        target_x = start[:, 0] + offsets[:, 0]
+        new_x = np.where(
+            self._is_free(target_x, start[:, 1], dimensions), target_x, start[:, 0]
+        )
+        target_y = start[:, 1] + offsets[:, 1]
+        new_y = np.where(
+            self._is_free(new_x, target_y, dimensions), target_y, start[:, 1]
+        )
+
+        moved = (new_x != start[:, 0]) | (new_y != start[:, 1])
+        previous_tiles = self._get_tile_ranges(start[:, 0], start[:, 1], dimensions)
+        tiles = self._get_tile_ranges(new_x, new_y, dimensions)
+        retiled = np.zeros(len(moved), dtype=np.bool_)
+        for previous, current in zip(previous_tiles, tiles):
+            retiled |= previous != current
+
+        moved_rows = moving_rows[moved]
+        self._positions[moved_rows, 0] = new_x[moved]
+        self._positions[moved_rows, 1] = new_y[moved]
+
+        # Bounds are written without going through sync_position, the arrays
+        # already hold the new positions
+        for row, x, y, is_retiled in zip(
+            moved_rows.tolist(),
+            new_x[moved].tolist(),
+            new_y[moved].tolist(),
+            retiled[moved].tolist(),
+        ):
+            entity = self._entities[row]
+            object.__setattr__(
+                entity, "bounds", entity.bounds.at_position(Vertex2f(x, y))
+            )
+            self._moved_entities[entity.uid] = entity
+            if is_retiled:
+                self._retiled_entities[entity.uid] = entity
+
+    def _is_free(
+        self, x: FloatArray, y: FloatArray, dimensions: FloatArray
+    ) -> BoolArray:
+        # Checks the tiles under the four corners, entities must not be larger
+        # than a tile
+        height_in_tiles, width_in_tiles = self._walkability.shape
+        left, top, right, bottom = self._get_tile_ranges(x, y, dimensions)
+        inside = (
+            (left >= 0)
+            & (top >= 0)
+            & (right < width_in_tiles)
+            & (bottom < height_in_tiles)
+        )
+
+        left = left.clip(0, width_in_tiles - 1)
+        right = right.clip(0, width_in_tiles - 1)
+        top = top.clip(0, height_in_tiles - 1)
+        bottom = bottom.clip(0, height_in_tiles - 1)
+        walkable = (
+            self._walkability[top, left]
+            & self._walkability[top, right]
+            & self._walkability[bottom, left]
+            & self._walkability[bottom, right]
+        )
+        return inside & walkable.astype(np.bool_)
+
+    def _get_tile_ranges(
+        self, x: FloatArray, y: FloatArray, dimensions: FloatArray
+    ) -> TileRanges:
+        return (
+            self._to_tile(x),
+            self._to_tile(y),
+            self._to_tile(x + dimensions[:, 0] - BORDER_EPSILON),
+            self._to_tile(y + dimensions[:, 1] - BORDER_EPSILON),
+        )
+
+    def _to_tile(self, coordinates: FloatArray) -> IndexArray:
+        return np.floor(coordinates / self._tile_size).astype(np.intp)
+
+    def _grow(self) -> None:
+        capacity = len(self._positions) * 2
+        self._positions = _resized(self._positions, capacity)
+        self._directions = _resized(self._directions, capacity)
+        self._speeds = _resized(self._speeds, capacity)
+        self._dimensions = _resized(self._dimensions, capacity)
+
+
+def _resized(array: FloatArray, capacity: int) -> FloatArray:
+    resized = np.zeros((capacity, *array.shape[1:]))
+    resized[: len(array)] = array
+    return resized
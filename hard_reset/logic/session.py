@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import TypeVar
+
+from game_manager.logic.uid_object import Uid
+
+from hard_reset.logic.entities import Player
+from hard_reset.logic.interest import InterestArea
+
+K = TypeVar("K")
+
+
+@dataclass
+class PlayerSession:
+    player: Player
+    map_uid: Uid
+    connection_id: int | None
+    dirty: bool = True
+    # Map revision of the player entity when it was last stored
+    saved_revision: int = -1
+    # Inventory version of the player when it was last stored
+    saved_inventory_version: int = -1
+    # Set once the graphic side declared its viewport
+    interest_area: InterestArea | None = None
+
+
+class SessionRegistry:
+    _sessions: dict[Uid, PlayerSession]
+    _connection_players: dict[int, set[Uid]]
+    _map_players: dict[Uid, set[Uid]]
+
+    def __init__(self) -> None:
+        self._sessions = {}
+        self._connection_players = {}
+        self._map_players = {}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def sessions(self) -> list[PlayerSession]:
+        return list(self._sessions.values())
+
+    def add(
+        self, player: Player, map_uid: Uid, connection_id: int | None
+    ) -> PlayerSession:
+        session = PlayerSession(player, map_uid, connection_id)
+        self._sessions[player.uid] = session
+        self._map_players.setdefault(map_uid, set()).add(player.uid)
+        if connection_id is not None:
+            self._connection_players.setdefault(connection_id, set()).add(player.uid)
+        return session
+
+    def remove(self, player_uid: Uid) -> PlayerSession | None:
+        session = self._sessions.pop(player_uid, None)
+        if session is None:
+            return None
+
+        _discard_from(self._map_players, session.map_uid, player_uid)
+        if session.connection_id is not None:
+            _discard_from(self._connection_players, session.connection_id, player_uid)
+        return session
+
+    def get(self, player_uid: Uid) -> PlayerSession | None:
+        return self._sessions.get(player_uid)
+
+    def get_connection_player_uids(self, connection_id: int) -> set[Uid]:
+        return set(self._connection_players.get(connection_id, ()))
+
+    def get_map_player_uids(self, map_uid: Uid) -> set[Uid]:
+        return set(self._map_players.get(map_uid, ()))
+
+    def has_players_on_map(self, map_uid: Uid) -> bool:
+        return map_uid in self._map_players
+
+    @property
+    def occupied_map_uids(self) -> list[Uid]:
+        return list(self._map_players)
+
+    def set_map(self, player_uid: Uid, map_uid: Uid) -> None:
+        session = self._sessions[player_uid]
+        _discard_from(self._map_players, session.map_uid, player_uid)
+        self._map_players.setdefault(map_uid, set()).add(player_uid)
+        session.map_uid = map_uid
+        session.dirty = True
+
+
+def _discard_from(index: dict[K, set[Uid]], key: K, uid: Uid) -> None:
+    uids = index.get(key)
+    if uids is None:
+        return
+    uids.discard(uid)
+    if not uids:
+        del index[key]
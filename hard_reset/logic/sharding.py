@@ -0,0 +1,360 @@
+import multiprocessing
+import threading
+import time
+from dataclasses import replace
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from typing import Callable, cast
+
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.item.catalog import CATALOG
+from hard_reset.logic.item.transfer import ItemMove
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.logic.logic_storage_manager import LogicStorageManager, PlayerStore
+from hard_reset.logic.map.map_registry import MapFactory
+from hard_reset.logic.map.maps import BaseMap
+from hard_reset.logic.tick_scheduler import DEFAULT_TICK_RATE
+from hard_reset.messaging.messaging import (
+    InventoryDeltaPacket,
+    LocalMessageManagerGraphic,
+    MapDeltaPacket,
+    MapInfoPacket,
+    MapLayoutPacket,
+    MessageManagerGraphic,
+    MessageManagerLogic,
+    PlayerInfoPacket,
+)
+
+# Shards are started from a clean server process, the parent may run threads
+START_METHOD = "forkserver"
+
+# Kinds of requests sent to a shard
+GRAPHIC_REQUEST = 0  # Method of the shard LocalMessageManagerGraphic
+WORKER_REQUEST = 1  # Method of the ShardWorker
+JOB_REQUEST = 2  # Function called with the shard LogicManager
+
+ShardJob = Callable[..., object]
+PlayerData = dict[object, object]
+
+
+class ShardError(Exception): ...
+
+
+class _ShardMessageManager(MessageManagerLogic):
+    def application_stopped(self) -> None: ...
+
+
+class ShardWorker:
+    logic_manager: LogicManager
+    graphic: LocalMessageManagerGraphic
+    _running: bool
+
+    def __init__(
+        self,
+        maps: dict[Uid, MapFactory],
+        storage_path: str,
+        tick_rate: float,
+        vectorized_movement: bool,
+    ) -> None:
+        self.logic_manager = LogicManager(
+            maps,
+            storage_path=storage_path,
+            tick_rate=tick_rate,
+            vectorized_movement=vectorized_movement,
+        )
+        self.logic_manager.message_manager = _ShardMessageManager()
+        self.graphic = LocalMessageManagerGraphic(self.logic_manager)
+        self._running = True
+
+    def travel(
+        self, entity_uid: Uid, map_uid: Uid, map_travel_uid: Uid
+    ) -> tuple[Uid, Uid, PlayerData | None]:
+        # The player data is returned when the destination is on another shard
+        destination = self.logic_manager.world_graph.get_destination(
+            map_uid, map_travel_uid
+        )
+        assert destination is not None
+        destination_map_uid, spawn_point_uid = destination
+        if destination_map_uid in self.logic_manager.map_registry:
+            self.graphic.use_map_travel(entity_uid, map_uid, map_travel_uid)
+            return destination_map_uid, spawn_point_uid, None
+        player_data = self.logic_manager.export_player(entity_uid)
+        return destination_map_uid, spawn_point_uid, player_data
+
+    def import_player(
+        self, player_data: PlayerData, map_uid: Uid, spawn_point_uid: Uid
+    ) -> None:
+        current_map = cast(BaseMap, self.logic_manager.get_map(map_uid))
+        spawn_point = current_map.get_spawn_point(spawn_point_uid)
+        self.logic_manager.import_player(player_data, map_uid, spawn_point._position)
+
+    def stop(self) -> None:
+        self.logic_manager.save()
+        self._running = False
+
+    def run(self, connection: Connection) -> None:
+        last_ns = time.perf_counter_ns()
+        while self._running:
+            # Requests are served between ticks
+            if connection.poll(self.logic_manager.time_until_next_tick_ns / 1e9):
+                kind, target, args = connection.recv()
+                try:
+                    result = self._handle(kind, target, args)
+                except Exception as error:
+                    connection.send((False, f"{type(error).__name__}: {error}"))
+                else:
+                    connection.send((True, result))
+
+            now_ns = time.perf_counter_ns()
+            self.logic_manager.advance(now_ns - last_ns)
+            last_ns = now_ns
+
+    def _handle(self, kind: int, target: object, args: tuple[object, ...]) -> object:
+        if kind == JOB_REQUEST:
+            return cast(ShardJob, target)(self.logic_manager, *args)
+        handler = self.graphic if kind == GRAPHIC_REQUEST else self
+        result = getattr(handler, cast(str, target))(*args)
+        if isinstance(result, MapLayoutPacket):
+            # memoryview cannot be pickled
+            return replace(result, walkability=bytes(result.walkability))
+        return result
+
+
+def _run_shard(
+    connection: Connection,
+    maps: dict[Uid, MapFactory],
+    storage_path: str,
+    tick_rate: float,
+    vectorized_movement: bool,
+) -> None:
+    ShardWorker(maps, storage_path, tick_rate, vectorized_movement).run(connection)
+
+
+class ShardedMessageManagerGraphic(MessageManagerGraphic):
+    _processes: list[BaseProcess]
+    _connections: list[Connection]
+    # A request and its response must not interleave with another one
+    _locks: list[threading.Lock]
+    _map_shards: dict[Uid, int]
+    # Map of each connected player, requests without a map uid are routed with it
+    _player_maps: dict[Uid, Uid]
+    # Locates stored players to connect them on the shard of their map
+    _storage_manager: LogicStorageManager
+    _default_map_uid: Uid
+
+    def __init__(
+        self,
+        shard_maps: list[dict[Uid, MapFactory]],
+        storage_path: str = "save/logic",
+        tick_rate: float = DEFAULT_TICK_RATE,
+        vectorized_movement: bool = False,
+    ) -> None:
+        # New players join the first map of the first shard
+        context = multiprocessing.get_context(START_METHOD)
+        self._processes = []
+        self._connections = []
+        self._locks = []
+        self._map_shards = {}
+        self._player_maps = {}
+        self._storage_manager = LogicStorageManager(storage_path)
+        self._default_map_uid = next(iter(shard_maps[0]))
+
+        for shard_index, maps in enumerate(shard_maps):
+            connection, shard_connection = context.Pipe()
+            process = context.Process(
+                target=_run_shard,
+                args=(
+                    shard_connection,
+                    maps,
+                    storage_path,
+                    tick_rate,
+                    vectorized_movement,
+                ),
+                daemon=True,
+            )
+            process.start()
+            shard_connection.close()
+
+            self._processes.append(process)
+            self._connections.append(connection)
+            self._locks.append(threading.Lock())
+            for map_uid in maps:
+                self._map_shards[map_uid] = shard_index
+
+    @property
+    def shards_count(self) -> int:
+        return len(self._connections)
+
+    def get_map_shard(self, map_uid: Uid) -> int:
+        return self._map_shards[map_uid]
+
+    def run_job(self, job: ShardJob, *args: object) -> list[object]:
+        # Every shard runs the job at the same time, results are in shard order
+        for lock, connection in zip(self._locks, self._connections):
+            lock.acquire()
+            connection.send((JOB_REQUEST, job, args))
+        try:
+            return [self._receive(connection) for connection in self._connections]
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def _request(self, shard_index: int, kind: int, name: str, *args: object) -> object:
+        connection = self._connections[shard_index]
+        with self._locks[shard_index]:
+            connection.send((kind, name, args))
+            return self._receive(connection)
+
+    def _receive(self, connection: Connection) -> object:
+        succeeded, result = connection.recv()
+        if not succeeded:
+            raise ShardError(result)
+        return result
+
+    def _call_on_map(self, map_uid: Uid, name: str, *args: object) -> object:
+        return self._request(self._map_shards[map_uid], GRAPHIC_REQUEST, name, *args)
+
+    def connect_as_player(self, player_uid: Uid | None) -> PlayerInfoPacket:
+        map_uid = self._default_map_uid
+        if player_uid is not None and player_uid in self._player_maps:
+            map_uid = self._player_maps[player_uid]
+        elif player_uid is not None:
+            player_store = self._storage_manager.retrieve_object(
+                PlayerStore, player_uid
+            )
+            if player_store is not None and player_store.map_uid in self._map_shards:
+                map_uid = player_store.map_uid
+
+        player_info = cast(
+            PlayerInfoPacket,
+            self._call_on_map(map_uid, "connect_as_player", player_uid),
+        )
+        self._player_maps[player_info.uid] = player_info.current_map_uid
+        return player_info
+
+    def get_inventory(self, map_uid: Uid, entity_uid: Uid) -> dict[str, int]:
+        return cast(
+            dict[str, int],
+            self._call_on_map(map_uid, "get_inventory", map_uid, entity_uid),
+        )
+
+    def get_inventory_changes(
+        self, map_uid: Uid, known_versions: dict[Uid, int]
+    ) -> list[InventoryDeltaPacket]:
+        return cast(
+            list[InventoryDeltaPacket],
+            self._call_on_map(
+                map_uid, "get_inventory_changes", map_uid, known_versions
+            ),
+        )
+
+    def get_crafting_recipes(self) -> dict[str, dict[str, int]]:
+        # Shards load the same catalog, it is not asked to any of them
+        return CATALOG.get_recipe_requirements_packet()
+
+    def craft_item(
+        self,
+        map_uid: Uid,
+        entity_uid: Uid,
+        recipe_name: str,
+        quantity: int = 1,
+        recursive: bool = False,
+    ) -> dict[str, int]:
+        return cast(
+            dict[str, int],
+            self._call_on_map(
+                map_uid,
+                "craft_item",
+                map_uid,
+                entity_uid,
+                recipe_name,
+                quantity,
+                recursive,
+            ),
+        )
+
+    def move_inventory_items(
+        self, map_uid: Uid, from_uid: Uid, to_uid: Uid, item_name: str, quantity: int
+    ) -> None:
+        self._call_on_map(
+            map_uid,
+            "move_inventory_items",
+            map_uid,
+            from_uid,
+            to_uid,
+            item_name,
+            quantity,
+        )
+
+    def transfer_items(
+        self, map_uid: Uid, moves: list[ItemMove]
+    ) -> dict[Uid, dict[str, int]]:
+        return cast(
+            dict[Uid, dict[str, int]],
+            self._call_on_map(map_uid, "transfer_items", map_uid, moves),
+        )
+
+    def get_map_layout(self, map_uid: Uid) -> MapLayoutPacket:
+        layout = cast(
+            MapLayoutPacket, self._call_on_map(map_uid, "get_map_layout", map_uid)
+        )
+        return replace(layout, walkability=memoryview(layout.walkability))
+
+    def get_map_info(self, map_uid: Uid) -> MapInfoPacket:
+        return cast(MapInfoPacket, self._call_on_map(map_uid, "get_map_info", map_uid))
+
+    def get_map_delta(
+        self, map_uid: Uid, since_revision: int, player_uid: Uid | None = None
+    ) -> MapDeltaPacket:
+        return cast(
+            MapDeltaPacket,
+            self._call_on_map(
+                map_uid, "get_map_delta", map_uid, since_revision, player_uid
+            ),
+        )
+
+    def set_viewport(self, player_uid: Uid, dimensions: Vertex2f) -> None:
+        self._call_on_map(
+            self._player_maps[player_uid], "set_viewport", player_uid, dimensions
+        )
+
+    def use_map_travel(self, entity_uid: Uid, map_uid: Uid, map_travel_uid: Uid) -> Uid:
+        destination_map_uid, spawn_point_uid, player_data = cast(
+            tuple[Uid, Uid, PlayerData | None],
+            self._request(
+                self._map_shards[map_uid],
+                WORKER_REQUEST,
+                "travel",
+                entity_uid,
+                map_uid,
+                map_travel_uid,
+            ),
+        )
+        if player_data is not None:
+            # Handoff, the player continues on the shard of the destination
+            self._request(
+                self._map_shards[destination_map_uid],
+                WORKER_REQUEST,
+                "import_player",
+                player_data,
+                destination_map_uid,
+                spawn_point_uid,
+            )
+        if entity_uid in self._player_maps:
+            self._player_maps[entity_uid] = destination_map_uid
+        return destination_map_uid
+
+    def set_entity_direction(
+        self, map_uid: Uid, entity_uid: Uid, direction: Vertex2f
+    ) -> None:
+        self._call_on_map(
+            map_uid, "set_entity_direction", map_uid, entity_uid, direction
+        )
+
+    def stop_application(self) -> None:
+        for shard_index in range(self.shards_count):
+            self._request(shard_index, WORKER_REQUEST, "stop")
+        for process in self._processes:
+            process.join()
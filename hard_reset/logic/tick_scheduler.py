@@ -0,0 +1,106 @@
+import time
+from collections import deque
+from typing import Callable
+
+DEFAULT_TICK_RATE = 30
+# Ticks run in a single update when late, older ticks are dropped
+DEFAULT_MAX_CATCH_UP_TICKS = 5
+# Tick durations kept to compute percentiles
+TICK_HISTORY_SIZE = 1024
+
+
+class TickStatistics:
+    ticks: int
+    dropped_ticks: int
+    overruns: int
+    total_tick_ns: int
+    max_tick_ns: int
+
+    _tick_budget_ns: int
+    _recent_ticks_ns: deque[int]
+
+    def __init__(self, tick_budget_ns: int) -> None:
+        self._tick_budget_ns = tick_budget_ns
+        self._recent_ticks_ns = deque(maxlen=TICK_HISTORY_SIZE)
+        self.reset()
+
+    def reset(self) -> None:
+        self.ticks = 0
+        self.dropped_ticks = 0
+        self.overruns = 0
+        self.total_tick_ns = 0
+        self.max_tick_ns = 0
+        self._recent_ticks_ns.clear()
+
+    def record(self, tick_ns: int) -> None:
+        self.ticks += 1
+        self.total_tick_ns += tick_ns
+        self.max_tick_ns = max(self.max_tick_ns, tick_ns)
+        if tick_ns > self._tick_budget_ns:
+            self.overruns += 1
+        self._recent_ticks_ns.append(tick_ns)
+
+    @property
+    def average_tick_ns(self) -> float:
+        return self.total_tick_ns / self.ticks if self.ticks else 0.0
+
+    @property
+    def load(self) -> float:
+        # Share of the tick budget spent simulating
+        return self.average_tick_ns / self._tick_budget_ns
+
+    def percentile_tick_ns(self, percentile: float) -> float:
+        if not self._recent_ticks_ns:
+            return 0.0
+        recent_ticks_ns = sorted(self._recent_ticks_ns)
+        index = round(percentile / 100 * (len(recent_ticks_ns) - 1))
+        return float(recent_ticks_ns[index])
+
+
+class FixedTimestepScheduler:
+    statistics: TickStatistics
+
+    _tick: Callable[[float], None]
+    _tick_ns: int
+    _max_catch_up_ticks: int
+    _accumulated_ns: float
+
+    def __init__(
+        self,
+        tick: Callable[[float], None],
+        tick_rate: float = DEFAULT_TICK_RATE,
+        max_catch_up_ticks: int = DEFAULT_MAX_CATCH_UP_TICKS,
+    ) -> None:
+        self._tick = tick
+        self._tick_ns = int(1e9 / tick_rate)
+        self._max_catch_up_ticks = max_catch_up_ticks
+        self._accumulated_ns = 0.0
+        self.statistics = TickStatistics(self._tick_ns)
+
+    @property
+    def tick_duration(self) -> float:
+        return self._tick_ns / 1e9
+
+    @property
+    def time_until_next_tick_ns(self) -> float:
+        return max(self._tick_ns - self._accumulated_ns, 0.0)
+
+    def advance(self, delta_ns: float) -> int:
+        self._accumulated_ns += delta_ns
+        ticks_due = int(self._accumulated_ns // self._tick_ns)
+        ticks_to_run = min(ticks_due, self._max_catch_up_ticks)
+
+        for _ in range(ticks_to_run):
+            self.run_tick()
+
+        self._accumulated_ns -= ticks_due * self._tick_ns
+        self.statistics.dropped_ticks += ticks_due - ticks_to_run
+        return ticks_to_run
+
+    def run_tick(self) -> None:
+        start_ns = time.perf_counter_ns()
+        self._tick(self.tick_duration)
+        self.statistics.record(time.perf_counter_ns() - start_ns)
+
+    def reset(self) -> None:
+        self._accumulated_ns = 0.0
@@ -0,0 +1,276 @@
+from dataclasses import dataclass, field
+from typing import Callable
+from uuid import uuid4
+
+from game_manager.logic.uid_object import Uid
+
+from hard_reset.logic.activity import ActivityScheduler
+from hard_reset.logic.logic_storage_manager import TimerStore, get_timers_uid
+from hard_reset.logic.map.maps import BaseMap
+from hard_reset.storage.sqlite_storage_manager import SQLiteStorageManager
+
+# Each level of a wheel has 2**SLOT_BITS slots, one slot of a level spans a
+# whole turn of the level below
+SLOT_BITS = 6
+WHEEL_LEVELS = 4
+_SLOT_MASK = (1 << SLOT_BITS) - 1
+# Timers further away than the last level wait in an overflow slot
+_OVERFLOW_LEVEL = WHEEL_LEVELS
+
+
+@dataclass(eq=False)
+class Timer:
+    map_uid: Uid
+    event_name: str
+    # Plain data only (str, int, float, bool, None, lists and dicts of those),
+    # timers are stored with their map
+    payload: dict[str, object]
+    expiry_tick: int
+    # The map stays active while the timer is pending, instead of waiting for
+    # a player to wake it
+    hold_map: bool = False
+    uid: Uid = field(default_factory=uuid4)
+    # Slot holding the timer in its wheel
+    _level: int = field(default=-1, init=False, repr=False)
+    _slot: int = field(default=-1, init=False, repr=False)
+
+
+TimerHandler = Callable[[BaseMap, Timer], None]
+
+
+class TimerWheel:
+    # Timers of one map, insertion and cancellation are O(1) and advancing
+    # costs one step per expiring timer or non-empty level turn, not per
+    # pending timer or elapsed tick
+    _now: int
+    _slots: list[list[dict[Uid, Timer]]]
+    _overflow: dict[Uid, Timer]
+    _level_counts: list[int]
+
+    def __init__(self, now: int) -> None:
+        self._now = now
+        self._slots = [[{} for _ in range(1 << SLOT_BITS)] for _ in range(WHEEL_LEVELS)]
+        self._overflow = {}
+        self._level_counts = [0] * WHEEL_LEVELS
+
+    def __len__(self) -> int:
+        return sum(self._level_counts) + len(self._overflow)
+
+    @property
+    def now(self) -> int:
+        return self._now
+
+    @property
+    def timers(self) -> list[Timer]:
+        return [
+            timer
+            for level_slots in self._slots
+            for slot in level_slots
+            for timer in slot.values()
+        ] + list(self._overflow.values())
+
+    def insert(self, timer: Timer) -> None:
+        # Timers already due expire on the next tick
+        timer.expiry_tick = max(timer.expiry_tick, self._now + 1)
+        self._place(timer)
+
+    def _place(self, timer: Timer) -> None:
+        # The expiry must not be before the current tick
+        expiry_tick = timer.expiry_tick
+        for level in range(WHEEL_LEVELS):
+            level_shift = SLOT_BITS * (level + 1)
+            if expiry_tick >> level_shift == self._now >> level_shift:
+                timer._level = level
+                timer._slot = (expiry_tick >> (SLOT_BITS * level)) & _SLOT_MASK
+                self._slots[level][timer._slot][timer.uid] = timer
+                self._level_counts[level] += 1
+                return
+        timer._level = _OVERFLOW_LEVEL
+        self._overflow[timer.uid] = timer
+
+    def remove(self, timer: Timer) -> None:
+        # Expired timers are already out of the wheel
+        if timer._level == -1:
+            return
+        if timer._level == _OVERFLOW_LEVEL:
+            del self._overflow[timer.uid]
+        else:
+            del self._slots[timer._level][timer._slot][timer.uid]
+            self._level_counts[timer._level] -= 1
+        timer._level = -1
+
+    def advance(self, to_tick: int) -> list[Timer]:
+        # Expired timers in expiry order
+        expired: list[Timer] = []
+        while self._now < to_tick:
+            if not any(self._level_counts) and not self._overflow:
+                self._now = to_tick
+                break
+
+            # Nothing expires or cascades before the next turn of the lowest
+            # non-empty level, the ticks in between are skipped
+            skipped_bits = 0
+            for level_count in self._level_counts:
+                if level_count:
+                    break
+                skipped_bits += SLOT_BITS
+            if skipped_bits:
+                next_tick = ((self._now >> skipped_bits) + 1) << skipped_bits
+                if next_tick > to_tick:
+                    self._now = to_tick
+                    break
+                self._now = next_tick - 1
+
+            self._now += 1
+            self._cascade()
+            slot = self._slots[0][self._now & _SLOT_MASK]
+            if slot:
+                expired.extend(slot.values())
+                self._level_counts[0] -= len(slot)
+                slot.clear()
+        for timer in expired:
+            timer._level = -1
+        return expired
+
+    def _cascade(self) -> None:
+        # Timers of the slot a level enters move down, higher levels first
+        if self._now & ((1 << (SLOT_BITS * WHEEL_LEVELS)) - 1) == 0:
+            overflow, self._overflow = self._overflow, {}
+            for timer in overflow.values():
+                self._place(timer)
+        for level in range(WHEEL_LEVELS - 1, 0, -1):
+            if self._now & ((1 << (SLOT_BITS * level)) - 1) != 0:
+                continue
+            slot = self._slots[level][(self._now >> (SLOT_BITS * level)) & _SLOT_MASK]
+            if slot:
+                timers = list(slot.values())
+                self._level_counts[level] -= len(slot)
+                slot.clear()
+                for timer in timers:
+                    self._place(timer)
+
+
+class TimerScheduler:
+    # Timers are partitioned by map, the wheel of a map only advances when the
+    # map is updated so dormant maps cost nothing until they wake
+    _activity: ActivityScheduler
+    _storage_manager: SQLiteStorageManager
+    _handlers: dict[str, TimerHandler]
+    _wheels: dict[Uid, TimerWheel]
+    _timers: dict[Uid, Timer]
+    # Ticks run by the logic manager, the clock of every wheel
+    _tick: int
+
+    def __init__(
+        self, activity: ActivityScheduler, storage_manager: SQLiteStorageManager
+    ) -> None:
+        self._activity = activity
+        self._storage_manager = storage_manager
+        self._handlers = {}
+        self._wheels = {}
+        self._timers = {}
+        self._tick = 0
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    @property
+    def tick(self) -> int:
+        return self._tick
+
+    def register_handler(self, event_name: str, handler: TimerHandler) -> None:
+        self._handlers[event_name] = handler
+
+    def schedule(
+        self,
+        map_uid: Uid,
+        delay_ticks: int,
+        event_name: str,
+        payload: dict[str, object] | None = None,
+        hold_map: bool = False,
+        timer_uid: Uid | None = None,
+    ) -> Timer:
+        # The map must be loaded, its wheel is created with it
+        if event_name not in self._handlers:
+            raise ValueError(f"No handler for timer event {event_name}")
+        wheel = self._wheels[map_uid]
+        timer = Timer(
+            map_uid, event_name, payload or {}, self._tick + delay_ticks, hold_map
+        )
+        if timer_uid is not None:
+            timer.uid = timer_uid
+        wheel.insert(timer)
+        self._timers[timer.uid] = timer
+        if hold_map:
+            self._activity.hold(map_uid)
+        return timer
+
+    def cancel(self, timer_uid: Uid) -> bool:
+        timer = self._timers.pop(timer_uid, None)
+        if timer is None:
+            return False
+        self._wheels[timer.map_uid].remove(timer)
+        if timer.hold_map:
+            self._activity.release(timer.map_uid)
+        return True
+
+    def next_tick(self) -> None:
+        self._tick += 1
+
+    def advance_map(self, current_map: BaseMap) -> None:
+        # Brings the wheel of the map to the current tick and fires its expired
+        # timers, handlers may schedule new ones
+        wheel = self._wheels.get(current_map.uid)
+        if wheel is None:
+            return
+        for timer in wheel.advance(self._tick):
+            # Handlers of timers expiring on the same tick may cancel this one
+            if self._timers.pop(timer.uid, None) is None:
+                continue
+            if timer.hold_map:
+                self._activity.release(timer.map_uid)
+            self._handlers[timer.event_name](current_map, timer)
+
+    def load_map(self, map_uid: Uid) -> None:
+        # Stored timers resume with the delay they had left, unloaded maps do
+        # not age
+        self._wheels[map_uid] = TimerWheel(self._tick)
+        timer_store = self._storage_manager.retrieve_object(
+            TimerStore, get_timers_uid(map_uid)
+        )
+        if timer_store is None:
+            return
+        for (
+            timer_uid,
+            remaining_ticks,
+            event_name,
+            payload,
+            hold_map,
+        ) in timer_store.timers:
+            self.schedule(
+                map_uid, remaining_ticks, event_name, payload, hold_map, timer_uid
+            )
+
+    def store_map(self, map_uid: Uid) -> None:
+        self._storage_manager.store_object(
+            TimerStore(
+                map_uid,
+                [
+                    (
+                        timer.uid,
+                        max(timer.expiry_tick - self._tick, 0),
+                        timer.event_name,
+                        timer.payload,
+                        timer.hold_map,
+                    )
+                    for timer in self._wheels[map_uid].timers
+                ],
+            )
+        )
+
+    def unload_map(self, map_uid: Uid) -> None:
+        self.store_map(map_uid)
+        for timer in self._wheels.pop(map_uid).timers:
+            del self._timers[timer.uid]
+            if timer.hold_map:
+                self._activity.release(map_uid)
@@ -0,0 +1,108 @@
+from typing import Callable
+
+from game_manager.logic.uid_object import Uid
+
+from hard_reset.logic.entities import InventoryChange
+from hard_reset.messaging.messaging import InventoryDeltaPacket, MessageManagerGraphic
+
+InventoryChangesCallback = Callable[[list[InventoryChange]], None]
+
+
+class _InventoryWatch:
+    # Version of the known items, -1 until they are first received
+    version: int
+    items: dict[str, int]
+    callbacks: list[InventoryChangesCallback]
+
+    def __init__(self) -> None:
+        self.version = -1
+        self.items = {}
+        self.callbacks = []
+
+
+class InventoryWatcher:
+    # Callbacks are only called from poll, with the changes since the items they
+    # last saw, so components never fetch or rebuild unchanged inventories.
+    # Inventory listeners are not used: they run on the logic side (another
+    # thread or process) while callbacks must run on the render thread, and
+    # messaging only answers requests. Polled with the map delta of the frame,
+    # unchanged inventories make an empty answer
+    _message_manager: MessageManagerGraphic
+    # Watched inventories by map uid then entity uid
+    _watches: dict[Uid, dict[Uid, _InventoryWatch]]
+
+    def __init__(self, message_manager: MessageManagerGraphic) -> None:
+        self._message_manager = message_manager
+        self._watches = {}
+
+    def watch(
+        self, map_uid: Uid, entity_uid: Uid, callback: InventoryChangesCallback
+    ) -> None:
+        map_watches = self._watches.setdefault(map_uid, {})
+        inventory_watch = map_watches.setdefault(entity_uid, _InventoryWatch())
+        inventory_watch.callbacks.append(callback)
+        if inventory_watch.version == -1:
+            self._poll_map(map_uid, map_watches)
+        elif inventory_watch.items:
+            # Known items are handed to the new callback as added ones
+            callback(_get_changes({}, inventory_watch.items))
+
+    def unwatch(
+        self, map_uid: Uid, entity_uid: Uid, callback: InventoryChangesCallback
+    ) -> None:
+        map_watches = self._watches.get(map_uid, {})
+        inventory_watch = map_watches.get(entity_uid)
+        if inventory_watch is None or callback not in inventory_watch.callbacks:
+            return
+        inventory_watch.callbacks.remove(callback)
+        if not inventory_watch.callbacks:
+            del map_watches[entity_uid]
+            if not map_watches:
+                del self._watches[map_uid]
+
+    def poll(self) -> None:
+        # One request per map with watched inventories, none when nothing is
+        # watched
+        for map_uid, map_watches in list(self._watches.items()):
+            self._poll_map(map_uid, map_watches)
+
+    def _poll_map(self, map_uid: Uid, map_watches: dict[Uid, _InventoryWatch]) -> None:
+        packets = self._message_manager.get_inventory_changes(
+            map_uid,
+            {
+                entity_uid: inventory_watch.version
+                for entity_uid, inventory_watch in map_watches.items()
+            },
+        )
+        for packet in packets:
+            self._apply_packet(map_watches, packet)
+
+    def _apply_packet(
+        self, map_watches: dict[Uid, _InventoryWatch], packet: InventoryDeltaPacket
+    ) -> None:
+        inventory_watch = map_watches.get(packet.entity_uid)
+        if inventory_watch is None:
+            return
+        changes = _get_changes(inventory_watch.items, packet.items)
+        inventory_watch.version = packet.version
+        inventory_watch.items = packet.items
+        if changes:
+            for callback in list(inventory_watch.callbacks):
+                callback(changes)
+
+
+def _get_changes(
+    old_items: dict[str, int], new_items: dict[str, int]
+) -> list[InventoryChange]:
+    # Changed and added items in inventory order, then removed items
+    changes = [
+        (item_name, old_items.get(item_name, 0), quantity)
+        for item_name, quantity in new_items.items()
+        if old_items.get(item_name, 0) != quantity
+    ]
+    changes.extend(
+        (item_name, quantity, 0)
+        for item_name, quantity in old_items.items()
+        if item_name not in new_items
+    )
+    return changes
@@ -1,7 +1,9 @@
+import functools
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, cast
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Concatenate, ParamSpec, TypeVar, cast
 
+from game_manager.logic.entity.entity import Entity
 from game_manager.logic.entity.entity_moveable import EntityMoveable
 from game_manager.logic.uid_object import Uid
 from game_manager.messaging.message_manager import (
@@ -11,17 +13,18 @@ from game_manager.messaging.message_manager import (
 from vertyces.vertex import Vertex2f
 
 from hard_reset.logic.entities import Chest, Door, WithInventory
-from hard_reset.logic.item.crafting_recipe import (
-    CRAFTING_RECIPES,
-    RESULT_NAME_TO_RECIPE,
-)
-from hard_reset.logic.item.item import NAME_TO_ITEM
+from hard_reset.logic.item.catalog import CATALOG
+from hard_reset.logic.item.crafting_planner import apply_crafting_plan, plan_crafts
+from hard_reset.logic.item.transfer import ItemMove, transfer_items
 from hard_reset.logic.map.maps import BaseMap
 
 if TYPE_CHECKING:
     from hard_reset.graphic.graphic_manager import GraphicManager
     from hard_reset.logic.logic_manager import LogicManager
 
+P = ParamSpec("P")
+T = TypeVar("T")
+
 
 @dataclass
 class EntityInfoPacket:
@@ -43,13 +46,49 @@ class PlayerInfoPacket(EntityInfoPacket):
 
 
 @dataclass
-class MapInfoPacket:
+class MapLayoutPacket:
+    map_uid: Uid
+    layout_hash: str
     width_in_tiles: int
     height_in_tiles: int
     width: int
     height: int
-    tiles: dict[tuple[int, int], bool]
+    # Row-major, one byte per tile, non zero when walkable. A view of the map
+    # grid, only copied to bytes to cross a process boundary
+    walkability: bytes | memoryview
+
+
+@dataclass
+class MapInfoPacket:
+    map_uid: Uid
+    layout_hash: str
+    entities: dict[Uid, EntityInfoPacket]
+    revision: int
+
+
+@dataclass
+class MapDeltaPacket:
+    map_uid: Uid
+    # Clients fetch the layout again with get_map_layout when this changes
+    layout_hash: str
+    revision: int
+    # When full is set, entities holds every entity of the map and any entity
+    # not listed must be discarded
+    full: bool
     entities: dict[Uid, EntityInfoPacket]
+    removed_entity_uids: list[Uid]
+    # Only filled when the delta is restricted to a player viewport, entities
+    # entering it are also part of entities
+    entered_entity_uids: list[Uid] = field(default_factory=list)
+    left_entity_uids: list[Uid] = field(default_factory=list)
+
+
+@dataclass
+class InventoryDeltaPacket:
+    entity_uid: Uid
+    version: int
+    # Every held item, only sent when the version differs from the known one
+    items: dict[str, int]
 
 
 class MessageManagerLogic(ABC, MessageManagerProtocol):
@@ -64,12 +103,22 @@ class MessageManagerGraphic(ABC, MessageManagerProtocol):
     @abstractmethod
     def get_inventory(self, map_uid: Uid, entity_uid: Uid) -> dict[str, int]: ...
 
+    @abstractmethod
+    def get_inventory_changes(
+        self, map_uid: Uid, known_versions: dict[Uid, int]
+    ) -> list[InventoryDeltaPacket]: ...
+
     @abstractmethod
     def get_crafting_recipes(self) -> dict[str, dict[str, int]]: ...
 
     @abstractmethod
     def craft_item(
-        self, map_uid: Uid, entity_uid: Uid, recipe_name: str
+        self,
+        map_uid: Uid,
+        entity_uid: Uid,
+        recipe_name: str,
+        quantity: int = 1,
+        recursive: bool = False,
     ) -> dict[str, int]: ...
 
     @abstractmethod
@@ -77,9 +126,25 @@ class MessageManagerGraphic(ABC, MessageManagerProtocol):
         self, map_uid: Uid, from_uid: Uid, to_uid: Uid, item_name: str, quantity: int
     ) -> None: ...
 
+    @abstractmethod
+    def transfer_items(
+        self, map_uid: Uid, moves: list[ItemMove]
+    ) -> dict[Uid, dict[str, int]]: ...
+
+    @abstractmethod
+    def get_map_layout(self, map_uid: Uid) -> MapLayoutPacket: ...
+
     @abstractmethod
     def get_map_info(self, map_uid: Uid) -> MapInfoPacket: ...
 
+    @abstractmethod
+    def get_map_delta(
+        self, map_uid: Uid, since_revision: int, player_uid: Uid | None = None
+    ) -> MapDeltaPacket: ...
+
+    @abstractmethod
+    def set_viewport(self, player_uid: Uid, dimensions: Vertex2f) -> None: ...
+
     @abstractmethod
     def use_map_travel(
         self, entity_uid: Uid, map_uid: Uid, map_travel_uid: Uid
@@ -94,19 +159,52 @@ class MessageManagerGraphic(ABC, MessageManagerProtocol):
     def stop_application(self) -> None: ...
 
 
-class TestMessageManager(MessageManager, MessageManagerLogic, MessageManagerGraphic):
+def _entity_info_packet(entity: Entity) -> EntityInfoPacket:
+    if isinstance(entity, Door):
+        return EntityDoorInfoPacket(
+            type_name=entity.__class__.__name__,
+            uid=entity.uid,
+            position=entity.bounds.position,
+            dimensions=entity.bounds.dimensions,
+            map_travel_uid=entity._map_travel_uid,
+        )
+    return EntityInfoPacket(
+        type_name=entity.__class__.__name__,
+        uid=entity.uid,
+        position=entity.bounds.position,
+    )
+
+
+def _on_logic_thread(
+    method: Callable[Concatenate["LocalMessageManagerGraphic", P], T],
+) -> Callable[Concatenate["LocalMessageManagerGraphic", P], T]:
+    # Calls from the graphic or network thread wait for the logic thread to run
+    # them between two ticks
+    @functools.wraps(method)
+    def call_on_logic_thread(
+        self: "LocalMessageManagerGraphic", *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        return self.logic_manager.call(method, self, *args, **kwargs)
+
+    return call_on_logic_thread
+
+
+class LocalMessageManagerGraphic(MessageManagerGraphic):
     logic_manager: "LogicManager"
-    graphic_manager: "GraphicManager"
+    # Identifies the graphic side when several share one logic manager
+    connection_id: int | None = None
 
     def __init__(
-        self, logic_manager: "LogicManager", graphic_manager: "GraphicManager"
+        self, logic_manager: "LogicManager", connection_id: int | None = None
     ) -> None:
         self.logic_manager = logic_manager
-        self.graphic_manager = graphic_manager
-        super().__init__(logic_manager, graphic_manager)
+        self.connection_id = connection_id
 
+    @_on_logic_thread
     def connect_as_player(self, player_uid: Uid | None) -> PlayerInfoPacket:
-        player, map_uid = self.logic_manager.on_player_connect(player_uid)
+        player, map_uid = self.logic_manager.on_player_connect(
+            player_uid, self.connection_id
+        )
 
         return PlayerInfoPacket(
             type_name="Player",
@@ -115,114 +213,184 @@ class TestMessageManager(MessageManager, MessageManagerLogic, MessageManagerGrap
             current_map_uid=map_uid,
         )
 
-    def get_map_info(self, map_uid: Uid) -> MapInfoPacket:
+    @_on_logic_thread
+    def get_map_layout(self, map_uid: Uid) -> MapLayoutPacket:
         current_map = self.logic_manager.get_map(map_uid)
         current_map = cast(BaseMap, current_map)
         assert current_map is not None
-        tiles_data = {}
-        for i, row in enumerate(current_map._tiles):
-            for j, tile in enumerate(row):
-                tiles_data[(j, i)] = tile.walkable
-
-        entities_data: dict[Uid, EntityInfoPacket] = {}
-        for uid, entity in current_map._entities.items():
-            if isinstance(entity, Door):
-                entities_data[uid] = EntityDoorInfoPacket(
-                    type_name=entity.__class__.__name__,
-                    uid=entity.uid,
-                    position=entity.bounds.position,
-                    dimensions=entity.bounds.dimensions,
-                    map_travel_uid=entity._map_travel_uid,
-                )
-            else:
-                entities_data[uid] = EntityInfoPacket(
-                    type_name=entity.__class__.__name__,
-                    uid=entity.uid,
-                    position=entity.bounds.position,
-                )
 
-        return MapInfoPacket(
+        return MapLayoutPacket(
+            map_uid=map_uid,
+            layout_hash=current_map.layout_hash,
             width_in_tiles=current_map.width_in_tiles,
             height_in_tiles=current_map.height_in_tiles,
             width=current_map.width,
             height=current_map.height,
-            tiles=tiles_data,
-            entities=entities_data,
+            walkability=current_map.walkability_grid,
         )
 
-    def use_map_travel(self, entity_uid: Uid, map_uid: Uid, map_travel_uid: Uid) -> Uid:
+    @_on_logic_thread
+    def get_map_info(self, map_uid: Uid) -> MapInfoPacket:
         current_map = self.logic_manager.get_map(map_uid)
+        current_map = cast(BaseMap, current_map)
         assert current_map is not None
 
-        entity = current_map.get_entity(entity_uid)
-        assert entity is not None
+        changes = current_map.get_changes_since(-1)
+        entities_data = {
+            entity.uid: _entity_info_packet(entity)
+            for entity in changes.changed_entities
+        }
+
+        return MapInfoPacket(
+            map_uid=map_uid,
+            layout_hash=current_map.layout_hash,
+            entities=entities_data,
+            revision=changes.revision,
+        )
 
+    @_on_logic_thread
+    def get_map_delta(
+        self, map_uid: Uid, since_revision: int, player_uid: Uid | None = None
+    ) -> MapDeltaPacket:
+        current_map = self.logic_manager.get_map(map_uid)
         current_map = cast(BaseMap, current_map)
-        map_travel = current_map.get_map_travel(map_travel_uid)
-        next_map_uid, spawn_point_uid = map_travel.destination
-        next_map = self.logic_manager.get_map(next_map_uid)
-        assert next_map is not None
+        assert current_map is not None
 
-        next_map = cast(BaseMap, next_map)
-        spawn_point = next_map.get_spawn_point(spawn_point_uid)
+        session = self.logic_manager.sessions.get(player_uid) if player_uid else None
+        if session is not None and session.interest_area is not None:
+            player_bounds = session.player.bounds
+            interest_changes = session.interest_area.get_changes_since(
+                current_map,
+                player_bounds.position.translated(player_bounds.dimensions.divided(2)),
+                since_revision,
+            )
+            return MapDeltaPacket(
+                map_uid=map_uid,
+                layout_hash=current_map.layout_hash,
+                revision=interest_changes.revision,
+                full=interest_changes.full,
+                entities={
+                    entity.uid: _entity_info_packet(entity)
+                    for entity in interest_changes.changed_entities
+                },
+                removed_entity_uids=[],
+                entered_entity_uids=interest_changes.entered_entity_uids,
+                left_entity_uids=interest_changes.left_entity_uids,
+            )
 
-        current_map.remove_entity(entity_uid)
-        entity.bounds = entity.bounds.at_position(spawn_point._position)
-        next_map.add_entity(entity)
+        changes = current_map.get_changes_since(since_revision)
+        return MapDeltaPacket(
+            map_uid=map_uid,
+            layout_hash=current_map.layout_hash,
+            revision=changes.revision,
+            full=changes.full,
+            entities={
+                entity.uid: _entity_info_packet(entity)
+                for entity in changes.changed_entities
+            },
+            removed_entity_uids=changes.removed_entity_uids,
+        )
 
-        return next_map.uid
+    @_on_logic_thread
+    def set_viewport(self, player_uid: Uid, dimensions: Vertex2f) -> None:
+        self.logic_manager.set_player_viewport(player_uid, dimensions)
 
+    @_on_logic_thread
+    def use_map_travel(self, entity_uid: Uid, map_uid: Uid, map_travel_uid: Uid) -> Uid:
+        hop = self.logic_manager.world_graph.get_hop(map_uid, map_travel_uid)
+        assert hop is not None
+
+        self.logic_manager.move_entity(
+            entity_uid, map_uid, hop.destination_map_uid, hop.spawn_position
+        )
+
+        return hop.destination_map_uid
+
+    @_on_logic_thread
     def get_inventory(self, map_uid: Uid, entity_uid: Uid) -> dict[str, int]:
         map = self.logic_manager.get_map(map_uid)
         assert map is not None
         entity = map.get_entity(entity_uid)
         assert entity is not None
         chest = cast("Chest", entity)
-        return chest._inventory._items
+        return chest._inventory.get_items()
+
+    @_on_logic_thread
+    def get_inventory_changes(
+        self, map_uid: Uid, known_versions: dict[Uid, int]
+    ) -> list[InventoryDeltaPacket]:
+        # Unchanged inventories are left out, as are entities that left the map
+        map = self.logic_manager.get_map(map_uid)
+        assert map is not None
+        packets = []
+        for entity_uid, known_version in known_versions.items():
+            entity = map.get_entity(entity_uid)
+            if entity is None:
+                continue
+            inventory = cast(WithInventory, entity)._inventory
+            if inventory.version != known_version:
+                packets.append(
+                    InventoryDeltaPacket(
+                        entity_uid, inventory.version, inventory.get_items()
+                    )
+                )
+        return packets
 
     def get_crafting_recipes(self) -> dict[str, dict[str, int]]:
-        recipes = {}
-        for recipe in CRAFTING_RECIPES:
-            recipes[recipe._result.item.name] = {
-                ingredient.item.name: ingredient.quantity
-                for ingredient in recipe._ingredients
-            }
-        return recipes
+        # Built once, the caller must not modify it
+        return CATALOG.get_recipe_requirements_packet()
 
+    @_on_logic_thread
     def craft_item(
-        self, map_uid: Uid, entity_uid: Uid, recipe_name: str
+        self,
+        map_uid: Uid,
+        entity_uid: Uid,
+        recipe_name: str,
+        quantity: int = 1,
+        recursive: bool = False,
     ) -> dict[str, int]:
+        # Crafts as many times as possible up to quantity, recursive also crafts
+        # the missing intermediate ingredients
         map = self.logic_manager.get_map(map_uid)
         assert map is not None
         entity = map.get_entity(entity_uid)
         assert entity is not None
         entity_with_inventory = cast(WithInventory, entity)
 
-        recipe = RESULT_NAME_TO_RECIPE[recipe_name]
-        may_craft = recipe.can_craft(entity_with_inventory._inventory._items)
-        if may_craft:
-            for ingredient in recipe._ingredients:
-                entity_with_inventory._inventory.remove_item(
-                    ingredient.item, ingredient.quantity
-                )
-            entity_with_inventory._inventory.add_item(
-                recipe._result.item, recipe._result.quantity
-            )
+        inventory = entity_with_inventory._inventory
+        recipe = CATALOG.get_recipe(recipe_name)
+        apply_crafting_plan(
+            inventory, plan_crafts(inventory, recipe, quantity, recursive)
+        )
 
-        return entity_with_inventory._inventory._items
+        return inventory.get_items()
 
     def move_inventory_items(
         self, map_uid: Uid, from_uid: Uid, to_uid: Uid, item_name: str, quantity: int
     ) -> None:
+        self.transfer_items(map_uid, [(from_uid, to_uid, item_name, quantity)])
+
+    @_on_logic_thread
+    def transfer_items(
+        self, map_uid: Uid, moves: list[ItemMove]
+    ) -> dict[Uid, dict[str, int]]:
+        # All the moves are applied or none, the result holds the inventories of
+        # every entity involved
         map = self.logic_manager.get_map(map_uid)
         assert map is not None
-        from_entity = cast(WithInventory, map.get_entity(from_uid))
-        assert from_entity is not None
-        to_entity = cast(WithInventory, map.get_entity(to_uid))
-        assert to_entity is not None
-        from_entity._inventory.remove_item(NAME_TO_ITEM[item_name], quantity)
-        to_entity._inventory.add_item(NAME_TO_ITEM[item_name], quantity)
-
+        inventories = {}
+        for from_uid, to_uid, _, _ in moves:
+            for entity_uid in (from_uid, to_uid):
+                entity = map.get_entity(entity_uid)
+                assert entity is not None
+                inventories[entity_uid] = cast(WithInventory, entity)._inventory
+        transfer_items(inventories, moves)
+        return {
+            entity_uid: inventory.get_items()
+            for entity_uid, inventory in inventories.items()
+        }
+
+    @_on_logic_thread
     def set_entity_direction(
         self, map_uid: Uid, entity_uid: Uid, direction: Vertex2f
     ) -> None:
@@ -230,10 +398,26 @@ class TestMessageManager(MessageManager, MessageManagerLogic, MessageManagerGrap
         assert map is not None
         entity = map.get_entity(entity_uid)
         assert entity is not None and isinstance(entity, EntityMoveable), entity
-        entity.direction = direction.unit_vertex.multiplied(entity.speed)
-
-    def application_stopped(self) -> None:
-        self.graphic_manager.stop()
+        # The speed is applied by the movement integration
+        entity.direction = direction.unit_vertex
 
     def stop_application(self) -> None:
+        # Called directly, stopping ends the logic thread that serves calls
         self.logic_manager.stop()
+
+
+class TestMessageManager(
+    MessageManager, MessageManagerLogic, LocalMessageManagerGraphic
+):
+    logic_manager: "LogicManager"
+    graphic_manager: "GraphicManager"
+
+    def __init__(
+        self, logic_manager: "LogicManager", graphic_manager: "GraphicManager"
+    ) -> None:
+        self.logic_manager = logic_manager
+        self.graphic_manager = graphic_manager
+        super().__init__(logic_manager, graphic_manager)
+
+    def application_stopped(self) -> None:
+        self.graphic_manager.stop()
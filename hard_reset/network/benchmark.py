@@ -0,0 +1,73 @@
+import argparse
+import asyncio
+import statistics
+import time
+from typing import cast
+
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.messaging.messaging import PlayerInfoPacket
+from hard_reset.network.client import ServerConnection
+from hard_reset.network.server import LogicServer
+
+
+async def _run_client(
+    port: int, requests_count: int, pipeline_depth: int, latencies: list[float]
+) -> None:
+    connection = await ServerConnection.open(port=port)
+    player_info = cast(
+        PlayerInfoPacket, await connection.request("connect_as_player", None)
+    )
+    map_uid = player_info.current_map_uid
+
+    async def timed_request() -> None:
+        # Full snapshots are requested to measure the worst case packet size
+        start = time.perf_counter()
+        await connection.request("get_map_delta", map_uid, -1)
+        latencies.append(time.perf_counter() - start)
+
+    for _ in range(0, requests_count, pipeline_depth):
+        await asyncio.gather(*(timed_request() for _ in range(pipeline_depth)))
+
+    await connection.close()
+
+
+async def run_benchmark(
+    clients_count: int, requests_count: int, pipeline_depth: int
+) -> None:
+    server = LogicServer(LogicManager(), port=0)
+    await server.start()
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _run_client(server.port, requests_count, pipeline_depth, latencies)
+            for _ in range(clients_count)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    server.application_stopped()
+    await server.serve_forever()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"Clients: {clients_count}, pipeline depth: {pipeline_depth}")
+    print(f"Requests: {len(latencies)} in {elapsed:.3f}s")
+    print(f"Throughput: {len(latencies) / elapsed:.0f} requests/s")
+    print(f"Latency: p50 {quantiles[49] * 1e3:.3f}ms, p99 {quantiles[98] * 1e3:.3f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure logic server throughput and latency on loopback"
+    )
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--pipeline", type=int, default=16)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.clients, args.requests, args.pipeline))
+
+
+if __name__ == "__main__":
+    main()
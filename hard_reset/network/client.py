@@ -0,0 +1,300 @@
+import argparse
+import asyncio
+import threading
+from typing import TYPE_CHECKING, Callable, Sequence, cast
+
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.item.transfer import ItemMove
+from hard_reset.messaging.messaging import (
+    InventoryDeltaPacket,
+    MapDeltaPacket,
+    MapInfoPacket,
+    MapLayoutPacket,
+    MessageManagerGraphic,
+    PlayerInfoPacket,
+)
+from hard_reset.network.codec import (
+    ERROR,
+    NOTIFICATION,
+    REQUEST,
+    RESPONSE,
+    decode_value,
+    encode_frame,
+    encode_request,
+    read_frame,
+)
+from hard_reset.network.server import DEFAULT_HOST, DEFAULT_PORT
+
+if TYPE_CHECKING:
+    from hard_reset.graphic.graphic_manager import GraphicManager
+
+# Requests sent but not yet answered, further requests wait for a response
+DEFAULT_MAX_IN_FLIGHT_REQUESTS = 64
+
+
+class RemoteError(Exception): ...
+
+
+class ServerConnection:
+    _reader: asyncio.StreamReader
+    _writer: asyncio.StreamWriter
+    _in_flight: asyncio.Semaphore
+    _on_notification: Callable[[str], None]
+
+    _next_request_id: int
+    _pending_responses: dict[int, asyncio.Future[object]]
+    _receiving: asyncio.Task[None]
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        max_in_flight_requests: int,
+        on_notification: Callable[[str], None],
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._in_flight = asyncio.Semaphore(max_in_flight_requests)
+        self._on_notification = on_notification
+
+        self._next_request_id = 0
+        self._pending_responses = {}
+        self._receiving = asyncio.create_task(self._receive_responses())
+
+    @classmethod
+    async def open(
+        cls,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_in_flight_requests: int = DEFAULT_MAX_IN_FLIGHT_REQUESTS,
+        on_notification: Callable[[str], None] = lambda _: None,
+    ) -> "ServerConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, max_in_flight_requests, on_notification)
+
+    async def request(self, method_name: str, *args: object) -> object:
+        # Several requests may be awaited concurrently, they are pipelined on the
+        # connection and answered in order
+        async with self._in_flight:
+            request_id = self._next_request_id
+            self._next_request_id = (self._next_request_id + 1) % 2**32
+            response = asyncio.get_running_loop().create_future()
+            self._pending_responses[request_id] = response
+
+            self._writer.write(
+                encode_frame(REQUEST, request_id, encode_request(method_name, args))
+            )
+            await self._writer.drain()
+            return await response
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._receiving
+
+    async def _receive_responses(self) -> None:
+        try:
+            while True:
+                kind, request_id, body = await read_frame(self._reader)
+                if kind == NOTIFICATION:
+                    self._on_notification(cast(str, decode_value(body)))
+                    continue
+
+                response = self._pending_responses.pop(request_id)
+                # The caller may have stopped waiting, a timeout cancels it
+                if response.done():
+                    continue
+                if kind == RESPONSE:
+                    response.set_result(decode_value(body))
+                elif kind == ERROR:
+                    response.set_exception(RemoteError(decode_value(body)))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            for response in self._pending_responses.values():
+                if not response.done():
+                    response.set_exception(ConnectionError("Connection to server lost"))
+            self._pending_responses.clear()
+
+
+class NetworkMessageManager(MessageManagerGraphic):
+    graphic_manager: "GraphicManager | None"
+
+    _host: str
+    _port: int
+    _max_in_flight_requests: int
+
+    _loop: asyncio.AbstractEventLoop
+    _loop_thread: threading.Thread
+    _connection: ServerConnection
+    # The server catalog never changes while connected
+    _crafting_recipes: dict[str, dict[str, int]] | None
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_in_flight_requests: int = DEFAULT_MAX_IN_FLIGHT_REQUESTS,
+    ) -> None:
+        self.graphic_manager = None
+        self._host = host
+        self._port = port
+        self._max_in_flight_requests = max_in_flight_requests
+        self._crafting_recipes = None
+
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="network", daemon=True
+        )
+
+    def connect(self) -> None:
+        self._loop_thread.start()
+        self._connection = asyncio.run_coroutine_threadsafe(
+            ServerConnection.open(
+                self._host,
+                self._port,
+                self._max_in_flight_requests,
+                self._on_notification,
+            ),
+            self._loop,
+        ).result()
+
+    def attach_graphic_manager(self, graphic_manager: "GraphicManager") -> None:
+        self.graphic_manager = graphic_manager
+        graphic_manager.message_manager = self
+        graphic_manager.on_connect()
+
+    def disconnect(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._connection.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+
+    def pipeline(self, calls: Sequence[tuple[str, tuple[object, ...]]]) -> list[object]:
+        # Sends every call before waiting for the first response
+        async def send_all() -> list[object]:
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._connection.request(method_name, *args)
+                        for method_name, args in calls
+                    )
+                )
+            )
+
+        return asyncio.run_coroutine_threadsafe(send_all(), self._loop).result()
+
+    def _call(self, method_name: str, *args: object) -> object:
+        return asyncio.run_coroutine_threadsafe(
+            self._connection.request(method_name, *args), self._loop
+        ).result()
+
+    def _on_notification(self, name: str) -> None:
+        if name == "application_stopped" and self.graphic_manager is not None:
+            self.graphic_manager.stop()
+
+    def connect_as_player(self, player_uid: Uid | None) -> PlayerInfoPacket:
+        return cast(PlayerInfoPacket, self._call("connect_as_player", player_uid))
+
+    def get_inventory(self, map_uid: Uid, entity_uid: Uid) -> dict[str, int]:
+        return cast(dict[str, int], self._call("get_inventory", map_uid, entity_uid))
+
+    def get_inventory_changes(
+        self, map_uid: Uid, known_versions: dict[Uid, int]
+    ) -> list[InventoryDeltaPacket]:
+        return cast(
+            list[InventoryDeltaPacket],
+            self._call("get_inventory_changes", map_uid, known_versions),
+        )
+
+    def get_crafting_recipes(self) -> dict[str, dict[str, int]]:
+        if self._crafting_recipes is None:
+            self._crafting_recipes = cast(
+                dict[str, dict[str, int]], self._call("get_crafting_recipes")
+            )
+        return self._crafting_recipes
+
+    def craft_item(
+        self,
+        map_uid: Uid,
+        entity_uid: Uid,
+        recipe_name: str,
+        quantity: int = 1,
+        recursive: bool = False,
+    ) -> dict[str, int]:
+        return cast(
+            dict[str, int],
+            self._call(
+                "craft_item", map_uid, entity_uid, recipe_name, quantity, recursive
+            ),
+        )
+
+    def move_inventory_items(
+        self, map_uid: Uid, from_uid: Uid, to_uid: Uid, item_name: str, quantity: int
+    ) -> None:
+        self._call(
+            "move_inventory_items", map_uid, from_uid, to_uid, item_name, quantity
+        )
+
+    def transfer_items(
+        self, map_uid: Uid, moves: list[ItemMove]
+    ) -> dict[Uid, dict[str, int]]:
+        return cast(
+            dict[Uid, dict[str, int]], self._call("transfer_items", map_uid, moves)
+        )
+
+    def get_map_layout(self, map_uid: Uid) -> MapLayoutPacket:
+        return cast(MapLayoutPacket, self._call("get_map_layout", map_uid))
+
+    def get_map_info(self, map_uid: Uid) -> MapInfoPacket:
+        return cast(MapInfoPacket, self._call("get_map_info", map_uid))
+
+    def get_map_delta(
+        self, map_uid: Uid, since_revision: int, player_uid: Uid | None = None
+    ) -> MapDeltaPacket:
+        return cast(
+            MapDeltaPacket,
+            self._call("get_map_delta", map_uid, since_revision, player_uid),
+        )
+
+    def set_viewport(self, player_uid: Uid, dimensions: Vertex2f) -> None:
+        self._call("set_viewport", player_uid, dimensions)
+
+    def use_map_travel(self, entity_uid: Uid, map_uid: Uid, map_travel_uid: Uid) -> Uid:
+        return cast(
+            Uid, self._call("use_map_travel", entity_uid, map_uid, map_travel_uid)
+        )
+
+    def set_entity_direction(
+        self, map_uid: Uid, entity_uid: Uid, direction: Vertex2f
+    ) -> None:
+        self._call("set_entity_direction", map_uid, entity_uid, direction)
+
+    def stop_application(self) -> None:
+        self._call("stop_application")
+
+
+def main() -> None:
+    # Imported here so that the connection can be used without a display
+    from game_manager.tk.utils import initialize_tk_context
+
+    from hard_reset.graphic.graphic_manager import GraphicManager
+
+    parser = argparse.ArgumentParser(description="Connect to a Hard Reset server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    message_manager = NetworkMessageManager(args.host, args.port)
+    message_manager.connect()
+
+    window, renderer, mouse, keyboard = initialize_tk_context()
+    graphic_manager = GraphicManager(window, renderer, keyboard, mouse)
+    message_manager.attach_graphic_manager(graphic_manager)
+
+    print("Starting graphic manager thread")
+    graphic_manager.start()
+
+
+if __name__ == "__main__":
+    main()
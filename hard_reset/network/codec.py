@@ -0,0 +1,368 @@
+import asyncio
+import struct
+from typing import Any, cast
+from uuid import UUID
+
+from vertyces.vertex import Vertex2f
+
+from hard_reset.messaging.messaging import (
+    EntityDoorInfoPacket,
+    EntityInfoPacket,
+    InventoryDeltaPacket,
+    MapDeltaPacket,
+    MapInfoPacket,
+    MapLayoutPacket,
+    PlayerInfoPacket,
+)
+
+# Requests reference methods by their index in this tuple, only append to it
+METHOD_NAMES = (
+    "connect_as_player",
+    "get_inventory",
+    "get_crafting_recipes",
+    "craft_item",
+    "move_inventory_items",
+    "get_map_layout",
+    "get_map_info",
+    "get_map_delta",
+    "use_map_travel",
+    "set_entity_direction",
+    "stop_application",
+    "set_viewport",
+    "transfer_items",
+    "get_inventory_changes",
+)
+METHOD_IDS = {method_name: idx for idx, method_name in enumerate(METHOD_NAMES)}
+
+# Frame kinds
+REQUEST = 0
+RESPONSE = 1
+ERROR = 2
+NOTIFICATION = 3
+
+# Body length, frame kind, request id
+FRAME_HEADER = struct.Struct("<IBI")
+# Longer bodies are refused before being read, a 2048x2048 map layout is 4 MiB
+MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+_UINT8 = struct.Struct("<B")
+_UINT32 = struct.Struct("<I")
+_INT64 = struct.Struct("<q")
+_FLOAT64 = struct.Struct("<d")
+_VERTEX2F = struct.Struct("<ff")
+_LAYOUT_DIMENSIONS = struct.Struct("<IIII")
+
+# Value tags
+_NONE = 0
+_TRUE = 1
+_FALSE = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_BYTES = 6
+_UID = 7
+_VERTEX = 8
+_LIST = 9
+_DICT = 10
+_ENTITY_INFO = 11
+_ENTITY_DOOR_INFO = 12
+_PLAYER_INFO = 13
+_MAP_LAYOUT = 14
+_MAP_INFO = 15
+_MAP_DELTA = 16
+_INVENTORY_DELTA = 17
+
+
+def encode_frame(kind: int, request_id: int, body: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(body), kind, request_id) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[int, int, memoryview]:
+    header = await reader.readexactly(FRAME_HEADER.size)
+    body_length, kind, request_id = FRAME_HEADER.unpack(header)
+    if body_length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {body_length} bytes exceeds {MAX_FRAME_SIZE}")
+    body = await reader.readexactly(body_length)
+    return kind, request_id, memoryview(body)
+
+
+def encode_request(method_name: str, args: tuple[object, ...]) -> bytes:
+    buffer = bytearray(_UINT8.pack(METHOD_IDS[method_name]))
+    _write_value(buffer, list(args))
+    return bytes(buffer)
+
+
+def decode_request(body: memoryview) -> tuple[str, list[object]]:
+    reader = _Reader(body)
+    method_name = METHOD_NAMES[reader.read_byte()]
+    args = reader.read_value()
+    assert isinstance(args, list)
+    return method_name, args
+
+
+def encode_value(value: object) -> bytes:
+    buffer = bytearray()
+    _write_value(buffer, value)
+    return bytes(buffer)
+
+
+def decode_value(body: memoryview) -> object:
+    return _Reader(body).read_value()
+
+
+def _write_str(buffer: bytearray, value: str) -> None:
+    encoded = value.encode()
+    buffer += _UINT32.pack(len(encoded))
+    buffer += encoded
+
+
+def _write_vertex(buffer: bytearray, value: Vertex2f) -> None:
+    buffer += _VERTEX2F.pack(value.x, value.y)
+
+
+def _write_entity_info(buffer: bytearray, value: EntityInfoPacket) -> None:
+    _write_str(buffer, value.type_name)
+    buffer += value.uid.bytes
+    _write_vertex(buffer, value.position)
+
+
+def _write_entities(buffer: bytearray, entities: dict[UUID, EntityInfoPacket]) -> None:
+    # Entity uids are already part of each packet, keys are not repeated
+    buffer += _UINT32.pack(len(entities))
+    for entity_info in entities.values():
+        _write_value(buffer, entity_info)
+
+
+def _write_uids(buffer: bytearray, uids: list[UUID]) -> None:
+    buffer += _UINT32.pack(len(uids))
+    for uid in uids:
+        buffer += uid.bytes
+
+
+def _write_value(buffer: bytearray, value: object) -> None:
+    if value is None:
+        buffer.append(_NONE)
+    elif isinstance(value, bool):
+        buffer.append(_TRUE if value else _FALSE)
+    elif isinstance(value, int):
+        buffer.append(_INT)
+        buffer += _INT64.pack(value)
+    elif isinstance(value, float):
+        buffer.append(_FLOAT)
+        buffer += _FLOAT64.pack(value)
+    elif isinstance(value, str):
+        buffer.append(_STR)
+        _write_str(buffer, value)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        buffer.append(_BYTES)
+        buffer += _UINT32.pack(memoryview(value).nbytes)
+        buffer += value
+    elif isinstance(value, UUID):
+        buffer.append(_UID)
+        buffer += value.bytes
+    elif isinstance(value, Vertex2f):
+        buffer.append(_VERTEX)
+        _write_vertex(buffer, value)
+    elif isinstance(value, EntityDoorInfoPacket):
+        buffer.append(_ENTITY_DOOR_INFO)
+        _write_entity_info(buffer, value)
+        _write_vertex(buffer, value.dimensions)
+        buffer += value.map_travel_uid.bytes
+    elif isinstance(value, PlayerInfoPacket):
+        buffer.append(_PLAYER_INFO)
+        _write_entity_info(buffer, value)
+        buffer += value.current_map_uid.bytes
+    elif isinstance(value, EntityInfoPacket):
+        buffer.append(_ENTITY_INFO)
+        _write_entity_info(buffer, value)
+    elif isinstance(value, MapLayoutPacket):
+        buffer.append(_MAP_LAYOUT)
+        buffer += value.map_uid.bytes
+        _write_str(buffer, value.layout_hash)
+        buffer += _LAYOUT_DIMENSIONS.pack(
+            value.width_in_tiles, value.height_in_tiles, value.width, value.height
+        )
+        buffer += _UINT32.pack(len(value.walkability))
+        buffer += value.walkability
+    elif isinstance(value, MapInfoPacket):
+        buffer.append(_MAP_INFO)
+        buffer += value.map_uid.bytes
+        _write_str(buffer, value.layout_hash)
+        buffer += _INT64.pack(value.revision)
+        _write_entities(buffer, value.entities)
+    elif isinstance(value, MapDeltaPacket):
+        buffer.append(_MAP_DELTA)
+        buffer += value.map_uid.bytes
+        _write_str(buffer, value.layout_hash)
+        buffer += _INT64.pack(value.revision)
+        buffer.append(value.full)
+        _write_entities(buffer, value.entities)
+        _write_uids(buffer, value.removed_entity_uids)
+        _write_uids(buffer, value.entered_entity_uids)
+        _write_uids(buffer, value.left_entity_uids)
+    elif isinstance(value, InventoryDeltaPacket):
+        buffer.append(_INVENTORY_DELTA)
+        buffer += value.entity_uid.bytes
+        buffer += _INT64.pack(value.version)
+        _write_value(buffer, value.items)
+    elif isinstance(value, (list, tuple)):
+        buffer.append(_LIST)
+        buffer += _UINT32.pack(len(value))
+        for item in value:
+            _write_value(buffer, item)
+    elif isinstance(value, dict):
+        buffer.append(_DICT)
+        buffer += _UINT32.pack(len(value))
+        for key, item in value.items():
+            _write_value(buffer, key)
+            _write_value(buffer, item)
+    else:
+        raise ValueError(f"Value of type {type(value)} is not encodable")
+
+
+class _Reader:
+    _data: memoryview
+    _offset: int
+
+    def __init__(self, data: memoryview) -> None:
+        self._data = data
+        self._offset = 0
+
+    def read_byte(self) -> int:
+        value = self._data[self._offset]
+        self._offset += 1
+        return value
+
+    def read_bytes(self, length: int) -> memoryview:
+        value = self._data[self._offset : self._offset + length]
+        self._offset += length
+        return value
+
+    def read_struct(self, struct_format: struct.Struct) -> tuple[Any, ...]:
+        value = struct_format.unpack_from(self._data, self._offset)
+        self._offset += struct_format.size
+        return value
+
+    def read_uint32(self) -> int:
+        (value,) = _UINT32.unpack_from(self._data, self._offset)
+        self._offset += _UINT32.size
+        return int(value)
+
+    def read_int64(self) -> int:
+        (value,) = _INT64.unpack_from(self._data, self._offset)
+        self._offset += _INT64.size
+        return int(value)
+
+    def read_str(self) -> str:
+        return str(self.read_bytes(self.read_uint32()), "utf-8")
+
+    def read_uid(self) -> UUID:
+        return UUID(bytes=bytes(self.read_bytes(16)))
+
+    def read_vertex(self) -> Vertex2f:
+        x, y = _VERTEX2F.unpack_from(self._data, self._offset)
+        self._offset += _VERTEX2F.size
+        return Vertex2f(x, y)
+
+    def read_uids(self) -> list[UUID]:
+        return [self.read_uid() for _ in range(self.read_uint32())]
+
+    def read_entities(self) -> dict[UUID, EntityInfoPacket]:
+        entities = {}
+        for _ in range(self.read_uint32()):
+            entity_info = self.read_value()
+            assert isinstance(entity_info, EntityInfoPacket)
+            entities[entity_info.uid] = entity_info
+        return entities
+
+    def read_value(self) -> object:
+        tag = self.read_byte()
+        if tag == _NONE:
+            return None
+        elif tag == _TRUE:
+            return True
+        elif tag == _FALSE:
+            return False
+        elif tag == _INT:
+            return self.read_int64()
+        elif tag == _FLOAT:
+            (value,) = self.read_struct(_FLOAT64)
+            return value
+        elif tag == _STR:
+            return self.read_str()
+        elif tag == _BYTES:
+            return self.read_bytes(self.read_uint32()).toreadonly()
+        elif tag == _UID:
+            return self.read_uid()
+        elif tag == _VERTEX:
+            return self.read_vertex()
+        elif tag == _ENTITY_INFO:
+            return EntityInfoPacket(
+                type_name=self.read_str(),
+                uid=self.read_uid(),
+                position=self.read_vertex(),
+            )
+        elif tag == _ENTITY_DOOR_INFO:
+            return EntityDoorInfoPacket(
+                type_name=self.read_str(),
+                uid=self.read_uid(),
+                position=self.read_vertex(),
+                dimensions=self.read_vertex(),
+                map_travel_uid=self.read_uid(),
+            )
+        elif tag == _PLAYER_INFO:
+            return PlayerInfoPacket(
+                type_name=self.read_str(),
+                uid=self.read_uid(),
+                position=self.read_vertex(),
+                current_map_uid=self.read_uid(),
+            )
+        elif tag == _MAP_LAYOUT:
+            map_uid = self.read_uid()
+            layout_hash = self.read_str()
+            width_in_tiles, height_in_tiles, width, height = self.read_struct(
+                _LAYOUT_DIMENSIONS
+            )
+            return MapLayoutPacket(
+                map_uid=map_uid,
+                layout_hash=layout_hash,
+                width_in_tiles=width_in_tiles,
+                height_in_tiles=height_in_tiles,
+                width=width,
+                height=height,
+                walkability=self.read_bytes(self.read_uint32()).toreadonly(),
+            )
+        elif tag == _MAP_INFO:
+            return MapInfoPacket(
+                map_uid=self.read_uid(),
+                layout_hash=self.read_str(),
+                revision=self.read_int64(),
+                entities=self.read_entities(),
+            )
+        elif tag == _MAP_DELTA:
+            return MapDeltaPacket(
+                map_uid=self.read_uid(),
+                layout_hash=self.read_str(),
+                revision=self.read_int64(),
+                full=bool(self.read_byte()),
+                entities=self.read_entities(),
+                removed_entity_uids=self.read_uids(),
+                entered_entity_uids=self.read_uids(),
+                left_entity_uids=self.read_uids(),
+            )
+        elif tag == _INVENTORY_DELTA:
+            return InventoryDeltaPacket(
+                entity_uid=self.read_uid(),
+                version=self.read_int64(),
+                items=cast(dict[str, int], self.read_value()),
+            )
+        elif tag == _LIST:
+            return [self.read_value() for _ in range(self.read_uint32())]
+        elif tag == _DICT:
+            items = {}
+            for _ in range(self.read_uint32()):
+                key = self.read_value()
+                items[key] = self.read_value()
+            return items
+        else:
+            raise ValueError(f"Value with tag {tag} is not decodable")
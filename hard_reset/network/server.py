@@ -0,0 +1,198 @@
+import argparse
+import asyncio
+import itertools
+from typing import Callable, Iterator
+
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.messaging.messaging import (
+    LocalMessageManagerGraphic,
+    MessageManagerLogic,
+)
+from hard_reset.network.codec import (
+    ERROR,
+    NOTIFICATION,
+    REQUEST,
+    RESPONSE,
+    decode_request,
+    encode_frame,
+    encode_value,
+    read_frame,
+)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+# Requests read but not yet answered on a single connection, once reached the
+# server stops reading from that connection until responses are sent
+DEFAULT_MAX_PENDING_REQUESTS = 64
+
+PendingRequests = asyncio.Queue[tuple[int, memoryview] | None]
+
+
+class LogicServer(MessageManagerLogic):
+    logic_manager: LogicManager
+
+    _host: str
+    _port: int
+    _max_pending_requests: int
+
+    _loop: asyncio.AbstractEventLoop | None
+    _server: asyncio.Server | None
+    _stopped: asyncio.Event | None
+    _writers: set[asyncio.StreamWriter]
+    _connection_tasks: set[asyncio.Task[object]]
+    _connection_ids: Iterator[int]
+
+    def __init__(
+        self,
+        logic_manager: LogicManager,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_pending_requests: int = DEFAULT_MAX_PENDING_REQUESTS,
+    ) -> None:
+        self.logic_manager = logic_manager
+        self._host = host
+        self._port = port
+        self._max_pending_requests = max_pending_requests
+
+        self._loop = None
+        self._server = None
+        self._stopped = None
+        self._writers = set()
+        self._connection_tasks = set()
+        self._connection_ids = itertools.count()
+
+        logic_manager.message_manager = self
+        logic_manager.on_connect()
+
+    @property
+    def port(self) -> int:
+        if self._server is None:
+            return self._port
+        return int(self._server.sockets[0].getsockname()[1])
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._server = await asyncio.start_server(
+            self._handle_connection, self._host, self._port
+        )
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None and self._stopped is not None
+
+        await self._stopped.wait()
+        self._server.close()
+        await self._server.wait_closed()
+        await asyncio.gather(*self._connection_tasks)
+
+    def application_stopped(self) -> None:
+        # Called from the logic manager thread
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stop)
+
+    def _stop(self) -> None:
+        notification = encode_frame(
+            NOTIFICATION, 0, encode_value("application_stopped")
+        )
+        for writer in self._writers:
+            writer.write(notification)
+            writer.close()
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        connection_task = asyncio.current_task()
+        assert connection_task is not None
+        self._connection_tasks.add(connection_task)
+        self._writers.add(writer)
+        connection_id = next(self._connection_ids)
+        local_message_manager = LocalMessageManagerGraphic(
+            self.logic_manager, connection_id
+        )
+        pending_requests: PendingRequests = asyncio.Queue(self._max_pending_requests)
+        processing = asyncio.create_task(
+            self._process_requests(local_message_manager, pending_requests, writer)
+        )
+
+        try:
+            while True:
+                kind, request_id, body = await read_frame(reader)
+                if kind != REQUEST:
+                    raise ValueError(f"Unexpected frame kind {kind} from client")
+                # Blocks when the client pipelines faster than it is served
+                await pending_requests.put((request_id, body))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            await pending_requests.put(None)
+            await processing
+            await asyncio.wrap_future(
+                self.logic_manager.submit(
+                    self.logic_manager.on_connection_closed, connection_id
+                )
+            )
+            self._writers.discard(writer)
+            self._connection_tasks.discard(connection_task)
+            writer.close()
+
+    async def _process_requests(
+        self,
+        local_message_manager: LocalMessageManagerGraphic,
+        pending_requests: PendingRequests,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        while True:
+            request = await pending_requests.get()
+            if request is None:
+                return
+            request_id, body = request
+
+            try:
+                method_name, args = decode_request(body)
+                method: Callable[..., object] = getattr(
+                    local_message_manager, method_name
+                )
+                if method_name == "stop_application":
+                    # Stopping ends the logic thread, it is not asked to
+                    result = method(*args)
+                else:
+                    # Run by the logic thread, the event loop keeps serving the
+                    # other connections meanwhile
+                    result = await asyncio.wrap_future(
+                        self.logic_manager.submit(method, *args)
+                    )
+                frame = encode_frame(RESPONSE, request_id, encode_value(result))
+            except Exception as error:
+                frame = encode_frame(ERROR, request_id, encode_value(repr(error)))
+
+            if writer.is_closing():
+                continue
+            writer.write(frame)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                continue
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a Hard Reset logic server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    logic_manager = LogicManager()
+    server = LogicServer(logic_manager, args.host, args.port)
+
+    print("Starting logic manager thread")
+    logic_manager.start()
+
+    print(f"Serving on {args.host}:{args.port}")
+    asyncio.run(server.serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import argparse
+import tempfile
+import time
+from functools import partial
+from typing import cast
+
+from game_manager.logic.uid_object import Uid
+
+from hard_reset.headless import ScriptedPlayer
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.logic.map.generated_map import GeneratedMap, generated_map_uid
+from hard_reset.logic.map.map_registry import MapFactory
+from hard_reset.logic.sharding import ShardedMessageManagerGraphic
+from hard_reset.messaging.messaging import LocalMessageManagerGraphic
+
+
+def _simulate(
+    logic_manager: LogicManager, players_per_map: int, ticks_count: int, seed: int
+) -> tuple[int, float]:
+    # Runs inside a shard, every map of the shard gets busy with scripted players
+    message_manager = LocalMessageManagerGraphic(logic_manager)
+    map_uids = logic_manager.map_registry.map_uids
+    scripted_players = []
+    for map_uid in map_uids:
+        current_map = logic_manager.get_map(map_uid)
+        assert isinstance(current_map, GeneratedMap)
+        for idx in range(players_per_map):
+            player_info = message_manager.connect_as_player(None)
+            logic_manager.move_entity(
+                player_info.uid,
+                player_info.current_map_uid,
+                map_uid,
+                current_map.get_random_walkable_position(),
+            )
+            scripted_players.append(
+                ScriptedPlayer(message_manager, player_info.uid, map_uid, seed + idx)
+            )
+
+    start = time.perf_counter()
+    for _ in range(ticks_count):
+        for scripted_player in scripted_players:
+            scripted_player.step()
+        logic_manager.run_tick()
+    elapsed = time.perf_counter() - start
+
+    for scripted_player in scripted_players:
+        logic_manager.on_player_disconnect(scripted_player.player_uid)
+    return len(map_uids) * ticks_count, elapsed
+
+
+def run(
+    shards_counts: list[int],
+    maps_count: int,
+    players_per_map: int,
+    ticks_count: int,
+    map_size: int,
+    seed: int,
+    storage_path: str | None = None,
+) -> None:
+    # Saves go to a temporary directory unless a path is given
+    if storage_path is None:
+        with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as temporary_path:
+            return run(
+                shards_counts,
+                maps_count,
+                players_per_map,
+                ticks_count,
+                map_size,
+                seed,
+                temporary_path,
+            )
+
+    maps: dict[Uid, MapFactory] = {
+        generated_map_uid(seed + idx): partial(
+            GeneratedMap, map_size, map_size, seed + idx
+        )
+        for idx in range(maps_count)
+    }
+    map_uids = list(maps)
+
+    print(
+        f"Maps: {maps_count} of {map_size}x{map_size}, "
+        f"{players_per_map} players each"
+    )
+    base_rate = None
+    for shards_count in shards_counts:
+        # Maps are dealt to the shards in turn
+        shard_maps = [
+            {map_uid: maps[map_uid] for map_uid in map_uids[shard_index::shards_count]}
+            for shard_index in range(shards_count)
+        ]
+        message_manager = ShardedMessageManagerGraphic(
+            [shard for shard in shard_maps if shard],
+            storage_path=storage_path,
+        )
+        results = cast(
+            list[tuple[int, float]],
+            message_manager.run_job(_simulate, players_per_map, ticks_count, seed),
+        )
+        message_manager.stop_application()
+
+        map_ticks = sum(map_ticks for map_ticks, _ in results)
+        elapsed = max(elapsed for _, elapsed in results)
+        rate = map_ticks / elapsed
+        base_rate = rate if base_rate is None else base_rate
+        print(
+            f"Shards: {shards_count}, {rate:.1f} map ticks/s, "
+            f"speedup {rate / base_rate:.2f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare the logic throughput with maps spread over processes"
+    )
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--maps", type=int, default=8)
+    parser.add_argument("--players-per-map", type=int, default=25)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--map-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--storage-path",
+        default=None,
+        help="Directory of the saves, a temporary one by default",
+    )
+    args = parser.parse_args()
+
+    run(
+        args.shards,
+        args.maps,
+        args.players_per_map,
+        args.ticks,
+        args.map_size,
+        args.seed,
+        args.storage_path,
+    )
+
+
+if __name__ == "__main__":
+    main()
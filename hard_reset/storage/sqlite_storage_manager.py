@@ -0,0 +1,269 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, TypeVar, cast
+from uuid import UUID
+
+from game_manager.logic.uid_object import Uid
+from game_manager.storage.storage_manager import StorageManager
+
+# Single file holding every object, in the storage directory
+STORAGE_FILE_NAME = "storage.sqlite3"
+# Uids per query of a bulk retrieve, below the SQLite host parameter limit
+RETRIEVE_BATCH_SIZE = 500
+# Writers of other processes sharing the file are waited for this long
+BUSY_TIMEOUT_S = 5.0
+# Set once the saves of the file system storage manager, one JSON file per
+# object named by its uid, were imported from the storage directory
+LEGACY_IMPORT_KEY = "legacy_files_imported"
+
+T = TypeVar("T")
+
+ObjectKey = tuple[str, str]
+
+
+def _get_digest(data: str) -> bytes:
+    return hashlib.blake2b(data.encode(), digest_size=8).digest()
+
+
+class _TransactionState(threading.local):
+    # Rows written when the outermost transaction ends, None outside of one
+    pending_rows: dict[ObjectKey, str] | None
+    depth: int
+    # Set when a level of the transaction raised, its rows are then discarded
+    failed: bool
+
+    def __init__(self) -> None:
+        self.pending_rows = None
+        self.depth = 0
+        self.failed = False
+
+
+class SQLiteStorageManager(StorageManager, ABC):
+    # Objects are rows of one SQLite file, by type name and uid. Stores are only
+    # written when their data changed, and the stores of a transaction are
+    # written in one commit
+    _connection: sqlite3.Connection
+    # The logic and graphic threads may share a storage manager
+    _lock: threading.RLock
+    # Digest of the data last written or read for each object, forgotten when
+    # another connection (a shard process) writes to the file
+    _digests: dict[ObjectKey, bytes]
+    _data_version: int
+    # Each thread has its own transaction, the stores of the others are not
+    # part of it
+    _transaction: _TransactionState
+
+    def __init__(self, path: str) -> None:
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        # Transactions are begun explicitly, not by the sqlite3 module
+        self._connection = sqlite3.connect(
+            directory / STORAGE_FILE_NAME,
+            timeout=BUSY_TIMEOUT_S,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        # Readers of the other processes do not block the commits
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS objects ("
+            "type TEXT NOT NULL, uid TEXT NOT NULL, data TEXT NOT NULL, "
+            "PRIMARY KEY (type, uid)) WITHOUT ROWID"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._import_legacy_files(directory)
+        self._lock = threading.RLock()
+        self._digests = {}
+        self._data_version = self._get_data_version()
+        self._transaction = _TransactionState()
+
+    @abstractmethod
+    def _unparse_object(self, object_to_unparse: object) -> dict[object, object]: ...
+
+    @abstractmethod
+    def _parse_object(self, object_data: dict[object, object]) -> object: ...
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        # Stores within are written at the end in one commit, transactions nest.
+        # Nothing is written when any level raises
+        transaction = self._transaction
+        if transaction.depth == 0:
+            with self._lock:
+                # Checked once for all the stores of the transaction
+                self._check_data_version()
+            transaction.pending_rows = {}
+            transaction.failed = False
+        transaction.depth += 1
+        try:
+            yield
+        except BaseException:
+            transaction.failed = True
+            raise
+        finally:
+            transaction.depth -= 1
+            if transaction.depth == 0:
+                pending_rows = cast(dict[ObjectKey, str], transaction.pending_rows)
+                transaction.pending_rows = None
+                with self._lock:
+                    if transaction.failed:
+                        self._forget_digests(pending_rows)
+                    else:
+                        self._write_rows(pending_rows)
+
+    def store_object(self, object_to_store: object) -> None:
+        key = (
+            type(object_to_store).__name__,
+            str(object_to_store._uid),  # type: ignore[attr-defined]
+        )
+        data = json.dumps(self._unparse_object(object_to_store))
+        digest = _get_digest(data)
+        pending_rows = self._transaction.pending_rows
+        with self._lock:
+            if pending_rows is None:
+                self._check_data_version()
+            if self._digests.get(key) == digest:
+                return
+            self._digests[key] = digest
+            if pending_rows is not None:
+                pending_rows[key] = data
+            else:
+                self._write_rows({key: data})
+
+    def retrieve_object(self, object_type: type[T], uid: Uid) -> T | None:
+        key = (object_type.__name__, str(uid))
+        pending_rows = self._transaction.pending_rows
+        with self._lock:
+            data = pending_rows.get(key) if pending_rows else None
+            if data is None:
+                row = self._connection.execute(
+                    "SELECT data FROM objects WHERE type = ? AND uid = ?", key
+                ).fetchone()
+                if row is None:
+                    return None
+                data = row[0]
+                self._digests[key] = _get_digest(data)
+        return cast(T, self._parse_object(json.loads(data)))
+
+    def retrieve_objects(
+        self, object_type: type[T], uids: Iterable[Uid]
+    ) -> dict[Uid, T]:
+        # Stored objects among uids, in a few queries instead of one per object
+        type_name = object_type.__name__
+        uids_by_key = {str(uid): uid for uid in uids}
+        rows: list[tuple[str, str]] = []
+        pending_rows = self._transaction.pending_rows or {}
+        with self._lock:
+            uid_keys = []
+            for uid_key in uids_by_key:
+                data = pending_rows.get((type_name, uid_key))
+                if data is not None:
+                    rows.append((uid_key, data))
+                else:
+                    uid_keys.append(uid_key)
+
+            for start in range(0, len(uid_keys), RETRIEVE_BATCH_SIZE):
+                batch = uid_keys[start : start + RETRIEVE_BATCH_SIZE]
+                stored_rows = self._connection.execute(
+                    "SELECT uid, data FROM objects WHERE type = ? AND uid IN "
+                    f"({', '.join('?' * len(batch))})",
+                    (type_name, *batch),
+                ).fetchall()
+                for uid_key, data in stored_rows:
+                    self._digests[(type_name, uid_key)] = _get_digest(data)
+                rows.extend(stored_rows)
+        return {
+            uids_by_key[uid_key]: cast(T, self._parse_object(json.loads(data)))
+            for uid_key, data in rows
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _check_data_version(self) -> None:
+        # Digests may be stale once another connection wrote to the file
+        data_version = self._get_data_version()
+        if data_version != self._data_version:
+            self._digests.clear()
+            self._data_version = data_version
+
+    def _import_legacy_files(self, directory: Path) -> None:
+        # Files that are not objects of the previous storage are left alone.
+        # Rows already in the file are newer and kept
+        if self._is_legacy_import_done():
+            return
+        rows = []
+        for file_path in directory.rglob("*"):
+            if not file_path.is_file() or file_path.name.startswith(STORAGE_FILE_NAME):
+                continue
+            try:
+                uid = UUID(file_path.stem)
+                object_data = json.loads(file_path.read_text())
+            except (ValueError, OSError, UnicodeDecodeError):
+                continue
+            if isinstance(object_data, dict) and isinstance(
+                object_data.get("type"), str
+            ):
+                rows.append((object_data["type"], str(uid), json.dumps(object_data)))
+
+        connection = self._connection
+        # Other processes opening the same directory import it only once
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            if not self._is_legacy_import_done():
+                connection.executemany(
+                    "INSERT OR IGNORE INTO objects (type, uid, data) VALUES (?, ?, ?)",
+                    rows,
+                )
+                connection.execute(
+                    "INSERT INTO metadata (key, value) VALUES (?, ?)",
+                    (LEGACY_IMPORT_KEY, str(len(rows))),
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _is_legacy_import_done(self) -> bool:
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM metadata WHERE key = ?", (LEGACY_IMPORT_KEY,)
+            ).fetchone()
+            is not None
+        )
+
+    def _get_data_version(self) -> int:
+        # Only changes with the commits of other connections
+        return cast(int, self._connection.execute("PRAGMA data_version").fetchone()[0])
+
+    def _write_rows(self, rows: dict[ObjectKey, str]) -> None:
+        # One commit, so one sync of the file, whatever the number of rows
+        if not rows:
+            return
+        connection = self._connection
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                "INSERT OR REPLACE INTO objects (type, uid, data) VALUES (?, ?, ?)",
+                [(*key, data) for key, data in rows.items()],
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            self._forget_digests(rows)
+            raise
+
+    def _forget_digests(self, rows: dict[ObjectKey, str]) -> None:
+        # Unwritten objects must not be skipped as unchanged by later stores
+        for key in rows:
+            self._digests.pop(key, None)
@@ -0,0 +1,50 @@
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.logic.map.maps import BaseMap
+
+
+class RoomMap(BaseMap):
+    # Ground surrounded by the border walls
+    def __init__(self, width_in_tiles: int = 10, height_in_tiles: int = 10) -> None:
+        super().__init__(width_in_tiles, height_in_tiles)
+
+
+@pytest.fixture
+def logic_manager(tmp_path: Path) -> LogicManager:
+    # Saves go to a directory of the test, never to the working directory
+    return LogicManager(storage_path=str(tmp_path / "logic"))
+
+
+@contextmanager
+def run_logic_thread(logic_manager: LogicManager) -> Iterator[threading.Thread]:
+    # Stands for the thread of LogicManager.start, errors fail the test
+    stopped = threading.Event()
+    errors: list[Exception] = []
+
+    def run() -> None:
+        last_ns = time.perf_counter_ns()
+        try:
+            while not stopped.is_set():
+                now_ns = time.perf_counter_ns()
+                logic_manager.update(now_ns - last_ns)
+                last_ns = now_ns
+        except Exception as error:
+            errors.append(error)
+
+    logic_manager._threaded = True
+    thread = threading.Thread(target=run)
+    thread.start()
+    try:
+        yield thread
+    finally:
+        stopped.set()
+        thread.join()
+        logic_manager._threaded = False
+    assert not errors, errors
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import pytest
+from conftest import RoomMap
+from game_manager.logic.uid_object import Uid
+
+from hard_reset.logic.activity import ActivityScheduler
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.logic.map.maps import BaseMap
+
+
+def test_dormant_maps_catch_up_when_woken() -> None:
+    active_map, dormant_map = RoomMap(4, 4), RoomMap(4, 4)
+    maps: dict[Uid, BaseMap] = {
+        active_map.uid: active_map,
+        dormant_map.uid: dormant_map,
+    }
+    scheduler = ActivityScheduler()
+    for current_map in maps.values():
+        scheduler.track(current_map.uid)
+
+    for _ in range(3):
+        due_maps = scheduler.get_due_maps(maps, [active_map.uid], 0.5)
+        assert due_maps == [(active_map, 0.5)]
+
+    assert scheduler.wake(dormant_map.uid) == 1.5
+    assert scheduler.get_due_maps(maps, maps, 0.5) == [
+        (active_map, 0.5),
+        (dormant_map, 0.5),
+    ]
+
+
+def test_dormant_maps_are_ticked_at_the_interval() -> None:
+    active_map, dormant_map = RoomMap(4, 4), RoomMap(4, 4)
+    maps: dict[Uid, BaseMap] = {
+        active_map.uid: active_map,
+        dormant_map.uid: dormant_map,
+    }
+    scheduler = ActivityScheduler(dormant_tick_interval=4)
+    for current_map in maps.values():
+        scheduler.track(current_map.uid)
+
+    due_maps = [scheduler.get_due_maps(maps, [active_map.uid], 0.25) for _ in range(4)]
+
+    assert [len(tick_maps) for tick_maps in due_maps] == [1, 1, 1, 2]
+    assert due_maps[-1] == [(active_map, 0.25), (dormant_map, 1.0)]
+
+
+class _RecordingMap(RoomMap):
+    delta_times: list[float]
+
+    def __init__(self) -> None:
+        super().__init__(4, 4)
+        self.delta_times = []
+
+    def update(self, delta_time: float) -> None:
+        self.delta_times.append(delta_time)
+        super().update(delta_time)
+
+
+def test_woken_maps_catch_up_in_bounded_ticks(tmp_path: Path) -> None:
+    logic_manager = LogicManager(
+        maps={}, storage_path=str(tmp_path), tick_rate=10, max_catch_up_ticks=3
+    )
+    short_map, long_map = _RecordingMap(), _RecordingMap()
+    logic_manager.add_map(short_map)
+    logic_manager.add_map(long_map)
+
+    logic_manager.activity.get_due_maps({}, [], 0.25)
+    logic_manager._wake_map(short_map)
+    logic_manager.activity.get_due_maps({}, [], 10.0)
+    logic_manager._wake_map(long_map)
+
+    assert short_map.delta_times == pytest.approx([0.1, 0.1, 0.05])
+    assert long_map.delta_times == pytest.approx([0.1, 0.1, 0.1])
+
+
+def test_holds_are_counted() -> None:
+    current_map = RoomMap(4, 4)
+    scheduler = ActivityScheduler()
+    scheduler.hold(current_map.uid)
+    scheduler.hold(current_map.uid)
+
+    scheduler.release(current_map.uid)
+    assert scheduler.is_held(current_map.uid)
+    assert scheduler.held_map_uids == [current_map.uid]
+
+    scheduler.release(current_map.uid)
+    assert not scheduler.is_held(current_map.uid)
+    assert scheduler.held_map_uids == []
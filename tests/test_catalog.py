@@ -0,0 +1,95 @@
+import json
+from typing import Any
+
+import pytest
+
+from hard_reset.logic.item.catalog import CatalogError, ItemCatalog
+
+
+def _make_catalog_data(recipes: list[dict[str, Any]] | None = None) -> bytes:
+    return json.dumps(
+        {
+            "items": [{"name": "Log"}, {"name": "Plank"}, {"name": "Table"}],
+            "recipes": (
+                [
+                    {
+                        "result": {"item": "Plank", "quantity": 4},
+                        "ingredients": [{"item": "Log", "quantity": 1}],
+                    },
+                    {
+                        "result": {"item": "Table", "quantity": 1},
+                        "ingredients": [{"item": "Plank", "quantity": 6}],
+                    },
+                ]
+                if recipes is None
+                else recipes
+            ),
+        }
+    ).encode()
+
+
+def test_lookups() -> None:
+    catalog = ItemCatalog(_make_catalog_data())
+    plank = catalog.get_item("Plank")
+
+    assert catalog.find_item("Chair") is None
+    assert catalog.get_recipe("Table")._ingredients[0].item is plank
+    assert catalog.get_recipes_using(plank) == (catalog.get_recipe("Table"),)
+    assert catalog.get_recipes_using(catalog.get_item("Table")) == ()
+
+
+def test_content_hash_identifies_the_data() -> None:
+    assert ItemCatalog(_make_catalog_data()).content_hash == (
+        ItemCatalog(_make_catalog_data()).content_hash
+    )
+    assert ItemCatalog(_make_catalog_data()).content_hash != (
+        ItemCatalog(_make_catalog_data([])).content_hash
+    )
+
+
+def test_recipe_requirements_are_read_only() -> None:
+    catalog = ItemCatalog(_make_catalog_data())
+
+    with pytest.raises(TypeError):
+        catalog.recipe_requirements["Table"]["Plank"] = 1  # type: ignore[index]
+    with pytest.raises(TypeError):
+        catalog.recipe_requirements["Chair"] = {}  # type: ignore[index]
+
+
+def test_recipe_requirements_packet_is_built_once_per_content() -> None:
+    catalog = ItemCatalog(_make_catalog_data())
+
+    packet = catalog.get_recipe_requirements_packet()
+    assert packet == {"Plank": {"Log": 1}, "Table": {"Plank": 6}}
+    assert type(packet["Table"]) is dict
+    assert ItemCatalog(_make_catalog_data()).get_recipe_requirements_packet() is packet
+    assert ItemCatalog(_make_catalog_data([])).get_recipe_requirements_packet() == {}
+
+
+@pytest.mark.parametrize(
+    "ingredient, message",
+    [
+        ({"item": "Chair", "quantity": 1}, "Unknown item Chair"),
+        ({"item": "Log", "quantity": 0}, "Invalid quantity 0 of Log"),
+        ({"item": "Log", "quantity": "2"}, "Invalid quantity '2' of Log"),
+    ],
+)
+def test_invalid_ingredients_are_rejected(
+    ingredient: dict[str, Any], message: str
+) -> None:
+    recipe = {"result": {"item": "Table", "quantity": 1}, "ingredients": [ingredient]}
+    with pytest.raises(CatalogError, match=message):
+        ItemCatalog(_make_catalog_data([recipe]))
+
+
+def test_malformed_catalogs_are_rejected() -> None:
+    recipe = {
+        "result": {"item": "Plank", "quantity": 1},
+        "ingredients": [{"item": "Log", "quantity": 1}],
+    }
+    with pytest.raises(CatalogError, match="Several recipes craft Plank"):
+        ItemCatalog(_make_catalog_data([recipe, recipe]))
+    with pytest.raises(CatalogError, match="Malformed catalog"):
+        ItemCatalog(b'{"items": []}')
+    with pytest.raises(CatalogError, match="Item names must be unique"):
+        ItemCatalog(b'{"items": [{"name": "Log"}, {"name": "Log"}], "recipes": []}')
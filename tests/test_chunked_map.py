@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import pytest
+from game_manager.logic.map.tile import TILE_SIZE
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Player
+from hard_reset.logic.logic_storage_manager import LogicStorageManager
+from hard_reset.logic.map.chunked_map import CHUNK_SIZE
+from hard_reset.logic.map.generated_map import GeneratedChunkedMap
+from hard_reset.logic.map.tiles import GROUND_TILE, WALL_TILE, get_tile_id
+
+# Not a multiple of the chunk size, the last chunks stick out of the map
+MAP_SIZE = 3 * CHUNK_SIZE + 5
+
+
+def _make_map(storage_path: Path | None = None) -> GeneratedChunkedMap:
+    current_map = GeneratedChunkedMap(MAP_SIZE, MAP_SIZE, seed=7, chests_per_chunk=2)
+    if storage_path is not None:
+        current_map.set_storage_manager(LogicStorageManager(str(storage_path)))
+    return current_map
+
+
+def test_grids_match_the_chunk_tiles() -> None:
+    current_map = _make_map()
+    tile_id_grid = current_map.tile_id_grid
+    walkability_grid = current_map.walkability_grid
+
+    assert len(tile_id_grid) == len(walkability_grid) == MAP_SIZE * MAP_SIZE
+    for y in range(MAP_SIZE):
+        for x in range(MAP_SIZE):
+            index = y * MAP_SIZE + x
+            assert tile_id_grid[index] == get_tile_id(current_map.get_tile(x, y))
+            assert walkability_grid[index] == current_map.is_walkable(x, y)
+
+
+def test_grids_follow_set_tile() -> None:
+    current_map = _make_map()
+    walkability_revision = current_map.walkability_revision
+    walkability_grid = current_map.walkability_grid
+    layout_hash = current_map.layout_hash
+
+    current_map.set_tile(CHUNK_SIZE + 3, 2 * CHUNK_SIZE + 4, GROUND_TILE)
+    current_map.set_tile(CHUNK_SIZE + 3, 2 * CHUNK_SIZE + 4, WALL_TILE)
+
+    assert not walkability_grid[(2 * CHUNK_SIZE + 4) * MAP_SIZE + CHUNK_SIZE + 3]
+    assert current_map.walkability_revision > walkability_revision
+    assert current_map.layout_hash != layout_hash
+
+
+def test_layout_hash_is_derived_from_the_tiles() -> None:
+    assert _make_map().layout_hash == _make_map().layout_hash
+
+    current_map = _make_map()
+    layout_hash = current_map.layout_hash
+    current_map.set_tile(5, 5, WALL_TILE)
+    current_map.set_tile(5, 5, GROUND_TILE)
+    assert current_map.layout_hash == layout_hash
+
+
+def test_layout_hash_is_stable_across_reloads(tmp_path: Path) -> None:
+    current_map = _make_map(tmp_path)
+    current_map.set_tile(2 * CHUNK_SIZE + 1, 2 * CHUNK_SIZE + 1, WALL_TILE)
+    layout_hash = current_map.layout_hash
+    current_map.unload_chunks()
+
+    reloaded_map = _make_map(tmp_path)
+    assert reloaded_map.layout_hash == layout_hash
+    assert not reloaded_map.is_walkable(2 * CHUNK_SIZE + 1, 2 * CHUNK_SIZE + 1)
+
+
+def test_pathfinding_crosses_chunks() -> None:
+    current_map = GeneratedChunkedMap(MAP_SIZE, MAP_SIZE, seed=7, wall_density=0)
+    path = current_map.pathfinder.find_path((1, 1), (MAP_SIZE - 2, MAP_SIZE - 2))
+
+    assert path is not None
+    assert path[-1] == (MAP_SIZE - 2, MAP_SIZE - 2)
+    assert current_map.loaded_chunk_positions == []
+
+
+def test_vectorized_movement_loads_chunks_around_players() -> None:
+    pytest.importorskip("numpy")
+    current_map = GeneratedChunkedMap(MAP_SIZE, MAP_SIZE, seed=7, wall_density=0)
+    current_map.enable_vectorized_movement()
+    player = Player(Vertex2f(TILE_SIZE, TILE_SIZE))
+    current_map.add_entity(player)
+    player.direction = Vertex2f(1, 0)
+    player.speed = CHUNK_SIZE * TILE_SIZE
+
+    current_map.update(2.5)
+
+    assert player.bounds.position.x > 2 * CHUNK_SIZE * TILE_SIZE
+    assert sorted(current_map.loaded_chunk_positions) == [
+        (chunk_x, chunk_y) for chunk_x in range(1, 4) for chunk_y in range(0, 2)
+    ]
+
+
+def test_tiles_outside_of_the_map_do_not_load_chunks() -> None:
+    current_map = _make_map()
+    loaded_chunk_positions = current_map.loaded_chunk_positions
+
+    assert not current_map.is_walkable(MAP_SIZE, 0)
+    for x, y in [(-1, 0), (0, MAP_SIZE), (4 * CHUNK_SIZE, 0)]:
+        with pytest.raises(IndexError):
+            current_map.get_tile(x, y)
+        with pytest.raises(IndexError):
+            current_map.set_tile(x, y, WALL_TILE)
+
+    assert current_map.loaded_chunk_positions == loaded_chunk_positions
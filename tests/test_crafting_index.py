@@ -0,0 +1,55 @@
+import random
+
+from hard_reset.logic.item.crafting_index import CraftabilityTracker, RecipeIndex
+
+ITEM_NAMES = ["Log", "Plank", "Stick", "Stone", "Rope"]
+
+
+def _random_requirements(generator: random.Random) -> dict[str, dict[str, int]]:
+    return {
+        f"Recipe {idx}": {
+            item_name: generator.randrange(1, 5)
+            for item_name in generator.sample(ITEM_NAMES, generator.randrange(1, 4))
+        }
+        for idx in range(12)
+    }
+
+
+def _is_craftable(ingredients: dict[str, int], inventory: dict[str, int]) -> bool:
+    return all(
+        inventory.get(item_name, 0) >= quantity
+        for item_name, quantity in ingredients.items()
+    )
+
+
+def test_craftable_recipes_match_brute_force() -> None:
+    generator = random.Random(13)
+    requirements = _random_requirements(generator)
+    tracker = CraftabilityTracker(RecipeIndex(requirements))
+    craftable_names: set[str] = set()
+
+    for _ in range(500):
+        inventory = {
+            item_name: generator.randrange(6)
+            for item_name in generator.sample(ITEM_NAMES, generator.randrange(6))
+        }
+        became_craftable, became_uncraftable = tracker.update(inventory)
+
+        expected_names = {
+            recipe_name
+            for recipe_name, ingredients in requirements.items()
+            if _is_craftable(ingredients, inventory)
+        }
+        assert set(tracker.craftable_recipe_names) == expected_names
+        assert set(became_craftable) == expected_names - craftable_names
+        assert set(became_uncraftable) == craftable_names - expected_names
+        craftable_names = expected_names
+
+
+def test_unchanged_quantities_report_nothing() -> None:
+    tracker = CraftabilityTracker(RecipeIndex({"Plank": {"Log": 2}}))
+
+    assert tracker.update({"Log": 3}) == (["Plank"], [])
+    assert tracker.update({"Log": 2}) == ([], [])
+    assert tracker.set_quantities([("Log", 1), ("Log", 2)]) == ([], [])
+    assert tracker.update({}) == ([], ["Plank"])
@@ -0,0 +1,85 @@
+import random
+
+from hard_reset.logic.entities import Inventory
+from hard_reset.logic.item.catalog import CATALOG
+from hard_reset.logic.item.crafting_planner import apply_crafting_plan, plan_crafts
+from hard_reset.logic.item.crafting_recipe import SimpleCraftingRecipe
+
+
+def _craft_once(
+    stock: dict[str, int],
+    recipe: SimpleCraftingRecipe,
+    recursive: bool,
+    crafting: frozenset[str],
+) -> bool:
+    # One craft at a time, missing ingredients are crafted one batch at a time
+    crafting = crafting | {recipe._result.item.name}
+    for ingredient in recipe._ingredients:
+        item_name = ingredient.item.name
+        while stock.get(item_name, 0) < ingredient.quantity:
+            ingredient_recipe = CATALOG.find_recipe(item_name)
+            if not recursive or ingredient_recipe is None or item_name in crafting:
+                return False
+            if not _craft_once(stock, ingredient_recipe, recursive, crafting):
+                return False
+        stock[item_name] -= ingredient.quantity
+    result_name = recipe._result.item.name
+    stock[result_name] = stock.get(result_name, 0) + recipe._result.quantity
+    return True
+
+
+def _craft_greedily(
+    items: dict[str, int], recipe: SimpleCraftingRecipe, quantity: int, recursive: bool
+) -> tuple[int, dict[str, int]]:
+    stock = dict(items)
+    for crafted_quantity in range(quantity):
+        next_stock = dict(stock)
+        if not _craft_once(next_stock, recipe, recursive, frozenset()):
+            break
+        stock = next_stock
+    else:
+        crafted_quantity = quantity
+    return crafted_quantity, {
+        item_name: item_quantity
+        for item_name, item_quantity in stock.items()
+        if item_quantity
+    }
+
+
+def test_plans_match_crafting_one_at_a_time() -> None:
+    generator = random.Random(11)
+    for _ in range(300):
+        items = {
+            "Wooden Plank": generator.randrange(12),
+            "Wooden Stick": generator.randrange(14),
+        }
+        inventory = Inventory()
+        inventory.set_items(items)
+        recipe = CATALOG.get_recipe(
+            generator.choice(["Crafting Bench", "Wooden Stick"])
+        )
+        quantity = generator.randrange(1, 8)
+        recursive = generator.random() < 0.5
+
+        plan = plan_crafts(inventory, recipe, quantity, recursive)
+        apply_crafting_plan(inventory, plan)
+
+        assert (plan.quantity, inventory.get_items()) == _craft_greedily(
+            items, recipe, quantity, recursive
+        )
+
+
+def test_ingredients_are_crafted_before_their_users() -> None:
+    inventory = Inventory()
+    inventory.add_item(CATALOG.get_item("Wooden Plank"), 4)
+    recipe = CATALOG.get_recipe("Crafting Bench")
+
+    assert plan_crafts(inventory, recipe, 2).quantity == 0
+    plan = plan_crafts(inventory, recipe, 2, recursive=True)
+
+    assert plan.quantity == 2
+    assert list(plan.crafts.items()) == [("Wooden Stick", 2), ("Crafting Bench", 2)]
+    assert plan.item_deltas == {
+        CATALOG.get_item("Wooden Plank").id: -4,
+        CATALOG.get_item("Crafting Bench").id: 2,
+    }
@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import pytest
+
+from hard_reset.headless import run
+
+
+def test_run_reports_ticks_without_writing_to_working_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    p99_tick_ms = run(
+        players_count=4,
+        maps_count=2,
+        ticks_count=20,
+        map_size=16,
+        chests_per_map=2,
+        seed=0,
+    )
+
+    assert p99_tick_ms > 0
+    assert "Movement: scalar" in capsys.readouterr().out
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_run_stores_in_given_path(tmp_path: Path) -> None:
+    run(4, 1, 5, 16, 2, 0, storage_path=str(tmp_path / "saves"))
+
+    assert (tmp_path / "saves").is_dir()
@@ -0,0 +1,71 @@
+from conftest import RoomMap
+from game_manager.logic.map.tile import TILE_SIZE
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Chest, Player
+from hard_reset.logic.interest import INTEREST_MARGIN, InterestArea
+
+VIEWPORT = Vertex2f(4 * TILE_SIZE, 4 * TILE_SIZE)
+
+
+def _move(player: Player, x: float, y: float) -> None:
+    player.bounds = player.bounds.at_position(Vertex2f(x, y))
+
+
+def test_only_entities_in_the_area_are_sent() -> None:
+    current_map = RoomMap(40, 40)
+    near_chest = Chest(Vertex2f(11 * TILE_SIZE, 10 * TILE_SIZE))
+    far_chest = Chest(Vertex2f(30 * TILE_SIZE, 30 * TILE_SIZE))
+    current_map.add_entity(near_chest)
+    current_map.add_entity(far_chest)
+    center = Vertex2f(10 * TILE_SIZE, 10 * TILE_SIZE)
+    interest_area = InterestArea(VIEWPORT)
+
+    changes = interest_area.get_changes_since(current_map, center, -1)
+
+    assert changes.entered_entity_uids == [near_chest.uid]
+    assert changes.changed_entities == [near_chest]
+    assert changes.left_entity_uids == []
+
+
+def test_entities_enter_change_and_leave() -> None:
+    current_map = RoomMap(40, 40)
+    other_player = Player(Vertex2f(30 * TILE_SIZE, 10 * TILE_SIZE))
+    current_map.add_entity(other_player)
+    center = Vertex2f(10 * TILE_SIZE, 10 * TILE_SIZE)
+    interest_area = InterestArea(VIEWPORT)
+    revision = interest_area.get_changes_since(current_map, center, -1).revision
+
+    # Within the margin around the viewport
+    _move(
+        other_player,
+        10 * TILE_SIZE + VIEWPORT.x / 2 + INTEREST_MARGIN - 1,
+        10 * TILE_SIZE,
+    )
+    changes = interest_area.get_changes_since(current_map, center, revision)
+    assert changes.entered_entity_uids == [other_player.uid]
+    assert changes.changed_entities == [other_player]
+
+    _move(other_player, 11 * TILE_SIZE, 10 * TILE_SIZE)
+    changes = interest_area.get_changes_since(current_map, center, changes.revision)
+    assert changes.entered_entity_uids == []
+    assert changes.changed_entities == [other_player]
+
+    _move(other_player, 30 * TILE_SIZE, 10 * TILE_SIZE)
+    changes = interest_area.get_changes_since(current_map, center, changes.revision)
+    assert changes.changed_entities == []
+    assert changes.left_entity_uids == [other_player.uid]
+
+
+def test_changing_map_sends_the_new_map_area() -> None:
+    first_map, second_map = RoomMap(40, 40), RoomMap(40, 40)
+    chest = Chest(Vertex2f(10 * TILE_SIZE, 10 * TILE_SIZE))
+    second_map.add_entity(chest)
+    center = Vertex2f(10 * TILE_SIZE, 10 * TILE_SIZE)
+    interest_area = InterestArea(VIEWPORT)
+    revision = interest_area.get_changes_since(first_map, center, -1).revision
+
+    changes = interest_area.get_changes_since(second_map, center, revision)
+
+    assert changes.entered_entity_uids == [chest.uid]
+    assert interest_area.map_uid == second_map.uid
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from hard_reset.logic.entities import Inventory, InventoryChange, InventoryError
+from hard_reset.logic.item.catalog import CATALOG
+
+
+def test_quantities_match_a_dict() -> None:
+    generator = random.Random(17)
+    items = list(CATALOG.items)
+    inventory = Inventory()
+    expected: dict[str, int] = {}
+
+    for _ in range(500):
+        item = generator.choice(items)
+        quantity = generator.randrange(4)
+        if generator.random() < 0.5:
+            inventory.add_item(item, quantity)
+            expected[item.name] = expected.get(item.name, 0) + quantity
+        elif quantity <= expected.get(item.name, 0):
+            inventory.remove_item(item, quantity)
+            expected[item.name] = expected.get(item.name, 0) - quantity
+        expected = {
+            item_name: quantity for item_name, quantity in expected.items() if quantity
+        }
+
+        assert inventory.get_items() == expected
+        assert inventory.get_quantity(item) == expected.get(item.name, 0)
+        # Trimmed after the last held item
+        assert not inventory._counts or inventory._counts[-1] != 0
+
+
+def test_changes_bump_the_version_and_notify_listeners() -> None:
+    inventory = Inventory()
+    changes: list[InventoryChange] = []
+    inventory.add_listener(changes.append)
+    plank = CATALOG.get_item("Wooden Plank")
+
+    inventory.add_item(plank, 3)
+    inventory.add_item(plank, 0)
+    inventory.set_items({"Wooden Plank": 3, "Bottle": 1})
+    inventory.set_items({"Bottle": 2})
+
+    assert inventory.version == 4
+    assert changes == [
+        ("Wooden Plank", 0, 3),
+        ("Bottle", 0, 1),
+        ("Wooden Plank", 3, 0),
+        ("Bottle", 1, 2),
+    ]
+    inventory.remove_listener(changes.append)
+    inventory.remove_item(CATALOG.get_item("Bottle"), 2)
+    assert len(changes) == 4
+    assert inventory._listeners is None
+
+
+def test_removing_more_than_held_fails() -> None:
+    inventory = Inventory()
+    key = CATALOG.get_item("Key")
+    inventory.add_item(key, 1)
+
+    with pytest.raises(InventoryError):
+        inventory.remove_item(key, 2)
+    assert inventory.get_quantity(key) == 1
+    assert inventory.version == 1
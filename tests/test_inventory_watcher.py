@@ -0,0 +1,86 @@
+from game_manager.logic.uid_object import Uid
+
+from hard_reset.logic.entities import InventoryChange
+from hard_reset.logic.item.catalog import CATALOG
+from hard_reset.logic.item.crafting_index import CraftabilityTracker, RecipeIndex
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.messaging.inventory_watcher import InventoryWatcher
+from hard_reset.messaging.messaging import (
+    InventoryDeltaPacket,
+    LocalMessageManagerGraphic,
+)
+
+
+class _CountingMessageManager(LocalMessageManagerGraphic):
+    requests_count: int = 0
+
+    def get_inventory_changes(
+        self, map_uid: Uid, known_versions: dict[Uid, int]
+    ) -> list[InventoryDeltaPacket]:
+        self.requests_count += 1
+        return super().get_inventory_changes(map_uid, known_versions)
+
+
+def test_callbacks_get_the_changes_since_the_last_poll(
+    logic_manager: LogicManager,
+) -> None:
+    message_manager = _CountingMessageManager(logic_manager)
+    player, map_uid = logic_manager.on_player_connect(None)
+    watcher = InventoryWatcher(message_manager)
+    received_changes: list[list[InventoryChange]] = []
+
+    watcher.watch(map_uid, player.uid, received_changes.append)
+    assert received_changes == [[("Wooden Plank", 0, 5)]]
+
+    watcher.poll()
+    assert len(received_changes) == 1
+
+    wooden_plank = CATALOG.get_item("Wooden Plank")
+    player._inventory.remove_item(wooden_plank, 5)
+    player._inventory.add_item(CATALOG.items[0], 2)
+    watcher.poll()
+    assert received_changes[1] == [
+        (CATALOG.items[0].name, 0, 2),
+        ("Wooden Plank", 5, 0),
+    ]
+
+
+def test_late_watchers_get_the_known_items(logic_manager: LogicManager) -> None:
+    message_manager = _CountingMessageManager(logic_manager)
+    player_info = message_manager.connect_as_player(None)
+    watcher = InventoryWatcher(message_manager)
+    first_changes: list[list[InventoryChange]] = []
+    second_changes: list[list[InventoryChange]] = []
+
+    watcher.watch(player_info.current_map_uid, player_info.uid, first_changes.append)
+    watcher.watch(player_info.current_map_uid, player_info.uid, second_changes.append)
+
+    assert second_changes == first_changes == [[("Wooden Plank", 0, 5)]]
+    assert message_manager.requests_count == 1
+
+
+def test_unwatched_inventories_are_not_polled(logic_manager: LogicManager) -> None:
+    message_manager = _CountingMessageManager(logic_manager)
+    player_info = message_manager.connect_as_player(None)
+    watcher = InventoryWatcher(message_manager)
+    received_changes: list[list[InventoryChange]] = []
+
+    watcher.watch(player_info.current_map_uid, player_info.uid, received_changes.append)
+    watcher.unwatch(
+        player_info.current_map_uid, player_info.uid, received_changes.append
+    )
+    watcher.poll()
+
+    assert message_manager.requests_count == 1
+
+
+def test_craftability_reset_forgets_the_inventory() -> None:
+    tracker = CraftabilityTracker(
+        RecipeIndex({"Table": {"Plank": 6}, "Stick": {"Plank": 1}, "Rock": {}})
+    )
+    assert tracker.set_quantities([("Plank", 6)]) == (["Table", "Stick"], [])
+
+    tracker.reset()
+
+    assert tracker.craftable_recipe_names == ["Rock"]
+    assert tracker.update({"Plank": 1}) == (["Stick"], [])
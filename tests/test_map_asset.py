@@ -0,0 +1,89 @@
+from pathlib import Path
+
+import pytest
+
+from hard_reset.logic.entities import Chest, Door
+from hard_reset.logic.item.catalog import CATALOG
+from hard_reset.logic.map.map_asset import (
+    MAP_ASSET_SUFFIX,
+    AssetMap,
+    get_map_asset_factories,
+    save_map_asset,
+)
+from hard_reset.logic.map.maps import BaseMap, Map1
+from hard_reset.logic.map.tiles import GROUND_TILE, WALL_TILE
+
+
+def _get_layout(current_map: BaseMap) -> tuple[object, ...]:
+    return (
+        current_map.uid,
+        current_map.width_in_tiles,
+        current_map.height_in_tiles,
+        bytes(current_map.tile_id_grid),
+        bytes(current_map.walkability_grid),
+        {
+            spawn_point.uid: spawn_point._position
+            for spawn_point in current_map._spawn_points.values()
+        },
+        {
+            map_travel.uid: map_travel.destination
+            for map_travel in current_map._map_travels.values()
+        },
+        sorted(
+            (
+                (entity.bounds.position.x, entity.bounds.position.y),
+                entity._map_travel_uid,
+            )
+            for entity in current_map._entities.values()
+            if isinstance(entity, Door)
+        ),
+        sorted(
+            (
+                (entity.bounds.position.x, entity.bounds.position.y),
+                sorted(entity._inventory.get_items().items()),
+            )
+            for entity in current_map._entities.values()
+            if isinstance(entity, Chest)
+        ),
+    )
+
+
+def test_saved_maps_load_unchanged(tmp_path: Path) -> None:
+    current_map = Map1()
+    chest = next(
+        entity for entity in current_map._entities.values() if isinstance(entity, Chest)
+    )
+    chest._inventory.add_item(CATALOG.get_item("Bottle"), 3)
+    path = tmp_path / f"map{MAP_ASSET_SUFFIX}"
+
+    save_map_asset(current_map, path)
+    asset_map = AssetMap(path)
+
+    assert _get_layout(asset_map) == _get_layout(current_map)
+    assert asset_map.get_tile(0, 0) == current_map.get_tile(0, 0)
+    assert list(get_map_asset_factories(tmp_path)) == [current_map.uid]
+
+
+def test_set_tiles_do_not_change_the_file(tmp_path: Path) -> None:
+    path = tmp_path / f"map{MAP_ASSET_SUFFIX}"
+    save_map_asset(Map1(), path)
+    data = path.read_bytes()
+    asset_map = AssetMap(path)
+    tile = WALL_TILE if asset_map.get_tile(2, 2) == GROUND_TILE else GROUND_TILE
+
+    asset_map.set_tile(2, 2, tile)
+
+    assert asset_map.get_tile(2, 2) == tile
+    assert path.read_bytes() == data
+
+
+def test_other_files_are_rejected(tmp_path: Path) -> None:
+    path = tmp_path / f"map{MAP_ASSET_SUFFIX}"
+    save_map_asset(Map1(), path)
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        AssetMap(path)
+
+    path.write_bytes(b"not a map")
+    with pytest.raises(ValueError):
+        AssetMap(path)
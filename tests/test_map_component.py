@@ -0,0 +1,40 @@
+import random
+from uuid import uuid4
+
+from hard_reset.graphic.menu_component.map_component import (
+    GROUND_COLOR,
+    TILE_SIZE,
+    WALL_COLOR,
+    _build_tile_rects,
+)
+from hard_reset.messaging.messaging import MapLayoutPacket
+
+
+def test_tile_rects_cover_each_tile_once() -> None:
+    generator = random.Random(19)
+    width_in_tiles, height_in_tiles = 9, 7
+    walkability = bytes(
+        generator.random() < 0.5 for _ in range(width_in_tiles * height_in_tiles)
+    )
+    layout = MapLayoutPacket(
+        uuid4(),
+        "",
+        width_in_tiles,
+        height_in_tiles,
+        width_in_tiles * TILE_SIZE,
+        height_in_tiles * TILE_SIZE,
+        memoryview(walkability),
+    )
+    tile_colors = {}
+
+    for start, end, color in _build_tile_rects(layout):
+        for y in range(int(start.y // TILE_SIZE), int(end.y // TILE_SIZE)):
+            for x in range(int(start.x // TILE_SIZE), int(end.x // TILE_SIZE)):
+                assert (x, y) not in tile_colors
+                tile_colors[(x, y)] = color
+
+    assert tile_colors == {
+        (x, y): GROUND_COLOR if walkability[y * width_in_tiles + x] else WALL_COLOR
+        for y in range(height_in_tiles)
+        for x in range(width_in_tiles)
+    }
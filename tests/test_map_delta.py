@@ -0,0 +1,95 @@
+import random
+
+from conftest import RoomMap
+from game_manager.logic.map.tile import TILE_SIZE
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Chest, Player
+from hard_reset.logic.map.maps import REMOVED_ENTITIES_HISTORY_SIZE
+
+
+def _move(player: Player, x: float, y: float) -> None:
+    player.bounds = player.bounds.at_position(Vertex2f(x, y))
+
+
+def test_changes_since_a_revision() -> None:
+    current_map = RoomMap(20, 20)
+    chest = Chest(Vertex2f(TILE_SIZE, TILE_SIZE))
+    player = Player(Vertex2f(2 * TILE_SIZE, 2 * TILE_SIZE))
+    current_map.add_entity(chest)
+    current_map.add_entity(player)
+    revision = current_map.get_changes_since(-1).revision
+
+    _move(player, 3 * TILE_SIZE, 2 * TILE_SIZE)
+    changes = current_map.get_changes_since(revision)
+    assert not changes.full
+    assert changes.changed_entities == [player]
+    assert changes.removed_entity_uids == []
+
+    current_map.remove_entity(chest.uid)
+    changes = current_map.get_changes_since(revision)
+    assert changes.changed_entities == [player]
+    assert changes.removed_entity_uids == [chest.uid]
+
+    unchanged = current_map.get_changes_since(changes.revision)
+    assert unchanged.revision == changes.revision
+    assert unchanged.changed_entities == unchanged.removed_entity_uids == []
+
+
+def test_old_revisions_get_a_full_snapshot() -> None:
+    current_map = RoomMap(20, 20)
+    player = Player(Vertex2f(2 * TILE_SIZE, 2 * TILE_SIZE))
+    current_map.add_entity(player)
+    revision = current_map.get_changes_since(-1).revision
+
+    for _ in range(REMOVED_ENTITIES_HISTORY_SIZE + 1):
+        chest = Chest(Vertex2f(TILE_SIZE, TILE_SIZE))
+        current_map.add_entity(chest)
+        current_map.remove_entity(chest.uid)
+
+    changes = current_map.get_changes_since(revision)
+    assert changes.full
+    assert changes.changed_entities == [player]
+
+
+def test_deltas_replay_to_the_map_state() -> None:
+    # A client applying every delta ends with the entities and positions of the
+    # map, whatever the order of additions, moves and removals
+    current_map = RoomMap(20, 20)
+    generator = random.Random(1)
+    players: list[Player] = []
+    known_positions: dict[Uid, tuple[float, float]] = {}
+    revision = -1
+
+    for _ in range(300):
+        action = generator.random()
+        if action < 0.3 or not players:
+            player = Player(Vertex2f(TILE_SIZE, TILE_SIZE))
+            current_map.add_entity(player)
+            players.append(player)
+        elif action < 0.45:
+            player = players.pop(generator.randrange(len(players)))
+            current_map.remove_entity(player.uid)
+        else:
+            _move(
+                generator.choice(players),
+                generator.uniform(TILE_SIZE, 18 * TILE_SIZE),
+                generator.uniform(TILE_SIZE, 18 * TILE_SIZE),
+            )
+
+        if generator.random() < 0.2:
+            changes = current_map.get_changes_since(revision)
+            if changes.full:
+                known_positions = {}
+            for uid in changes.removed_entity_uids:
+                known_positions.pop(uid, None)
+            for entity in changes.changed_entities:
+                position = entity.bounds.position
+                known_positions[entity.uid] = (position.x, position.y)
+            revision = changes.revision
+
+            assert known_positions == {
+                player.uid: (player.bounds.position.x, player.bounds.position.y)
+                for player in players
+            }
@@ -0,0 +1,54 @@
+import pytest
+from conftest import RoomMap
+
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.logic.map.maps import MAP_1_UID, BaseMap
+from hard_reset.logic.map.tiles import GROUND_TILE, WALL_TILE, get_tile_id
+from hard_reset.messaging.messaging import LocalMessageManagerGraphic
+
+
+def test_grids_are_row_major() -> None:
+    current_map = RoomMap(6, 4)
+    current_map.set_tile(2, 1, WALL_TILE)
+
+    walkability_grid = current_map.walkability_grid
+    assert bytes(walkability_grid) == bytes(
+        [0, 0, 0, 0, 0, 0]
+        + [0, 1, 0, 1, 1, 0]
+        + [0, 1, 1, 1, 1, 0]
+        + [0, 0, 0, 0, 0, 0]
+    )
+    assert current_map.tile_id_grid[1 * 6 + 2] == get_tile_id(WALL_TILE)
+    assert current_map.get_tile(2, 1) is WALL_TILE
+    with pytest.raises(TypeError):
+        walkability_grid[0] = 1  # type: ignore[index]
+
+
+def test_layout_hash_follows_the_tiles() -> None:
+    current_map = RoomMap(6, 4)
+    layout_hash = current_map.layout_hash
+    walkability_revision = current_map.walkability_revision
+
+    current_map.set_tile(2, 1, WALL_TILE)
+    assert current_map.layout_hash != layout_hash
+    assert current_map.walkability_revision == walkability_revision + 1
+
+    current_map.set_tile(2, 1, GROUND_TILE)
+    assert current_map.layout_hash == layout_hash == RoomMap(6, 4).layout_hash
+
+
+def test_layout_is_sent_apart_from_the_entities(logic_manager: LogicManager) -> None:
+    message_manager = LocalMessageManagerGraphic(logic_manager)
+    map_layout = message_manager.get_map_layout(MAP_1_UID)
+    map_info = message_manager.get_map_info(MAP_1_UID)
+    current_map = logic_manager.get_map(MAP_1_UID)
+    assert isinstance(current_map, BaseMap)
+
+    assert map_layout.layout_hash == map_info.layout_hash
+    assert len(map_layout.walkability) == (
+        map_layout.width_in_tiles * map_layout.height_in_tiles
+    )
+    assert map_layout.walkability[map_layout.width_in_tiles + 1] == (
+        current_map.is_walkable(1, 1)
+    )
+    assert set(map_info.entities) == set(current_map._entities)
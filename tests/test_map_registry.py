@@ -0,0 +1,93 @@
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+from conftest import run_logic_thread
+from game_manager.logic.uid_object import Uid
+
+from hard_reset.logic.entities import Chest
+from hard_reset.logic.item.catalog import CATALOG
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.logic.logic_storage_manager import LogicStorageManager
+from hard_reset.logic.map.map_registry import MapRegistry, estimate_map_size
+from hard_reset.logic.map.maps import MAP_1_UID, MAP_2_UID, Map1, Map2
+
+
+def test_idle_maps_are_evicted(tmp_path: Path) -> None:
+    registry = MapRegistry(LogicStorageManager(str(tmp_path)), idle_timeout_s=10)
+    registry.declare(MAP_1_UID, Map1)
+    registry.declare(MAP_2_UID, Map2)
+    registry.load(MAP_1_UID)
+    registry.load(MAP_2_UID)
+    registry.touch(MAP_1_UID, now=100)
+    registry.touch(MAP_2_UID, now=105)
+
+    assert registry.get_evictable_map_uids(lambda _: False, now=109) == []
+    assert registry.get_evictable_map_uids(lambda _: False, now=112) == [MAP_1_UID]
+    assert registry.get_evictable_map_uids(lambda _: True, now=200) == []
+
+
+def test_least_recently_used_maps_are_evicted_over_budget(tmp_path: Path) -> None:
+    map_uids = [uuid4() for _ in range(3)]
+    budget = 2 * estimate_map_size(Map1())
+    registry = MapRegistry(
+        LogicStorageManager(str(tmp_path)), idle_timeout_s=60, memory_budget=budget
+    )
+    for map_uid in map_uids:
+
+        def make_map(map_uid: Uid = map_uid) -> Map1:
+            current_map = Map1()
+            current_map._uid = map_uid
+            return current_map
+
+        registry.declare(map_uid, make_map)
+        registry.load(map_uid)
+        registry.touch(map_uid, now=0)
+    registry.touch(map_uids[0], now=1)
+
+    assert registry.resident_size > budget
+    assert registry.get_evictable_map_uids(
+        lambda map_uid: map_uid == map_uids[1], now=2
+    ) == [map_uids[2]]
+
+
+def test_unloaded_maps_keep_their_chests(tmp_path: Path) -> None:
+    registry = MapRegistry(LogicStorageManager(str(tmp_path)))
+    registry.declare(MAP_1_UID, Map1)
+    current_map = registry.load(MAP_1_UID)
+    chest = next(
+        entity for entity in current_map._entities.values() if isinstance(entity, Chest)
+    )
+    chest._inventory.add_item(CATALOG.get_item("Bottle"), 4)
+    items = chest._inventory.get_items()
+
+    registry.unload(current_map)
+    assert not registry.is_resident(MAP_1_UID)
+    reloaded_registry = MapRegistry(LogicStorageManager(str(tmp_path)))
+    reloaded_registry.declare(MAP_1_UID, Map1)
+    reloaded_chests = {
+        (entity.bounds.position.x, entity.bounds.position.y): entity
+        for entity in reloaded_registry.load(MAP_1_UID)._entities.values()
+        if isinstance(entity, Chest)
+    }
+
+    position = chest.bounds.position
+    assert reloaded_chests[(position.x, position.y)]._inventory.get_items() == items
+
+
+def test_maps_are_loaded_and_evicted_on_the_logic_thread(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("hard_reset.logic.logic_manager.EVICTION_CHECK_INTERVAL_S", 0.0)
+    logic_manager = LogicManager(storage_path=str(tmp_path), idle_timeout_s=0)
+    logic_manager.on_player_connect(None)
+
+    # The second map is evicted on every tick while it is loaded again
+    with run_logic_thread(logic_manager):
+        deadline = time.perf_counter() + 0.5
+        while time.perf_counter() < deadline:
+            assert logic_manager.get_map(MAP_2_UID) is not None
+            logic_manager.save()
+
+    assert logic_manager.map_registry.is_resident(MAP_1_UID)
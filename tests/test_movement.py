@@ -0,0 +1,57 @@
+import pytest
+from conftest import RoomMap
+from game_manager.logic.map.tile import TILE_SIZE
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import PLAYER_SPEED, Player
+from hard_reset.logic.map.maps import BaseMap
+
+pytest.importorskip("numpy")
+
+
+def _add_player(current_map: BaseMap, x: float, y: float) -> Player:
+    player = Player(Vertex2f(x, y))
+    current_map.add_entity(player)
+    return player
+
+
+def test_step_scales_directions_by_speed_and_delta_time() -> None:
+    current_map = RoomMap()
+    current_map.enable_vectorized_movement()
+    player = _add_player(current_map, 2 * TILE_SIZE, 2 * TILE_SIZE)
+    slow_player = _add_player(current_map, 2 * TILE_SIZE, 5 * TILE_SIZE)
+    slow_player.speed = PLAYER_SPEED / 2
+    player.direction = slow_player.direction = Vertex2f(1, 0)
+
+    current_map.update(0.5)
+
+    assert player.bounds.position.x == pytest.approx(2 * TILE_SIZE + PLAYER_SPEED * 0.5)
+    assert slow_player.bounds.position.x == pytest.approx(
+        2 * TILE_SIZE + PLAYER_SPEED * 0.25
+    )
+
+
+def test_step_slides_along_walls() -> None:
+    current_map = RoomMap()
+    current_map.enable_vectorized_movement()
+    player = _add_player(current_map, TILE_SIZE, 2 * TILE_SIZE)
+    player.direction = Vertex2f(-1, 1).unit_vertex
+
+    current_map.update(0.5)
+
+    # The wall on the left blocks x, y still moves
+    assert player.bounds.position.x == TILE_SIZE
+    assert player.bounds.position.y > 2 * TILE_SIZE
+
+
+def test_speed_and_direction_survive_leaving_the_system() -> None:
+    current_map = RoomMap()
+    current_map.enable_vectorized_movement()
+    player = _add_player(current_map, 2 * TILE_SIZE, 2 * TILE_SIZE)
+    player.speed = 10.0
+    player.direction = Vertex2f(0, 1)
+
+    current_map.remove_entity(player.uid)
+
+    assert player.speed == 10.0
+    assert player.direction == Vertex2f(0, 1)
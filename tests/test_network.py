@@ -0,0 +1,219 @@
+import asyncio
+import threading
+from typing import cast
+from uuid import uuid4
+
+import pytest
+from conftest import run_logic_thread
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.messaging.messaging import (
+    EntityDoorInfoPacket,
+    EntityInfoPacket,
+    InventoryDeltaPacket,
+    MapDeltaPacket,
+    MapInfoPacket,
+    MapLayoutPacket,
+    PlayerInfoPacket,
+)
+from hard_reset.network.client import RemoteError, ServerConnection
+from hard_reset.network.codec import (
+    FRAME_HEADER,
+    MAX_FRAME_SIZE,
+    REQUEST,
+    decode_request,
+    decode_value,
+    encode_request,
+    encode_value,
+)
+from hard_reset.network.server import LogicServer
+
+
+def _round_trip(value: object) -> object:
+    return decode_value(memoryview(encode_value(value)))
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        True,
+        False,
+        -(2**40),
+        1.5,
+        "héllo",
+        uuid4(),
+        [1, "a", [None]],
+        {"Wooden Plank": 5, "Key": 0},
+    ],
+)
+def test_codec_round_trips_plain_values(value: object) -> None:
+    assert _round_trip(value) == value
+
+
+def test_codec_round_trips_packets() -> None:
+    map_uid, player_uid, door_uid = uuid4(), uuid4(), uuid4()
+    player = PlayerInfoPacket("Player", player_uid, Vertex2f(1, 2), map_uid)
+    door = EntityDoorInfoPacket(
+        "Door", door_uid, Vertex2f(3, 4), Vertex2f(16, 32), uuid4()
+    )
+    chest = EntityInfoPacket("Chest", uuid4(), Vertex2f(5, 6))
+    entities = {player_uid: player, door_uid: door, chest.uid: chest}
+
+    assert _round_trip(MapInfoPacket(map_uid, "hash", entities, 7)) == (
+        MapInfoPacket(map_uid, "hash", entities, 7)
+    )
+    delta = MapDeltaPacket(
+        map_uid, "hash", 8, False, {chest.uid: chest}, [uuid4()], [door_uid], []
+    )
+    assert _round_trip(delta) == delta
+    inventory_delta = InventoryDeltaPacket(player_uid, 3, {"Key": 2})
+    assert _round_trip(inventory_delta) == inventory_delta
+
+    layout = cast(
+        MapLayoutPacket,
+        _round_trip(
+            MapLayoutPacket(map_uid, "hash", 2, 1, 64, 32, memoryview(b"\x01\x00"))
+        ),
+    )
+    assert (layout.width_in_tiles, layout.height_in_tiles) == (2, 1)
+    assert bytes(layout.walkability) == b"\x01\x00"
+
+
+def test_codec_round_trips_requests() -> None:
+    map_uid = uuid4()
+    method_name, args = decode_request(
+        memoryview(encode_request("get_map_delta", (map_uid, 3, None)))
+    )
+    assert method_name == "get_map_delta"
+    assert args == [map_uid, 3, None]
+
+
+def test_codec_rejects_unknown_values() -> None:
+    with pytest.raises(ValueError):
+        encode_value(object())
+
+
+async def _play(port: int) -> tuple[PlayerInfoPacket, list[object]]:
+    connection = await ServerConnection.open(port=port)
+    player_info = cast(
+        PlayerInfoPacket, await connection.request("connect_as_player", None)
+    )
+    map_uid = player_info.current_map_uid
+    # Pipelined requests are answered in order, each to its own caller
+    responses = await asyncio.gather(
+        connection.request("get_map_info", map_uid),
+        connection.request("get_inventory", map_uid, player_info.uid),
+        *(connection.request("get_map_delta", map_uid, -1) for _ in range(20)),
+    )
+    with pytest.raises(RemoteError):
+        await connection.request("get_map_info", uuid4())
+    await connection.close()
+    return player_info, list(responses)
+
+
+def test_server_serves_two_clients(logic_manager: LogicManager) -> None:
+    async def run() -> None:
+        server = LogicServer(logic_manager, port=0)
+        await server.start()
+        (first_player, first_responses), (second_player, second_responses) = (
+            await asyncio.gather(_play(server.port), _play(server.port))
+        )
+        server.application_stopped()
+        await server.serve_forever()
+
+        assert first_player.uid != second_player.uid
+        for player, responses in (
+            (first_player, first_responses),
+            (second_player, second_responses),
+        ):
+            map_info, inventory, *deltas = responses
+            assert isinstance(map_info, MapInfoPacket)
+            assert player.uid in map_info.entities
+            assert inventory == {"Wooden Plank": 5}
+            assert all(
+                isinstance(delta, MapDeltaPacket) and delta.full for delta in deltas
+            )
+
+    asyncio.run(run())
+
+
+def test_cancelled_request_does_not_break_connection(
+    logic_manager: LogicManager,
+) -> None:
+    async def run() -> None:
+        server = LogicServer(logic_manager, port=0)
+        await server.start()
+        connection = await ServerConnection.open(port=server.port)
+        player_info = cast(
+            PlayerInfoPacket, await connection.request("connect_as_player", None)
+        )
+
+        # The response arrives after its caller gave up waiting for it
+        request = asyncio.create_task(
+            connection.request("get_map_delta", player_info.current_map_uid, -1)
+        )
+        while not connection._pending_responses:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        map_info = await asyncio.wait_for(
+            connection.request("get_map_info", player_info.current_map_uid), 5
+        )
+        assert isinstance(map_info, MapInfoPacket)
+
+        await connection.close()
+        server.application_stopped()
+        await server.serve_forever()
+
+    asyncio.run(run())
+
+
+def test_oversized_frames_close_the_connection(logic_manager: LogicManager) -> None:
+    async def run() -> None:
+        server = LogicServer(logic_manager, port=0)
+        await server.start()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+
+        writer.write(FRAME_HEADER.pack(MAX_FRAME_SIZE + 1, REQUEST, 0))
+        # Closed without waiting for the announced body
+        assert await asyncio.wait_for(reader.read(), 5) == b""
+
+        writer.close()
+        server.application_stopped()
+        await server.serve_forever()
+
+    asyncio.run(run())
+
+
+def test_requests_run_on_the_logic_thread(
+    logic_manager: LogicManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    viewport_thread_ids: list[int] = []
+    monkeypatch.setattr(
+        logic_manager,
+        "set_player_viewport",
+        lambda *_: viewport_thread_ids.append(threading.get_ident()),
+    )
+
+    async def run() -> None:
+        server = LogicServer(logic_manager, port=0)
+        await server.start()
+        await asyncio.gather(_play(server.port), _play(server.port))
+        connection = await ServerConnection.open(port=server.port)
+        player_info = cast(
+            PlayerInfoPacket, await connection.request("connect_as_player", None)
+        )
+        await connection.request("set_viewport", player_info.uid, Vertex2f(64, 64))
+        await connection.close()
+        server.application_stopped()
+        await server.serve_forever()
+
+    with run_logic_thread(logic_manager) as logic_thread:
+        asyncio.run(run())
+        assert viewport_thread_ids == [logic_thread.ident]
+    # Closed connections disconnected their players
+    assert len(logic_manager.sessions) == 0
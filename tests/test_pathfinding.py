@@ -0,0 +1,160 @@
+import heapq
+import random
+
+from conftest import RoomMap
+from game_manager.logic.map.tile import TILE_SIZE
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.map.pathfinding import (
+    DIAGONAL_COST,
+    STRAIGHT_COST,
+    FlowField,
+    TilePosition,
+    find_path,
+)
+from hard_reset.logic.map.tiles import GROUND_TILE, WALL_TILE
+
+WIDTH, HEIGHT = 12, 9
+
+
+def _random_walkability(generator: random.Random) -> memoryview:
+    return memoryview(
+        bytes(generator.random() > 0.3 for _ in range(WIDTH * HEIGHT))
+    ).toreadonly()
+
+
+def _is_walkable(walkability: memoryview, x: int, y: int) -> bool:
+    return 0 <= x < WIDTH and 0 <= y < HEIGHT and bool(walkability[y * WIDTH + x])
+
+
+def _get_step_cost(
+    walkability: memoryview, start: TilePosition, end: TilePosition
+) -> int | None:
+    (x, y), (nx, ny) = start, end
+    if max(abs(nx - x), abs(ny - y)) != 1 or not _is_walkable(walkability, nx, ny):
+        return None
+    if nx == x or ny == y:
+        return STRAIGHT_COST
+    # No wall corner cutting
+    if _is_walkable(walkability, nx, y) and _is_walkable(walkability, x, ny):
+        return DIAGONAL_COST
+    return None
+
+
+def _get_distances(
+    walkability: memoryview, goal: TilePosition
+) -> dict[TilePosition, int]:
+    distances = {goal: 0}
+    open_heap = [(0, goal)]
+    while open_heap:
+        distance, (x, y) = heapq.heappop(open_heap)
+        if distance > distances[(x, y)]:
+            continue
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                step_cost = _get_step_cost(walkability, (x, y), (x + dx, y + dy))
+                neighbour = (x + dx, y + dy)
+                if step_cost is not None and distance + step_cost < distances.get(
+                    neighbour, 2**31
+                ):
+                    distances[neighbour] = distance + step_cost
+                    heapq.heappush(open_heap, (distance + step_cost, neighbour))
+    return distances
+
+
+def _get_path_cost(walkability: memoryview, path: list[TilePosition]) -> int:
+    cost = 0
+    for start, end in zip(path, path[1:]):
+        step_cost = _get_step_cost(walkability, start, end)
+        assert step_cost is not None
+        cost += step_cost
+    return cost
+
+
+def test_paths_are_shortest() -> None:
+    generator = random.Random(5)
+    for _ in range(30):
+        walkability = _random_walkability(generator)
+        walkable_tiles = [
+            (x, y)
+            for y in range(HEIGHT)
+            for x in range(WIDTH)
+            if walkability[y * WIDTH + x]
+        ]
+        goal = generator.choice(walkable_tiles)
+        distances = _get_distances(walkability, goal)
+        flow_field = FlowField(walkability, WIDTH, HEIGHT, goal)
+
+        for start in generator.sample(walkable_tiles, 10):
+            path = find_path(walkability, WIDTH, HEIGHT, start, goal)
+            flow_path = flow_field.get_path(start)
+            if start not in distances:
+                assert path is None and flow_path is None
+                assert flow_field.get_distance(*start) is None
+                continue
+
+            assert path is not None and flow_path is not None
+            assert path[0] == flow_path[0] == start
+            assert path[-1] == flow_path[-1] == goal
+            assert _get_path_cost(walkability, path) == distances[start]
+            assert _get_path_cost(walkability, flow_path) == distances[start]
+            assert flow_field.get_distance(*start) == distances[start]
+
+
+def _get_goal_path_cost(walkability: memoryview, path: list[TilePosition]) -> int:
+    # The last step enters the unwalkable goal, from any neighbour
+    (x, y), (goal_x, goal_y) = path[-2], path[-1]
+    assert max(abs(goal_x - x), abs(goal_y - y)) == 1
+    last_cost = STRAIGHT_COST if x == goal_x or y == goal_y else DIAGONAL_COST
+    return _get_path_cost(walkability, path[:-1]) + last_cost
+
+
+def test_flow_fields_enter_unwalkable_goals_like_find_path() -> None:
+    generator = random.Random(8)
+    for _ in range(30):
+        walkability = _random_walkability(generator)
+        tiles = [(x, y) for y in range(HEIGHT) for x in range(WIDTH)]
+        goal = generator.choice(
+            [(x, y) for x, y in tiles if not walkability[y * WIDTH + x]]
+        )
+        flow_field = FlowField(walkability, WIDTH, HEIGHT, goal)
+
+        for start in tiles:
+            if not walkability[start[1] * WIDTH + start[0]]:
+                continue
+            path = find_path(walkability, WIDTH, HEIGHT, start, goal)
+            flow_path = flow_field.get_path(start)
+            if path is None:
+                assert flow_path is None
+                continue
+            assert flow_path is not None and flow_path[-1] == goal
+            cost = _get_goal_path_cost(walkability, path)
+            assert _get_goal_path_cost(walkability, flow_path) == cost
+            assert flow_field.get_distance(*start) == cost
+
+
+def test_unwalkable_goals_are_entered_last() -> None:
+    walkability = bytearray([1]) * (WIDTH * HEIGHT)
+    walkability[4 * WIDTH + 0] = 0
+
+    path = find_path(memoryview(walkability), WIDTH, HEIGHT, (5, 4), (0, 4))
+
+    assert path == [(5, 4), (4, 4), (3, 4), (2, 4), (1, 4), (0, 4)]
+
+
+def test_cached_flow_fields_follow_walkability_changes() -> None:
+    current_map = RoomMap(8, 8)
+    flow_field = current_map.pathfinder.get_flow_field((6, 1))
+    assert current_map.pathfinder.get_flow_field((6, 1)) is flow_field
+    for y in range(1, 7):
+        current_map.set_tile(3, y, WALL_TILE)
+
+    assert current_map.pathfinder.find_path((1, 1), (6, 1)) is None
+    assert current_map.pathfinder.get_flow_field((6, 1)).get_distance(1, 1) is None
+
+    current_map.set_tile(3, 6, GROUND_TILE)
+    direction = current_map.pathfinder.get_flow_field_to(
+        Vertex2f(6 * TILE_SIZE, TILE_SIZE)
+    ).get_direction(Vertex2f(1.5 * TILE_SIZE, 1.5 * TILE_SIZE))
+    assert direction is not None
+    assert direction.y > 0
@@ -0,0 +1,85 @@
+from pathlib import Path
+from uuid import uuid4
+
+from game_manager.logic.map.tile import TILE_SIZE
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Player
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.logic.map.maps import MAP_2_UID
+from hard_reset.logic.session import SessionRegistry
+from hard_reset.messaging.messaging import LocalMessageManagerGraphic
+
+
+def test_registry_indexes_players_by_map_and_connection() -> None:
+    sessions = SessionRegistry()
+    first_player = Player(Vertex2f(0, 0))
+    second_player = Player(Vertex2f(0, 0))
+    map_uid, other_map_uid = uuid4(), uuid4()
+    sessions.add(first_player, map_uid, 1)
+    sessions.add(second_player, map_uid, None)
+
+    sessions.set_map(first_player.uid, other_map_uid)
+
+    assert sessions.get_map_player_uids(map_uid) == {second_player.uid}
+    assert sessions.get_connection_player_uids(1) == {first_player.uid}
+    assert sorted(sessions.occupied_map_uids) == sorted([map_uid, other_map_uid])
+
+    sessions.remove(first_player.uid)
+    assert not sessions.has_players_on_map(other_map_uid)
+    assert sessions.get_connection_player_uids(1) == set()
+    assert len(sessions) == 1
+
+
+def test_closed_connections_only_remove_their_players(
+    logic_manager: LogicManager,
+) -> None:
+    first_player, map_uid = logic_manager.on_player_connect(None, connection_id=1)
+    second_player, _ = logic_manager.on_player_connect(None, connection_id=2)
+
+    logic_manager.on_connection_closed(1)
+
+    current_map = logic_manager.get_map(map_uid)
+    assert current_map is not None
+    assert current_map.get_entity(first_player.uid) is None
+    assert current_map.get_entity(second_player.uid) is second_player
+    assert logic_manager.sessions.get(first_player.uid) is None
+
+
+def test_connected_players_are_not_loaded_again(logic_manager: LogicManager) -> None:
+    player, map_uid = logic_manager.on_player_connect(None)
+    assert logic_manager.on_player_connect(player.uid) == (player, map_uid)
+
+
+def test_players_are_restored_where_they_left(tmp_path: Path) -> None:
+    storage_path = str(tmp_path / "logic")
+    logic_manager = LogicManager(storage_path=storage_path)
+    player, map_uid = logic_manager.on_player_connect(None)
+    position = Vertex2f(2 * TILE_SIZE, 3 * TILE_SIZE)
+    logic_manager.move_entity(player.uid, map_uid, MAP_2_UID, position)
+    logic_manager.on_player_disconnect(player.uid)
+
+    restored_player, restored_map_uid = LogicManager(
+        storage_path=storage_path
+    ).on_player_connect(player.uid)
+
+    assert restored_player.uid == player.uid
+    assert restored_map_uid == MAP_2_UID
+    assert restored_player.bounds.position == position
+
+
+def test_crafted_items_are_saved(tmp_path: Path) -> None:
+    storage_path = str(tmp_path / "logic")
+    logic_manager = LogicManager(storage_path=storage_path)
+    graphic = LocalMessageManagerGraphic(logic_manager)
+    player, map_uid = logic_manager.on_player_connect(None)
+    logic_manager.save()
+
+    items = graphic.craft_item(map_uid, player.uid, "Wooden Stick")
+    logic_manager.save()
+
+    restored_player, _ = LogicManager(storage_path=storage_path).on_player_connect(
+        player.uid
+    )
+    assert items == {"Wooden Plank": 4, "Wooden Stick": 4}
+    assert restored_player._inventory.get_items() == items
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import pytest
+
+from hard_reset.shard_benchmark import run
+
+
+def test_run_reports_throughput_without_writing_to_working_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.chdir(tmp_path)
+
+    run(
+        shards_counts=[1],
+        maps_count=1,
+        players_per_map=2,
+        ticks_count=5,
+        map_size=16,
+        seed=0,
+    )
+
+    assert "Shards: 1," in capsys.readouterr().out
+    assert list(tmp_path.iterdir()) == []
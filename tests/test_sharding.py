@@ -0,0 +1,54 @@
+from pathlib import Path
+from typing import cast
+
+from game_manager.logic.uid_object import Uid
+
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.logic.map.maps import MAP_1_UID, MAP_2_UID, BaseMap, Map1, Map2
+from hard_reset.logic.sharding import GRAPHIC_REQUEST, JOB_REQUEST, ShardWorker
+from hard_reset.logic.tick_scheduler import DEFAULT_TICK_RATE
+
+
+def _get_map_uids(logic_manager: LogicManager) -> list[Uid]:
+    return logic_manager.map_registry.map_uids
+
+
+def test_players_are_handed_off_between_shards(tmp_path: Path) -> None:
+    storage_path = str(tmp_path / "logic")
+    first_worker = ShardWorker(
+        {MAP_1_UID: Map1}, storage_path, DEFAULT_TICK_RATE, False
+    )
+    second_worker = ShardWorker(
+        {MAP_2_UID: Map2}, storage_path, DEFAULT_TICK_RATE, False
+    )
+    player_info = first_worker.graphic.connect_as_player(None)
+    items = first_worker.graphic.get_inventory(MAP_1_UID, player_info.uid)
+    first_map = cast(BaseMap, first_worker.logic_manager.get_map(MAP_1_UID))
+    map_travel_uid = next(iter(first_map._map_travels))
+
+    map_uid, spawn_point_uid, player_data = first_worker.travel(
+        player_info.uid, MAP_1_UID, map_travel_uid
+    )
+    assert map_uid == MAP_2_UID and player_data is not None
+    second_worker.import_player(player_data, map_uid, spawn_point_uid)
+
+    second_map = cast(BaseMap, second_worker.logic_manager.get_map(MAP_2_UID))
+    assert player_info.uid not in first_map._entities
+    assert player_info.uid in second_map._entities
+    assert second_worker.graphic.get_inventory(MAP_2_UID, player_info.uid) == items
+    spawn_point = second_map.get_spawn_point(spawn_point_uid)
+    assert second_map.get_entity(player_info.uid).bounds.position == (
+        spawn_point._position
+    )
+
+
+def test_requests_are_answered_with_picklable_results(tmp_path: Path) -> None:
+    worker = ShardWorker(
+        {MAP_1_UID: Map1}, str(tmp_path / "logic"), DEFAULT_TICK_RATE, False
+    )
+
+    layout = worker._handle(GRAPHIC_REQUEST, "get_map_layout", (MAP_1_UID,))
+    map_uids = worker._handle(JOB_REQUEST, _get_map_uids, ())
+
+    assert isinstance(getattr(layout, "walkability"), bytes)
+    assert map_uids == [MAP_1_UID]
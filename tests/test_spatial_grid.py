@@ -0,0 +1,97 @@
+import random
+
+from game_manager.logic.entity.entity import Entity
+from game_manager.logic.map.tile import TILE_SIZE
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Chest, Player
+from hard_reset.logic.map.spatial_grid import SpatialGrid
+
+
+def _overlaps_rect(entity: Entity, position: Vertex2f, dimensions: Vertex2f) -> bool:
+    entity_position = entity.bounds.position
+    entity_dimensions = entity.bounds.dimensions
+    return (
+        entity_position.x < position.x + dimensions.x
+        and position.x < entity_position.x + entity_dimensions.x
+        and entity_position.y < position.y + dimensions.y
+        and position.y < entity_position.y + entity_dimensions.y
+    )
+
+
+def _overlaps_circle(entity: Entity, center: Vertex2f, radius: float) -> bool:
+    entity_position = entity.bounds.position
+    entity_dimensions = entity.bounds.dimensions
+    closest_x = min(
+        max(center.x, entity_position.x), entity_position.x + entity_dimensions.x
+    )
+    closest_y = min(
+        max(center.y, entity_position.y), entity_position.y + entity_dimensions.y
+    )
+    return (center.x - closest_x) ** 2 + (center.y - closest_y) ** 2 <= radius**2
+
+
+def _random_position(generator: random.Random) -> Vertex2f:
+    return Vertex2f(
+        generator.uniform(0, 30 * TILE_SIZE), generator.uniform(0, 30 * TILE_SIZE)
+    )
+
+
+def test_queries_match_brute_force() -> None:
+    generator = random.Random(3)
+    grid = SpatialGrid(TILE_SIZE)
+    entities: dict[Uid, Entity] = {}
+    for idx in range(200):
+        entity: Entity = (
+            Player(_random_position(generator))
+            if idx % 2
+            else Chest(_random_position(generator))
+        )
+        entities[entity.uid] = entity
+        grid.insert(entity)
+
+    for _ in range(300):
+        action = generator.random()
+        if action < 0.4:
+            player = generator.choice(
+                [entity for entity in entities.values() if isinstance(entity, Player)]
+            )
+            player.bounds = player.bounds.at_position(_random_position(generator))
+            grid.move(player)
+        elif action < 0.5:
+            removed_uid = generator.choice(list(entities))
+            grid.remove(entities.pop(removed_uid).uid)
+
+        position = _random_position(generator)
+        dimensions = Vertex2f(
+            generator.uniform(0, 8 * TILE_SIZE), generator.uniform(0, 8 * TILE_SIZE)
+        )
+        assert {entity.uid for entity in grid.query_rect(position, dimensions)} == {
+            uid
+            for uid, entity in entities.items()
+            if _overlaps_rect(entity, position, dimensions)
+        }
+        radius = generator.uniform(0, 5 * TILE_SIZE)
+        assert {entity.uid for entity in grid.query_radius(position, radius)} == {
+            uid
+            for uid, entity in entities.items()
+            if _overlaps_circle(entity, position, radius)
+        }
+    assert len(grid) == len(entities)
+
+
+def test_touching_bounds_do_not_overlap() -> None:
+    grid = SpatialGrid(TILE_SIZE)
+    chest = Chest(Vertex2f(TILE_SIZE, TILE_SIZE))
+    grid.insert(chest)
+    chest_dimensions = chest.bounds.dimensions
+
+    assert grid.query_rect(Vertex2f(0, 0), Vertex2f(TILE_SIZE, TILE_SIZE)) == []
+    assert (
+        grid.query_rect(
+            Vertex2f(TILE_SIZE + chest_dimensions.x, TILE_SIZE), Vertex2f(5, 5)
+        )
+        == []
+    )
+    assert grid.query_rect(Vertex2f(TILE_SIZE, TILE_SIZE), Vertex2f(1, 1)) == [chest]
@@ -0,0 +1,190 @@
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import UUID, uuid4
+
+import pytest
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Player
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.storage.sqlite_storage_manager import SQLiteStorageManager
+
+
+@dataclass
+class _Note:
+    _uid: Uid
+    text: str
+
+
+class _NoteStorageManager(SQLiteStorageManager):
+    # Counts the commits of written rows
+    writes: list[int]
+
+    def __init__(self, path: str) -> None:
+        self.writes = []
+        super().__init__(path)
+
+    def _unparse_object(self, object_to_unparse: object) -> dict[object, object]:
+        assert isinstance(object_to_unparse, _Note)
+        return {
+            "type": "_Note",
+            "uid": str(object_to_unparse._uid),
+            "text": object_to_unparse.text,
+        }
+
+    def _parse_object(self, object_data: dict[object, object]) -> object:
+        return _Note(UUID(str(object_data["uid"])), str(object_data["text"]))
+
+    def _write_rows(self, rows: dict[tuple[str, str], str]) -> None:
+        if rows:
+            self.writes.append(len(rows))
+        super()._write_rows(rows)
+
+
+def test_parsing_is_abstract(tmp_path: Path) -> None:
+    with pytest.raises(TypeError):
+        SQLiteStorageManager(str(tmp_path))  # type: ignore[abstract]
+
+
+def test_unchanged_objects_are_not_written(tmp_path: Path) -> None:
+    storage_manager = _NoteStorageManager(str(tmp_path))
+    note = _Note(uuid4(), "first")
+
+    storage_manager.store_object(note)
+    storage_manager.store_object(note)
+    note.text = "second"
+    storage_manager.store_object(note)
+
+    assert storage_manager.writes == [1, 1]
+    assert storage_manager.retrieve_object(_Note, note._uid) == note
+
+
+def test_retrieved_objects_are_not_written_back(tmp_path: Path) -> None:
+    note = _Note(uuid4(), "stored")
+    _NoteStorageManager(str(tmp_path)).store_object(note)
+
+    storage_manager = _NoteStorageManager(str(tmp_path))
+    retrieved_note = storage_manager.retrieve_object(_Note, note._uid)
+    assert retrieved_note is not None
+    storage_manager.store_object(retrieved_note)
+
+    assert storage_manager.writes == []
+
+
+def test_transaction_writes_once(tmp_path: Path) -> None:
+    storage_manager = _NoteStorageManager(str(tmp_path))
+    notes = [_Note(uuid4(), f"note {idx}") for idx in range(5)]
+
+    with storage_manager.transaction():
+        for note in notes:
+            storage_manager.store_object(note)
+        with storage_manager.transaction():
+            storage_manager.store_object(notes[0])
+        # Pending stores are read back before the commit
+        assert storage_manager.retrieve_object(_Note, notes[1]._uid) == notes[1]
+        assert storage_manager.writes == []
+
+    assert storage_manager.writes == [5]
+    reopened_storage_manager = _NoteStorageManager(str(tmp_path))
+    assert reopened_storage_manager.retrieve_object(_Note, notes[4]._uid) == notes[4]
+
+
+def test_failed_transactions_write_nothing(tmp_path: Path) -> None:
+    storage_manager = _NoteStorageManager(str(tmp_path))
+    note = _Note(uuid4(), "lost")
+
+    with pytest.raises(RuntimeError):
+        with storage_manager.transaction():
+            storage_manager.store_object(note)
+            with storage_manager.transaction():
+                raise RuntimeError
+
+    assert storage_manager.writes == []
+    assert storage_manager.retrieve_object(_Note, note._uid) is None
+    # The discarded store is not taken as already written
+    storage_manager.store_object(note)
+    assert storage_manager.writes == [1]
+
+
+def test_transactions_are_per_thread(tmp_path: Path) -> None:
+    storage_manager = _NoteStorageManager(str(tmp_path))
+    note, other_note = _Note(uuid4(), "pending"), _Note(uuid4(), "other")
+
+    with storage_manager.transaction():
+        storage_manager.store_object(note)
+        thread = threading.Thread(
+            target=lambda: storage_manager.store_object(other_note)
+        )
+        thread.start()
+        thread.join()
+        # The store of the other thread is not part of the transaction
+        assert storage_manager.writes == [1]
+
+    assert storage_manager.writes == [1, 1]
+    assert storage_manager.retrieve_object(_Note, other_note._uid) == other_note
+
+
+def test_retrieve_objects_returns_stored_objects(tmp_path: Path) -> None:
+    storage_manager = _NoteStorageManager(str(tmp_path))
+    notes = [_Note(uuid4(), f"note {idx}") for idx in range(3)]
+    for note in notes[:2]:
+        storage_manager.store_object(note)
+
+    with storage_manager.transaction():
+        storage_manager.store_object(notes[2])
+        retrieved_notes = storage_manager.retrieve_objects(
+            _Note, [note._uid for note in notes] + [uuid4()]
+        )
+
+    assert retrieved_notes == {note._uid: note for note in notes}
+
+
+def test_other_writers_invalidate_dirty_tracking(tmp_path: Path) -> None:
+    storage_manager = _NoteStorageManager(str(tmp_path))
+    other_storage_manager = _NoteStorageManager(str(tmp_path))
+    note = _Note(uuid4(), "mine")
+    storage_manager.store_object(note)
+
+    other_storage_manager.store_object(_Note(note._uid, "theirs"))
+    storage_manager.store_object(note)
+
+    assert storage_manager.writes == [1, 1]
+    assert other_storage_manager.retrieve_object(_Note, note._uid) == note
+
+
+def test_legacy_files_are_imported_once(tmp_path: Path) -> None:
+    note = _Note(uuid4(), "legacy")
+    (tmp_path / f"{note._uid}.json").write_text(
+        json.dumps({"type": "_Note", "uid": str(note._uid), "text": note.text})
+    )
+    (tmp_path / "notes.txt").write_text("not an object")
+
+    storage_manager = _NoteStorageManager(str(tmp_path))
+    assert storage_manager.retrieve_object(_Note, note._uid) == note
+
+    storage_manager.store_object(_Note(note._uid, "updated"))
+    reopened_storage_manager = _NoteStorageManager(str(tmp_path))
+    assert reopened_storage_manager.retrieve_object(_Note, note._uid) == _Note(
+        note._uid, "updated"
+    )
+
+
+def test_legacy_players_are_loaded(tmp_path: Path) -> None:
+    storage_path = tmp_path / "logic"
+    storage_path.mkdir()
+    player_uid = uuid4()
+    (storage_path / f"{player_uid}.json").write_text(
+        json.dumps(
+            {"type": "Player", "position": {"type": "Vertex2f", "x": 96, "y": 64}}
+        )
+    )
+
+    logic_manager = LogicManager(storage_path=str(storage_path))
+    player, _ = logic_manager.on_player_connect(player_uid)
+
+    assert player.uid == player_uid
+    assert player.bounds.position == Vertex2f(96, 64)
+    assert isinstance(player, Player)
@@ -0,0 +1,108 @@
+import threading
+import time
+from uuid import uuid4
+
+import pytest
+from conftest import RoomMap, run_logic_thread
+from game_manager.logic.map.tile import TILE_SIZE
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import PLAYER_SPEED, Player
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.logic.tick_scheduler import FixedTimestepScheduler
+from hard_reset.messaging.messaging import LocalMessageManagerGraphic
+
+
+def test_scheduler_runs_fixed_ticks_and_drops_late_ones() -> None:
+    durations: list[float] = []
+    scheduler = FixedTimestepScheduler(durations.append, 10, max_catch_up_ticks=3)
+
+    assert scheduler.advance(0.25e9) == 2
+    # 0.05s were left over from the previous advance
+    assert scheduler.advance(0.05e9) == 1
+    assert scheduler.advance(1e9) == 3
+    assert durations == [0.1] * 6
+    assert scheduler.statistics.ticks == 6
+    assert scheduler.statistics.dropped_ticks == 7
+
+
+def test_update_moves_entities() -> None:
+    current_map = RoomMap()
+    player = Player(Vertex2f(2 * TILE_SIZE, 2 * TILE_SIZE))
+    current_map.add_entity(player)
+    player.direction = Vertex2f(0, 1)
+    revision = current_map.revision
+
+    current_map.update(0.5)
+
+    assert player.bounds.position.y == pytest.approx(2 * TILE_SIZE + PLAYER_SPEED * 0.5)
+    assert current_map.get_changes_since(revision).changed_entities == [player]
+
+
+def test_update_slides_along_walls() -> None:
+    current_map = RoomMap()
+    player = Player(Vertex2f(TILE_SIZE, 2 * TILE_SIZE))
+    current_map.add_entity(player)
+    player.direction = Vertex2f(-1, 1).unit_vertex
+
+    current_map.update(0.5)
+
+    assert player.bounds.position.x == TILE_SIZE
+    assert player.bounds.position.y > 2 * TILE_SIZE
+
+
+def test_scalar_and_vectorized_movement_agree() -> None:
+    pytest.importorskip("numpy")
+    maps = [RoomMap(), RoomMap()]
+    maps[1].enable_vectorized_movement()
+    players = []
+    for current_map in maps:
+        player = Player(Vertex2f(1.5 * TILE_SIZE, 1.5 * TILE_SIZE))
+        current_map.add_entity(player)
+        players.append(player)
+
+    for direction in [Vertex2f(1, 1), Vertex2f(-1, 0), Vertex2f(0, 1)] * 10:
+        for player in players:
+            player.direction = direction.unit_vertex
+        for current_map in maps:
+            for _ in range(5):
+                current_map.update(1 / 30)
+        scalar_position, vectorized_position = (
+            player.bounds.position for player in players
+        )
+        assert scalar_position.x == pytest.approx(vectorized_position.x)
+        assert scalar_position.y == pytest.approx(vectorized_position.y)
+
+
+def test_logic_tick_moves_connected_players(logic_manager: LogicManager) -> None:
+    player, map_uid = logic_manager.on_player_connect(None)
+    player.direction = Vertex2f(0, 1)
+    start_y = player.bounds.position.y
+
+    for _ in range(3):
+        logic_manager.run_tick()
+
+    assert player.bounds.position.y == pytest.approx(start_y + PLAYER_SPEED * 0.1)
+
+
+def test_messaging_calls_run_on_the_logic_thread(logic_manager: LogicManager) -> None:
+    graphic = LocalMessageManagerGraphic(logic_manager)
+    with run_logic_thread(logic_manager) as logic_thread:
+        assert logic_manager.call(threading.get_ident) == logic_thread.ident
+        player_info = graphic.connect_as_player(None)
+        map_uid = player_info.current_map_uid
+
+        # Players come and go while the logic thread ticks
+        deadline = time.perf_counter() + 0.5
+        revision = -1
+        while time.perf_counter() < deadline:
+            other_player_info = graphic.connect_as_player(None)
+            graphic.set_entity_direction(map_uid, player_info.uid, Vertex2f(1, 1))
+            revision = graphic.get_map_delta(map_uid, revision).revision
+            logic_manager.call(
+                logic_manager.on_player_disconnect, other_player_info.uid
+            )
+
+        with pytest.raises(AssertionError):
+            graphic.get_map_info(uuid4())
+    assert logic_manager.tick_statistics.ticks > 0
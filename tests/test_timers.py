@@ -0,0 +1,96 @@
+import random
+from pathlib import Path
+from uuid import uuid4
+
+from conftest import RoomMap
+
+from hard_reset.logic.activity import ActivityScheduler
+from hard_reset.logic.logic_storage_manager import LogicStorageManager
+from hard_reset.logic.timers import (
+    SLOT_BITS,
+    WHEEL_LEVELS,
+    Timer,
+    TimerScheduler,
+    TimerWheel,
+)
+
+
+def _random_delay(generator: random.Random) -> int:
+    # Spread over every level and the overflow slot
+    level = generator.randrange(WHEEL_LEVELS + 1)
+    return generator.randrange(1 << (SLOT_BITS * (level + 1)))
+
+
+def test_expired_timers_match_brute_force() -> None:
+    generator = random.Random(7)
+    now = generator.randrange(1 << 20)
+    wheel = TimerWheel(now)
+    map_uid = uuid4()
+    pending: dict[Timer, int] = {}
+
+    for _ in range(2000):
+        action = generator.random()
+        if action < 0.5:
+            timer = Timer(map_uid, "event", {}, now + _random_delay(generator))
+            wheel.insert(timer)
+            pending[timer] = max(timer.expiry_tick, now + 1)
+        elif action < 0.6 and pending:
+            timer = generator.choice(list(pending))
+            wheel.remove(timer)
+            del pending[timer]
+        else:
+            now += _random_delay(generator) // generator.choice([1, 64, 4096])
+            expired = wheel.advance(now)
+            expected = {timer for timer, expiry in pending.items() if expiry <= now}
+            assert set(expired) == expected
+            assert [timer.expiry_tick for timer in expired] == sorted(
+                timer.expiry_tick for timer in expired
+            )
+            for timer in expired:
+                del pending[timer]
+        assert wheel.now == now
+        assert len(wheel) == len(pending)
+        assert set(wheel.timers) == set(pending)
+
+
+def test_expired_timers_are_not_removed_twice() -> None:
+    wheel = TimerWheel(0)
+    timer = Timer(uuid4(), "event", {}, 0)
+    wheel.insert(timer)
+
+    assert wheel.advance(1) == [timer]
+    wheel.remove(timer)
+    assert len(wheel) == 0
+
+
+def test_unloaded_timers_resume_with_their_remaining_delay(tmp_path: Path) -> None:
+    current_map = RoomMap(4, 4)
+    activity = ActivityScheduler()
+    scheduler = TimerScheduler(activity, LogicStorageManager(str(tmp_path)))
+    fired: list[tuple[int, object]] = []
+    scheduler.register_handler(
+        "event", lambda _, timer: fired.append((scheduler.tick, timer.payload["idx"]))
+    )
+    scheduler.load_map(current_map.uid)
+    scheduler.schedule(current_map.uid, 3, "event", {"idx": 0}, hold_map=True)
+    cancelled_timer = scheduler.schedule(current_map.uid, 2, "event", {"idx": 1})
+    assert activity.is_held(current_map.uid)
+
+    scheduler.next_tick()
+    assert scheduler.cancel(cancelled_timer.uid)
+    assert not scheduler.cancel(cancelled_timer.uid)
+    scheduler.unload_map(current_map.uid)
+    assert len(scheduler) == 0
+    assert not activity.is_held(current_map.uid)
+
+    # Unloaded maps do not age
+    for _ in range(10):
+        scheduler.next_tick()
+    scheduler.load_map(current_map.uid)
+    for _ in range(2):
+        scheduler.next_tick()
+        scheduler.advance_map(current_map)
+
+    assert fired == [(13, 0)]
+    assert len(scheduler) == 0
+    assert not activity.is_held(current_map.uid)
@@ -0,0 +1,101 @@
+from uuid import uuid4
+
+import pytest
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Chest, Inventory, InventoryError
+from hard_reset.logic.item.catalog import CATALOG
+from hard_reset.logic.item.transfer import ItemMove, transfer_items
+from hard_reset.logic.logic_manager import LogicManager
+from hard_reset.messaging.messaging import LocalMessageManagerGraphic
+
+PLANK = CATALOG.get_item("Wooden Plank")
+STICK = CATALOG.get_item("Wooden Stick")
+
+
+def _make_inventories() -> tuple[list[Uid], dict[Uid, Inventory]]:
+    uids = [uuid4() for _ in range(3)]
+    inventories = {uid: Inventory() for uid in uids}
+    inventories[uids[0]].add_item(PLANK, 5)
+    inventories[uids[1]].add_item(STICK, 2)
+    return uids, inventories
+
+
+def test_moves_are_applied_together() -> None:
+    (first, second, third), inventories = _make_inventories()
+
+    transfer_items(
+        inventories,
+        [
+            (first, second, PLANK.name, 5),
+            (second, third, PLANK.name, 3),
+            (second, first, STICK.name, 2),
+        ],
+    )
+
+    assert inventories[first].get_items() == {STICK.name: 2}
+    assert inventories[second].get_items() == {PLANK.name: 2}
+    assert inventories[third].get_items() == {PLANK.name: 3}
+
+
+@pytest.mark.parametrize(
+    "moves, message",
+    [
+        ([(0, 1, "Wooden Plank", 3), (0, 2, "Wooden Plank", 3)], "Not enough"),
+        ([(0, 1, "Wooden Plank", 1), (0, 1, "Unknown", 1)], "Unknown item"),
+        ([(0, 1, "Wooden Plank", 1), (1, 0, "Wooden Stick", 0)], "Cannot move 0"),
+        ([(0, 1, "Wooden Plank", 1), (0, None, "Wooden Plank", 1)], "between"),
+    ],
+)
+def test_failed_transfers_change_nothing(
+    moves: list[tuple[int, int | None, str, int]], message: str
+) -> None:
+    uids, inventories = _make_inventories()
+    items = {uid: inventory.get_items() for uid, inventory in inventories.items()}
+    versions = {uid: inventory.version for uid, inventory in inventories.items()}
+    item_moves: list[ItemMove] = [
+        (
+            uids[from_idx],
+            uids[to_idx] if to_idx is not None else uuid4(),
+            item_name,
+            quantity,
+        )
+        for from_idx, to_idx, item_name, quantity in moves
+    ]
+
+    with pytest.raises(InventoryError, match=message):
+        transfer_items(inventories, item_moves)
+
+    for uid, inventory in inventories.items():
+        assert inventory.get_items() == items[uid]
+        assert inventory.version == versions[uid]
+
+
+def test_items_moved_back_and_forth_leave_inventories_unchanged() -> None:
+    (first, second, _), inventories = _make_inventories()
+    version = inventories[first].version
+
+    transfer_items(
+        inventories, [(first, second, PLANK.name, 4), (second, first, PLANK.name, 4)]
+    )
+
+    assert inventories[first].get_items() == {PLANK.name: 5}
+    assert inventories[first].version == version
+
+
+def test_transfer_returns_the_resulting_inventories(
+    logic_manager: LogicManager,
+) -> None:
+    message_manager = LocalMessageManagerGraphic(logic_manager)
+    player, map_uid = logic_manager.on_player_connect(None)
+    current_map = logic_manager.get_map(map_uid)
+    assert current_map is not None
+    chest = Chest(Vertex2f(0, 0))
+    current_map.add_entity(chest)
+
+    inventories = message_manager.transfer_items(
+        map_uid, [(player.uid, chest.uid, PLANK.name, 1)]
+    )
+
+    assert inventories == {player.uid: {PLANK.name: 4}, chest.uid: {PLANK.name: 1}}
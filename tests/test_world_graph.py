@@ -0,0 +1,99 @@
+import random
+from collections import deque
+from uuid import uuid4, uuid5
+
+from conftest import RoomMap
+from game_manager.logic.map.tile import TILE_SIZE
+from game_manager.logic.uid_object import Uid
+from vertyces.vertex import Vertex2f
+
+from hard_reset.logic.entities import Door
+from hard_reset.logic.map.map_travel import MapTravel, SpawnPoint
+from hard_reset.logic.map.world_graph import WorldGraph
+
+
+def _get_spawn_point_uid(map_uid: Uid) -> Uid:
+    return uuid5(map_uid, "spawn point")
+
+
+class _TravelMap(RoomMap):
+    spawn_point_uid: Uid
+
+    def __init__(self, map_uid: Uid, destination_map_uids: list[Uid]) -> None:
+        super().__init__(6, 6)
+        self._uid = map_uid
+        self.spawn_point_uid = _get_spawn_point_uid(map_uid)
+        self.add_spawn_point(
+            SpawnPoint(Vertex2f(TILE_SIZE, TILE_SIZE), self.spawn_point_uid)
+        )
+        for idx, destination_map_uid in enumerate(destination_map_uids):
+            map_travel = MapTravel(
+                (destination_map_uid, _get_spawn_point_uid(destination_map_uid))
+            )
+            self.add_map_travel(map_travel)
+            self.add_entity(Door(Vertex2f(0, idx * TILE_SIZE), map_travel.uid))
+
+
+def _get_hops_count(
+    edges: dict[Uid, list[Uid]], map_uid: Uid, destination_map_uid: Uid
+) -> int | None:
+    hops_counts = {map_uid: 0}
+    queue = deque([map_uid])
+    while queue:
+        current_map_uid = queue.popleft()
+        for next_map_uid in edges.get(current_map_uid, []):
+            if next_map_uid in edges and next_map_uid not in hops_counts:
+                hops_counts[next_map_uid] = hops_counts[current_map_uid] + 1
+                queue.append(next_map_uid)
+    return hops_counts.get(destination_map_uid)
+
+
+def test_routes_are_shortest_as_maps_come_and_go() -> None:
+    generator = random.Random(2)
+    map_uids = [uuid4() for _ in range(12)]
+    world_graph = WorldGraph()
+    # Travels of the added maps, by map
+    edges: dict[Uid, list[Uid]] = {}
+
+    for _ in range(60):
+        map_uid = generator.choice(map_uids)
+        if map_uid in edges and generator.random() < 0.4:
+            world_graph.remove_map(map_uid)
+            del edges[map_uid]
+        else:
+            destination_map_uids = generator.sample(map_uids, 2)
+            world_graph.add_map(_TravelMap(map_uid, destination_map_uids))
+            edges[map_uid] = destination_map_uids
+
+        for source_map_uid in edges:
+            for destination_map_uid in edges:
+                route = world_graph.get_route(source_map_uid, destination_map_uid)
+                hops_count = _get_hops_count(edges, source_map_uid, destination_map_uid)
+                if hops_count is None:
+                    assert route is None
+                    continue
+                assert route is not None and len(route) == hops_count
+                current_map_uid = source_map_uid
+                for hop in route:
+                    assert hop.map_uid == current_map_uid
+                    assert hop.destination_map_uid in edges[current_map_uid]
+                    current_map_uid = hop.destination_map_uid
+
+
+def test_hops_lead_to_the_destination_spawn_point() -> None:
+    first_uid, second_uid = uuid4(), uuid4()
+    world_graph = WorldGraph()
+    first_map = _TravelMap(first_uid, [second_uid])
+    world_graph.add_map(first_map)
+    assert world_graph.get_next_hop(first_uid, second_uid) is None
+
+    second_map = _TravelMap(second_uid, [])
+    world_graph.add_map(second_map)
+    hop = world_graph.get_next_hop(first_uid, second_uid)
+
+    assert hop is not None
+    assert hop.door_position == Vertex2f(0, 0)
+    assert hop.spawn_point_uid == second_map.spawn_point_uid
+    assert hop.spawn_position == Vertex2f(TILE_SIZE, TILE_SIZE)
+    assert world_graph.get_hop(first_uid, hop.map_travel_uid) == hop
+    assert world_graph.get_destination_map_uids(first_uid) == [second_uid]